@@ -13,6 +13,22 @@ except Exception:
 
 DB_PATH = get_db_path("logs")
 
+# callbacks notified with each inserted row (used by control API subscriptions)
+_ROW_LISTENERS = []
+
+
+def add_row_listener(callback):
+    """Call *callback(row: dict)* after every successful ``save_log`` insert."""
+    if callback not in _ROW_LISTENERS:
+        _ROW_LISTENERS.append(callback)
+
+
+def remove_row_listener(callback):
+    try:
+        _ROW_LISTENERS.remove(callback)
+    except ValueError:
+        pass
+
 
 def connect():
     ensure_dirs()
@@ -132,8 +148,32 @@ def save_log(category, data):
         ),
     )
 
+    rowid = cur.lastrowid
     con.commit()
     con.close()
 
+    if _ROW_LISTENERS:
+        row = {
+            "rowid": rowid,
+            "id": rowid,
+            "category": category,
+            "type": log_type,
+            "user_id": user_id,
+            "user_name": user_name,
+            "moderator_id": moderator_id,
+            "moderator_name": moderator_name,
+            "channel_id": channel_id,
+            "channel_name": channel_name,
+            "message": message,
+            "extra": extra,
+            "timestamp": timestamp,
+            "guild_id": guild_id,
+        }
+        for callback in list(_ROW_LISTENERS):
+            try:
+                callback(row)
+            except Exception:
+                pass
+
 
 setup()
@@ -21,6 +21,7 @@ from controllers.features.socials_controller import SocialsControllerMixin
 from controllers.features.welcome_dm_controller import WelcomeDmControllerMixin
 from controllers.monitoring.dashboard_controller import \
     DashboardControllerMixin
+from controllers.monitoring.events_controller import EventsControllerMixin
 from controllers.monitoring.logs_controller import LogsControllerMixin
 from controllers.ui.admin_controller import AdminControllerMixin
 from controllers.ui.emoji_controller import EmojiControllerMixin
@@ -44,7 +45,7 @@ write_startup_trace()
 install_exception_hook()
 
 
-class MainWindow(FeaturesControllerMixin, LevelingControllerMixin, BirthdaysControllerMixin, FreeStuffControllerMixin, SocialsControllerMixin, WelcomeDmControllerMixin, LogsControllerMixin, DashboardControllerMixin, AdminControllerMixin, EmojiControllerMixin, PreviewControllerMixin, PreviewApiControllerMixin, PurgeControllerMixin, LifecycleControllerMixin, RuntimeCoreControllerMixin, QtWidgets.QMainWindow):
+class MainWindow(FeaturesControllerMixin, LevelingControllerMixin, BirthdaysControllerMixin, FreeStuffControllerMixin, SocialsControllerMixin, WelcomeDmControllerMixin, LogsControllerMixin, DashboardControllerMixin, EventsControllerMixin, AdminControllerMixin, EmojiControllerMixin, PreviewControllerMixin, PreviewApiControllerMixin, PurgeControllerMixin, LifecycleControllerMixin, RuntimeCoreControllerMixin, QtWidgets.QMainWindow):
     _async_done = QtCore.Signal(object)
 
     def __init__(self):
@@ -325,6 +326,7 @@ class MainWindow(FeaturesControllerMixin, LevelingControllerMixin, BirthdaysCont
         self._init_status_helper()
         self._init_startup_marker()
         self._init_timers()
+        self._start_event_subscriber()
 
     def _ensure_guild_configs_from_example(self, guild_id: str):
         """Create or update config files for a guild from config.example.json.
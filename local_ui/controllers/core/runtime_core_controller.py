@@ -10,6 +10,7 @@ import threading
 from PySide6 import QtCore
 
 from services.control_api_client import send_cmd
+from services.guild_snapshot_cache import fetch_guild_snapshot
 
 
 class RuntimeCoreControllerMixin:
@@ -53,6 +54,14 @@ class RuntimeCoreControllerMixin:
         """Stop all timers and close open file handles / DB connections."""
         for timer_name in ("status_timer", "log_timer", "_alive_timer", "_dash_console_timer"):
             self._safe_stop_timer(timer_name)
+        try:
+            self._stop_event_subscriber()
+        except Exception:
+            pass
+        try:
+            self._stop_preview_renderer()
+        except Exception:
+            pass
         try:
             poller = getattr(self, "_log_poller", None)
             if poller:
@@ -74,9 +83,16 @@ class RuntimeCoreControllerMixin:
         When the response arrives, the ``_async_done`` signal is emitted so
         the callback *cb* runs safely on the Qt main thread.
         """
+        self._run_async(lambda: send_cmd(cmd, timeout=timeout), cb)
+
+    def fetch_guild_snapshot_async(self, timeout: float = 8.0, cb=None):
+        """``guild_snapshot`` through the versioned, disk-backed snapshot cache."""
+        self._run_async(lambda: fetch_guild_snapshot(timeout=timeout), cb)
+
+    def _run_async(self, fn, cb=None):
         def _worker():
             try:
-                res = send_cmd(cmd, timeout=timeout)
+                res = fn()
             except Exception as e:
                 res = {"ok": False, "error": str(e)}
             # Signal emission is thread-safe in Qt and queues the slot
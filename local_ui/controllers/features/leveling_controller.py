@@ -5,6 +5,7 @@ from config.config_io import (config_json_path, load_guild_config,
                               load_json_dict, save_json_merged)
 from PySide6 import QtCore, QtWidgets
 from services.control_api_client import send_cmd
+from services.guild_snapshot_cache import fetch_guild_snapshot
 
 
 def _natural_sort_text_key(text: str) -> str:
@@ -245,7 +246,7 @@ class LevelingControllerMixin:
     def _fetch_snapshot_cached(self) -> dict | None:
         """Fetch guild snapshot (uses setup wizard cache if available)."""
         try:
-            resp = send_cmd({"action": "guild_snapshot"}, timeout=8.0)
+            resp = fetch_guild_snapshot(timeout=8.0)
         except Exception as exc:
             QtWidgets.QMessageBox.warning(self, "Snapshot", f"Bot nicht erreichbar: {exc}")
             return None
@@ -9,6 +9,7 @@ from config.config_io import (config_json_path, load_guild_config,
                               save_json)
 from PySide6 import QtWidgets
 from services.control_api_client import send_cmd
+from services.guild_snapshot_cache import fetch_guild_snapshot
 
 
 # ---------------------------------------------------------------------------
@@ -194,7 +195,7 @@ class SocialsControllerMixin:
                 )
                 return
 
-            resp = send_cmd({"action": "guild_snapshot"}, timeout=8.0)
+            resp = fetch_guild_snapshot(timeout=8.0)
             if not resp.get("ok"):
                 QtWidgets.QMessageBox.warning(self, "Pick", f"Fehler: {resp}")
                 return
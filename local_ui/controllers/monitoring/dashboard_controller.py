@@ -1,10 +1,14 @@
 """Dashboard controller mixin — bot status monitoring, language controls and console polling."""
 
+import collections
 import os
 from urllib import request as _urllib_request
 
 from PySide6 import QtCore, QtGui, QtWidgets
 
+SPARKLINE_POINTS = 120
+SPARKLINE_FIELDS = ("cpu_percent", "memory_rss_mb", "loop_lag_ms", "gateway_ping_ms")
+
 
 class DashboardControllerMixin:
     """Provides bot status refresh, language guild/language combo management and console polling."""
@@ -51,8 +55,12 @@ class DashboardControllerMixin:
             self.mon_cpu.setText("—")
             self.mon_mem.setText("—")
             self.mon_cogs.setText("—")
+            self.mon_lag.setText("—")
+            self.mon_guilds.setText("—")
         except Exception:
             pass
+        # backfill from metrics_history again once the bot is back
+        self._metrics_backfilled = False
 
     def on_ping(self):
         self.send_cmd_async({"action": "ping"}, timeout=0.8, cb=self._on_ping_result)
@@ -104,8 +112,17 @@ class DashboardControllerMixin:
                         self.mon_cpu.setText("—")
                     self.mon_mem.setText(f"{float(mem_mb):.1f} MB" if isinstance(mem_mb, (int, float)) else "—")
                     self.mon_cogs.setText(str(len(cogs)))
+                    lag_ms = r.get("loop_lag_ms")
+                    self.mon_lag.setText(f"{float(lag_ms):.1f} ms" if isinstance(lag_ms, (int, float)) else "—")
+                    guild_count = r.get("guild_count")
+                    member_count = r.get("member_count")
+                    if isinstance(guild_count, int):
+                        self.mon_guilds.setText(f"{guild_count} ({member_count or 0} members)")
+                    else:
+                        self.mon_guilds.setText("—")
                 except Exception:
                     pass
+                self._record_metric_sample(r)
                 try:
                     self._update_window_icon_from_avatar(avatar_url)
                 except Exception:
@@ -116,6 +133,60 @@ class DashboardControllerMixin:
         finally:
             self._status_inflight = False
 
+    # ==================================================
+    # METRIC SPARKLINES
+    # ==================================================
+
+    def _metric_series_state(self) -> dict:
+        series = getattr(self, "_metric_series", None)
+        if not isinstance(series, dict):
+            series = {key: collections.deque(maxlen=SPARKLINE_POINTS) for key in SPARKLINE_FIELDS}
+            self._metric_series = series
+            self._metric_last_ts = 0.0
+        return series
+
+    def _record_metric_sample(self, status: dict):
+        """Append the status payload's sample; fetch history on first contact."""
+        if not getattr(self, "_metrics_backfilled", False):
+            self._metrics_backfilled = True
+            self.send_cmd_async(
+                {"action": "metrics_history", "limit": SPARKLINE_POINTS},
+                timeout=2.0,
+                cb=self._on_metrics_history,
+            )
+        ts = status.get("sampled_at")
+        if not isinstance(ts, (int, float)) or ts <= float(getattr(self, "_metric_last_ts", 0.0) or 0.0):
+            return
+        series = self._metric_series_state()
+        self._metric_last_ts = float(ts)
+        for key in SPARKLINE_FIELDS:
+            series[key].append(status.get(key))
+        self._redraw_sparklines()
+
+    def _on_metrics_history(self, resp: dict):
+        if not isinstance(resp, dict) or not resp.get("ok"):
+            # older bot without metrics_history; live samples still fill the charts
+            return
+        data = resp.get("series") or {}
+        timestamps = list(data.get("ts") or [])
+        if not timestamps:
+            return
+        self._metric_series = {
+            key: collections.deque(list(data.get(key) or [])[-SPARKLINE_POINTS:], maxlen=SPARKLINE_POINTS)
+            for key in SPARKLINE_FIELDS
+        }
+        self._metric_last_ts = float(timestamps[-1])
+        self._redraw_sparklines()
+
+    def _redraw_sparklines(self):
+        sparks = getattr(self, "mon_sparklines", None) or {}
+        series = self._metric_series_state()
+        for key, spark in sparks.items():
+            try:
+                spark.set_values(list(series.get(key) or []))
+            except Exception:
+                pass
+
     def _poll_dashboard_console(self):
         try:
             path = getattr(self, "_dash_console_path", None)
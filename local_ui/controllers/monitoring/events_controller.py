@@ -0,0 +1,139 @@
+"""Events controller mixin — applies control API push events to the UI.
+
+While the event stream is connected the status timer, purge polling and the
+logs-DB poller are paused; they resume as fallback when it drops.
+"""
+
+import json
+import os
+
+from services.event_subscriber import EventSubscriber
+
+EVENT_TOPICS = ["status", "purge", "log", "reload", "guild"]
+
+
+class EventsControllerMixin:
+    """Subscribes to bot events and routes them to the existing UI handlers."""
+
+    def _start_event_subscriber(self):
+        try:
+            sub = EventSubscriber(topics=EVENT_TOPICS)
+            sub.event_received.connect(self._on_control_event)
+            sub.connection_changed.connect(self._on_events_connection_changed)
+            sub.start()
+            self._event_subscriber = sub
+        except Exception as e:
+            self._event_subscriber = None
+            self._debug_log(f"start_event_subscriber failed: {e}")
+
+    def _stop_event_subscriber(self):
+        sub = getattr(self, "_event_subscriber", None)
+        self._event_subscriber = None
+        if sub is not None:
+            try:
+                sub.stop()
+            except Exception:
+                pass
+
+    def _events_connected(self) -> bool:
+        return bool(getattr(self, "_events_online", False))
+
+    def _is_bot_logs_db(self, path) -> bool:
+        try:
+            bot_db = os.path.join(self._repo_root, "data", "db", "logs.db")
+            return os.path.normcase(os.path.abspath(str(path))) == os.path.normcase(os.path.abspath(bot_db))
+        except Exception:
+            return False
+
+    def _on_events_connection_changed(self, connected: bool):
+        self._events_online = bool(connected)
+        if connected:
+            self._safe_stop_timer("status_timer")
+            self._stop_purge_polling()
+            if getattr(self, "_active_log_mode", "file") == "db" and self._is_bot_logs_db(
+                getattr(self, "_active_log_path", None)
+            ):
+                self._stop_log_poller()
+                self._log_events_active = False
+                # catch up on rows written before the stream took over
+                self.tail_logs()
+                self._log_events_active = True
+            return
+
+        try:
+            self.status_timer.start(3000)
+        except Exception:
+            pass
+        if getattr(self, "_purge_awaiting", False):
+            self._start_purge_polling()
+        if getattr(self, "_log_events_active", False):
+            self._log_events_active = False
+            try:
+                self._start_log_poller(self._active_log_path, mode="db", table=self._db_table)
+            except Exception:
+                pass
+
+    def _on_control_event(self, evt: dict):
+        try:
+            kind = evt.get("event")
+            data = evt.get("data") or {}
+            if kind == "status":
+                self._apply_status_event(data, full=bool(evt.get("full")))
+            elif kind == "purge":
+                if getattr(self, "_purge_awaiting", False):
+                    self._on_purge_status({"ok": True, **data})
+            elif kind == "log":
+                self._apply_log_event(data)
+            elif kind == "reload":
+                failed = data.get("failed") or {}
+                self._set_status(f"Reload: {len(data.get('reloaded') or [])} reloaded, {len(failed)} failed")
+            elif kind == "guild":
+                self._apply_guild_event(evt.get("guild_id"), data)
+            elif kind in ("overflow", "resync"):
+                self.on_refresh()
+                if getattr(self, "_log_events_active", False):
+                    self._log_events_active = False
+                    self.tail_logs()
+                    self._log_events_active = True
+        except Exception as e:
+            self._debug_log(f"_on_control_event failed: {e}")
+
+    def _apply_status_event(self, data: dict, full: bool = False):
+        state = {} if full else dict(getattr(self, "_event_status", None) or {})
+        for key in data.get("_removed") or []:
+            state.pop(key, None)
+        state.update({k: v for k, v in data.items() if k != "_removed"})
+        self._event_status = state
+        self._on_refresh_result({"ok": True, **state})
+
+    def _apply_log_event(self, row: dict):
+        if not getattr(self, "_log_events_active", False):
+            return
+        guild_id = getattr(self, "_active_guild_id", None)
+        if guild_id and str(row.get("guild_id")) != str(guild_id):
+            return
+        try:
+            rowid = int(row.get("rowid") or 0)
+        except Exception:
+            rowid = 0
+        if rowid and rowid <= int(getattr(self, "_db_last_rowid", 0) or 0):
+            return
+        if rowid:
+            self._db_last_rowid = rowid
+        self._on_new_log_line(json.dumps(row, ensure_ascii=False))
+
+    def _apply_guild_event(self, guild_id, data: dict):
+        guild = data.get("guild")
+        guilds = getattr(self, "_purge_guilds_data", None)
+        if isinstance(guilds, list) and guild_id is not None:
+            for idx, entry in enumerate(guilds):
+                if str(entry.get("id")) == str(guild_id):
+                    if guild:
+                        guilds[idx] = guild
+                    else:
+                        guilds.pop(idx)
+                    break
+        try:
+            self._set_status(f"Guild {guild_id} changed ({data.get('change', 'update')})")
+        except Exception:
+            pass
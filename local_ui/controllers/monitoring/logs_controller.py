@@ -121,6 +121,11 @@ class LogsControllerMixin:
             if not path:
                 return
             self._active_log_mode = mode
+            self._log_events_active = False
+            if mode == "db" and self._events_connected() and self._is_bot_logs_db(path):
+                # new rows arrive as control API ``log`` events
+                self._log_events_active = True
+                return
             guild_id = getattr(self, "_active_guild_id", None) if mode == "db" else None
             if mode == "db":
                 poller = LogPoller(
@@ -414,7 +419,7 @@ class LogsControllerMixin:
 
     def tail_logs(self):
         try:
-            if getattr(self, "_log_poller", None):
+            if getattr(self, "_log_poller", None) or getattr(self, "_log_events_active", False):
                 return
             if getattr(self, "_db_conn", None) and getattr(self, "_db_table", None):
                 try:
@@ -19,7 +19,7 @@ class EmojiControllerMixin:
         try:
             self._emoji_picker_target = target_widget
             self._emoji_picker_replace_text = bool(replace_text)
-            self.send_cmd_async({"action": "guild_snapshot"}, timeout=8.0, cb=self._on_server_emoji_snapshot)
+            self.fetch_guild_snapshot_async(timeout=8.0, cb=self._on_server_emoji_snapshot)
         except Exception as e:
             QtWidgets.QMessageBox.warning(self, "Emoji Picker", f"Failed to request guild snapshot: {e}")
 
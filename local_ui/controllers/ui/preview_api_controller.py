@@ -76,6 +76,7 @@ class PreviewApiControllerMixin:
                 data = QtCore.QByteArray.fromBase64(b64.encode())
                 pix = QtGui.QPixmap()
                 if pix.loadFromData(data):
+                    self._supersede_live_preview("banner")
                     try:
                         scaled = pix.scaled(self.pv_banner.size(), QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
                         self.pv_banner.setPixmap(scaled)
@@ -108,6 +109,7 @@ class PreviewApiControllerMixin:
                 data = QtCore.QByteArray.fromBase64(b64.encode())
                 pix = QtGui.QPixmap()
                 if pix.loadFromData(data):
+                    self._supersede_live_preview("rank")
                     try:
                         self.rk_image.setPixmap(pix.scaled(self.rk_image.size(), QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation))
                     except Exception:
@@ -8,6 +8,7 @@ from config.config_io import (config_json_path, global_config_path,
 from PySide6 import QtCore, QtGui, QtWidgets
 from services.file_ops import (open_tracked_writer, prune_backups,
                                rotate_log_file)
+from services.preview_renderer import PreviewRenderer
 
 # Add src to path so we can import from the cogs
 _src_path = os.path.join(os.path.dirname(__file__), "..", "..", "..", "src")
@@ -338,7 +339,7 @@ class PreviewControllerMixin:
             else:
                 return
             try:
-                self._preview_debounce.start()
+                self._schedule_live_preview()
             except Exception:
                 pass
         except Exception:
@@ -353,7 +354,7 @@ class PreviewControllerMixin:
             if chosen.isValid():
                 target.setText(chosen.name().upper())
                 try:
-                    self._preview_debounce.start()
+                    self._schedule_live_preview()
                 except Exception:
                     pass
                 try:
@@ -651,168 +652,204 @@ class PreviewControllerMixin:
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Error", f"Failed to save preview settings: {e}")
 
+    def _preview_renderer(self):
+        renderer = getattr(self, "_preview_render_thread", None)
+        if renderer is None:
+            renderer = PreviewRenderer({"banner": render_welcome_banner, "rank": render_rankcard}, parent=self)
+            renderer.rendered.connect(self._on_preview_rendered)
+            renderer.failed.connect(self._on_preview_failed)
+            self._preview_render_thread = renderer
+        return renderer
+
+    def _stop_preview_renderer(self):
+        renderer = getattr(self, "_preview_render_thread", None)
+        if renderer is not None:
+            try:
+                renderer.stop()
+            except Exception:
+                pass
+            self._preview_render_thread = None
+
+    def _supersede_live_preview(self, target: str):
+        renderer = getattr(self, "_preview_render_thread", None)
+        if renderer is not None:
+            renderer.invalidate(target)
+
+    def _schedule_live_preview(self):
+        """Input changed: throttle renders to one per debounce interval."""
+        try:
+            if not self._preview_debounce.isActive():
+                self._preview_debounce.start()
+        except Exception:
+            pass
+
+    def _welcome_preview_params(self) -> dict:
+        name = self.pv_name.text() or "NewMember"
+        banner_path = self.pv_banner_path.text() or ""
+
+        # Resolve relative paths
+        if banner_path and not os.path.isabs(banner_path):
+            banner_path = os.path.join(self._repo_root, banner_path)
+
+        # Get font paths
+        title_font = self._selected_title_font_path() or os.path.join(self._repo_root, "assets/fonts/Poppins-Bold.ttf")
+        user_font = self._selected_user_font_path() or os.path.join(self._repo_root, "assets/fonts/Poppins-Regular.ttf")
+
+        return dict(
+            banner_path=banner_path,
+            username=name,
+            title=self.pv_title.text() or "WELCOME",
+            avatar_bytes=None,
+            bg_mode=self.pv_bg_mode.currentData() or "cover",
+            bg_zoom=int(self.pv_bg_zoom.value()),
+            bg_offset_x=int(self.pv_bg_x.value()),
+            bg_offset_y=int(self.pv_bg_y.value()),
+            font_welcome_path=title_font,
+            font_username_path=user_font,
+            title_font_size=int(self.pv_title_size.value()) or 140,
+            username_font_size=int(self.pv_user_size.value()) or 64,
+            title_color=self.pv_title_color.text() or "#FFFFFF",
+            username_color=self.pv_user_color.text() or "#E6E6E6",
+            title_offset_x=int(self.pv_title_x.value()),
+            title_offset_y=int(self.pv_title_y.value()),
+            username_offset_x=int(self.pv_user_x.value()),
+            username_offset_y=int(self.pv_user_y.value()),
+            text_offset_x=int(self.pv_text_x.value()),
+            text_offset_y=int(self.pv_text_y.value()),
+            offset_x=int(self.pv_avatar_x.value()),
+            offset_y=int(self.pv_avatar_y.value()),
+            avatar_size=int(self.pv_avatar_size.value()) if hasattr(self, 'pv_avatar_size') else 360,
+        )
+
+    def _rank_preview_params(self) -> dict:
+        rk_name = self.rk_name.text() or "NewMember"
+        rk_bg = self.rk_bg_path.text() or ""
+
+        if rk_bg and not os.path.isabs(rk_bg):
+            rk_bg = os.path.join(self._repo_root, rk_bg)
+
+        # Get font paths
+        username_font = self._resolve_font_combo_path(self.rk_username_font) or "assets/fonts/Poppins-Bold.ttf"
+        level_font = self._resolve_font_combo_path(self.rk_level_font) or "assets/fonts/Poppins-Regular.ttf"
+        xp_font = self._resolve_font_combo_path(self.rk_xp_font) or "assets/fonts/Poppins-Regular.ttf"
+        messages_font = self._resolve_font_combo_path(self.rk_messages_font) or "assets/fonts/Poppins-Regular.ttf"
+        voice_font = self._resolve_font_combo_path(self.rk_voice_font) or "assets/fonts/Poppins-Regular.ttf"
+        achievements_font = self._resolve_font_combo_path(self.rk_achievements_font) or "assets/fonts/Poppins-Regular.ttf"
+
+        return dict(
+            bg_path=rk_bg,
+            username=rk_name,
+            level=5,  # Example values for preview
+            xp=350,
+            xp_needed=500,
+            messages=128,
+            voice_minutes=45,
+            achievements_count=3,
+            avatar_bytes=None,
+            bg_mode=self.rk_bg_mode.currentData() or "cover",
+            bg_zoom=int(self.rk_bg_zoom.value()),
+            bg_offset_x=int(self.rk_bg_x.value()),
+            bg_offset_y=int(self.rk_bg_y.value()),
+            avatar_x=int(self.rk_avatar_x.value()) if hasattr(self, 'rk_avatar_x') else 75,
+            avatar_y=int(self.rk_avatar_y.value()) if hasattr(self, 'rk_avatar_y') else 125,
+            avatar_size=int(self.rk_avatar_size.value()) if hasattr(self, 'rk_avatar_size') else 300,
+            username_x=int(self.rk_username_x.value()) if hasattr(self, 'rk_username_x') else 400,
+            username_y=int(self.rk_username_y.value()) if hasattr(self, 'rk_username_y') else 80,
+            username_font=username_font,
+            username_font_size=int(self.rk_username_size.value()) if hasattr(self, 'rk_username_size') else 90,
+            username_color=self.rk_username_color.text() if hasattr(self, 'rk_username_color') else "#FFFFFF",
+            level_x=int(self.rk_level_x.value()) if hasattr(self, 'rk_level_x') else 400,
+            level_y=int(self.rk_level_y.value()) if hasattr(self, 'rk_level_y') else 200,
+            level_font=level_font,
+            level_font_size=int(self.rk_level_size.value()) if hasattr(self, 'rk_level_size') else 60,
+            level_color=self.rk_level_color.text() if hasattr(self, 'rk_level_color') else "#C8C8C8",
+            xp_x=int(self.rk_xp_x.value()) if hasattr(self, 'rk_xp_x') else 1065,
+            xp_y=int(self.rk_xp_y.value()) if hasattr(self, 'rk_xp_y') else 270,
+            xp_font=xp_font,
+            xp_font_size=int(self.rk_xp_size.value()) if hasattr(self, 'rk_xp_size') else 33,
+            xp_color=self.rk_xp_color.text() if hasattr(self, 'rk_xp_color') else "#C8C8C8",
+            bar_x=int(self.rk_bar_x.value()) if hasattr(self, 'rk_bar_x') else 400,
+            bar_y=int(self.rk_bar_y.value()) if hasattr(self, 'rk_bar_y') else 330,
+            bar_width=int(self.rk_bar_width.value()) if hasattr(self, 'rk_bar_width') else 900,
+            bar_height=int(self.rk_bar_height.value()) if hasattr(self, 'rk_bar_height') else 38,
+            bar_bg_color=self.rk_bar_bg_color.text() if hasattr(self, 'rk_bar_bg_color') else "#323232",
+            bar_fill_color=self.rk_bar_fill_color.text() if hasattr(self, 'rk_bar_fill_color') else "#8C6EFF",
+            messages_x=int(self.rk_messages_x.value()) if hasattr(self, 'rk_messages_x') else 400,
+            messages_y=int(self.rk_messages_y.value()) if hasattr(self, 'rk_messages_y') else 400,
+            messages_font=messages_font,
+            messages_font_size=int(self.rk_messages_size.value()) if hasattr(self, 'rk_messages_size') else 33,
+            messages_color=self.rk_messages_color.text() if hasattr(self, 'rk_messages_color') else "#C8C8C8",
+            voice_x=int(self.rk_voice_x.value()) if hasattr(self, 'rk_voice_x') else 680,
+            voice_y=int(self.rk_voice_y.value()) if hasattr(self, 'rk_voice_y') else 400,
+            voice_font=voice_font,
+            voice_font_size=int(self.rk_voice_size.value()) if hasattr(self, 'rk_voice_size') else 33,
+            voice_color=self.rk_voice_color.text() if hasattr(self, 'rk_voice_color') else "#C8C8C8",
+            achievements_x=int(self.rk_achievements_x.value()) if hasattr(self, 'rk_achievements_x') else 980,
+            achievements_y=int(self.rk_achievements_y.value()) if hasattr(self, 'rk_achievements_y') else 400,
+            achievements_font=achievements_font,
+            achievements_font_size=int(self.rk_achievements_size.value()) if hasattr(self, 'rk_achievements_size') else 33,
+            achievements_color=self.rk_achievements_color.text() if hasattr(self, 'rk_achievements_color') else "#C8C8C8",
+        )
+
     def _apply_live_preview(self):
-        """Render full welcome banner and rankcard preview locally."""
-        # Welcome banner preview - full local rendering
+        """Render welcome banner and rankcard previews in the background.
+
+        Results of superseded requests are discarded.
+        """
+        renderer = self._preview_renderer()
+
+        # Welcome banner preview
         try:
             name = self.pv_name.text() or "NewMember"
-            banner_path = self.pv_banner_path.text() or ""
             message = self.pv_message.toPlainText() or "Welcome {mention}!"
-
-            # Resolve relative paths
-            if banner_path and not os.path.isabs(banner_path):
-                banner_path = os.path.join(self._repo_root, banner_path)
-
-            # Get font paths
-            title_font = self._selected_title_font_path() or os.path.join(self._repo_root, "assets/fonts/Poppins-Bold.ttf")
-            user_font = self._selected_user_font_path() or os.path.join(self._repo_root, "assets/fonts/Poppins-Regular.ttf")
-
-            # Render full welcome banner
-            png_data = render_welcome_banner(
-                banner_path=banner_path,
-                username=name,
-                title=self.pv_title.text() or "WELCOME",
-                avatar_bytes=None,
-                bg_mode=self.pv_bg_mode.currentData() or "cover",
-                bg_zoom=int(self.pv_bg_zoom.value()),
-                bg_offset_x=int(self.pv_bg_x.value()),
-                bg_offset_y=int(self.pv_bg_y.value()),
-                font_welcome_path=title_font,
-                font_username_path=user_font,
-                title_font_size=int(self.pv_title_size.value()) or 140,
-                username_font_size=int(self.pv_user_size.value()) or 64,
-                title_color=self.pv_title_color.text() or "#FFFFFF",
-                username_color=self.pv_user_color.text() or "#E6E6E6",
-                title_offset_x=int(self.pv_title_x.value()),
-                title_offset_y=int(self.pv_title_y.value()),
-                username_offset_x=int(self.pv_user_x.value()),
-                username_offset_y=int(self.pv_user_y.value()),
-                text_offset_x=int(self.pv_text_x.value()),
-                text_offset_y=int(self.pv_text_y.value()),
-                offset_x=int(self.pv_avatar_x.value()),
-                offset_y=int(self.pv_avatar_y.value()),
-                avatar_size=int(self.pv_avatar_size.value()) if hasattr(self, 'pv_avatar_size') else 360,
-            )
-
-            # Display the rendered banner
-            pix = QtGui.QPixmap()
-            if pix.loadFromData(png_data):
-                scaled = pix.scaled(self.pv_banner.size(), QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-                self.pv_banner.setPixmap(scaled)
-            else:
-                self.pv_banner.clear()
+            renderer.submit("banner", self._welcome_preview_params())
 
             # Update tooltip with rendered message
             rendered = message.replace("{mention}", f"@{name}")
             self.pv_banner.setToolTip(rendered)
-        except Exception as e:
-            # Fallback: just show raw image
-            try:
-                banner_path = self.pv_banner_path.text() or ""
-                if banner_path and not os.path.isabs(banner_path):
-                    banner_path = os.path.join(self._repo_root, banner_path)
-                if banner_path and os.path.exists(banner_path):
-                    pix = QtGui.QPixmap(banner_path)
-                    scaled = pix.scaled(self.pv_banner.size(), QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-                    self.pv_banner.setPixmap(scaled)
-                else:
-                    self.pv_banner.clear()
-            except Exception:
-                self.pv_banner.clear()
+        except Exception:
+            self._show_raw_preview_background("banner")
 
-        # Rankcard preview - full local rendering
+        # Rankcard preview
         try:
-            rk_name = self.rk_name.text() or "NewMember"
-            rk_bg = self.rk_bg_path.text() or ""
-
-            if rk_bg and not os.path.isabs(rk_bg):
-                rk_bg = os.path.join(self._repo_root, rk_bg)
-
-            # Get font paths
-            username_font = self._resolve_font_combo_path(self.rk_username_font) or "assets/fonts/Poppins-Bold.ttf"
-            level_font = self._resolve_font_combo_path(self.rk_level_font) or "assets/fonts/Poppins-Regular.ttf"
-            xp_font = self._resolve_font_combo_path(self.rk_xp_font) or "assets/fonts/Poppins-Regular.ttf"
-            messages_font = self._resolve_font_combo_path(self.rk_messages_font) or "assets/fonts/Poppins-Regular.ttf"
-            voice_font = self._resolve_font_combo_path(self.rk_voice_font) or "assets/fonts/Poppins-Regular.ttf"
-            achievements_font = self._resolve_font_combo_path(self.rk_achievements_font) or "assets/fonts/Poppins-Regular.ttf"
-
-            # Render full rankcard
-            png_data = render_rankcard(
-                bg_path=rk_bg,
-                username=rk_name,
-                level=5,  # Example values for preview
-                xp=350,
-                xp_needed=500,
-                messages=128,
-                voice_minutes=45,
-                achievements_count=3,
-                avatar_bytes=None,
-                bg_mode=self.rk_bg_mode.currentData() or "cover",
-                bg_zoom=int(self.rk_bg_zoom.value()),
-                bg_offset_x=int(self.rk_bg_x.value()),
-                bg_offset_y=int(self.rk_bg_y.value()),
-                avatar_x=int(self.rk_avatar_x.value()) if hasattr(self, 'rk_avatar_x') else 75,
-                avatar_y=int(self.rk_avatar_y.value()) if hasattr(self, 'rk_avatar_y') else 125,
-                avatar_size=int(self.rk_avatar_size.value()) if hasattr(self, 'rk_avatar_size') else 300,
-                username_x=int(self.rk_username_x.value()) if hasattr(self, 'rk_username_x') else 400,
-                username_y=int(self.rk_username_y.value()) if hasattr(self, 'rk_username_y') else 80,
-                username_font=username_font,
-                username_font_size=int(self.rk_username_size.value()) if hasattr(self, 'rk_username_size') else 90,
-                username_color=self.rk_username_color.text() if hasattr(self, 'rk_username_color') else "#FFFFFF",
-                level_x=int(self.rk_level_x.value()) if hasattr(self, 'rk_level_x') else 400,
-                level_y=int(self.rk_level_y.value()) if hasattr(self, 'rk_level_y') else 200,
-                level_font=level_font,
-                level_font_size=int(self.rk_level_size.value()) if hasattr(self, 'rk_level_size') else 60,
-                level_color=self.rk_level_color.text() if hasattr(self, 'rk_level_color') else "#C8C8C8",
-                xp_x=int(self.rk_xp_x.value()) if hasattr(self, 'rk_xp_x') else 1065,
-                xp_y=int(self.rk_xp_y.value()) if hasattr(self, 'rk_xp_y') else 270,
-                xp_font=xp_font,
-                xp_font_size=int(self.rk_xp_size.value()) if hasattr(self, 'rk_xp_size') else 33,
-                xp_color=self.rk_xp_color.text() if hasattr(self, 'rk_xp_color') else "#C8C8C8",
-                bar_x=int(self.rk_bar_x.value()) if hasattr(self, 'rk_bar_x') else 400,
-                bar_y=int(self.rk_bar_y.value()) if hasattr(self, 'rk_bar_y') else 330,
-                bar_width=int(self.rk_bar_width.value()) if hasattr(self, 'rk_bar_width') else 900,
-                bar_height=int(self.rk_bar_height.value()) if hasattr(self, 'rk_bar_height') else 38,
-                bar_bg_color=self.rk_bar_bg_color.text() if hasattr(self, 'rk_bar_bg_color') else "#323232",
-                bar_fill_color=self.rk_bar_fill_color.text() if hasattr(self, 'rk_bar_fill_color') else "#8C6EFF",
-                messages_x=int(self.rk_messages_x.value()) if hasattr(self, 'rk_messages_x') else 400,
-                messages_y=int(self.rk_messages_y.value()) if hasattr(self, 'rk_messages_y') else 400,
-                messages_font=messages_font,
-                messages_font_size=int(self.rk_messages_size.value()) if hasattr(self, 'rk_messages_size') else 33,
-                messages_color=self.rk_messages_color.text() if hasattr(self, 'rk_messages_color') else "#C8C8C8",
-                voice_x=int(self.rk_voice_x.value()) if hasattr(self, 'rk_voice_x') else 680,
-                voice_y=int(self.rk_voice_y.value()) if hasattr(self, 'rk_voice_y') else 400,
-                voice_font=voice_font,
-                voice_font_size=int(self.rk_voice_size.value()) if hasattr(self, 'rk_voice_size') else 33,
-                voice_color=self.rk_voice_color.text() if hasattr(self, 'rk_voice_color') else "#C8C8C8",
-                achievements_x=int(self.rk_achievements_x.value()) if hasattr(self, 'rk_achievements_x') else 980,
-                achievements_y=int(self.rk_achievements_y.value()) if hasattr(self, 'rk_achievements_y') else 400,
-                achievements_font=achievements_font,
-                achievements_font_size=int(self.rk_achievements_size.value()) if hasattr(self, 'rk_achievements_size') else 33,
-                achievements_color=self.rk_achievements_color.text() if hasattr(self, 'rk_achievements_color') else "#C8C8C8",
-            )
+            renderer.submit("rank", self._rank_preview_params())
+        except Exception:
+            self._show_raw_preview_background("rank")
+
+    def _preview_target_label(self, target: str):
+        return self.pv_banner if target == "banner" else self.rk_image
 
-            # Display the rendered rankcard
-            pix = QtGui.QPixmap()
-            if pix.loadFromData(png_data):
-                scaled = pix.scaled(self.rk_image.size(), QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-                self.rk_image.setPixmap(scaled)
+    def _on_preview_rendered(self, target: str, generation: int, image):
+        renderer = getattr(self, "_preview_render_thread", None)
+        if renderer is None or not renderer.is_current(target, generation):
+            return
+        label = self._preview_target_label(target)
+        try:
+            pix = QtGui.QPixmap.fromImage(image)
+            label.setPixmap(pix.scaled(label.size(), QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation))
+        except Exception:
+            label.clear()
+
+    def _on_preview_failed(self, target: str, generation: int, _error: str):
+        renderer = getattr(self, "_preview_render_thread", None)
+        if renderer is not None and renderer.is_current(target, generation):
+            self._show_raw_preview_background(target)
+
+    def _show_raw_preview_background(self, target: str):
+        """Fallback: just show the raw background image."""
+        label = self._preview_target_label(target)
+        try:
+            path = (self.pv_banner_path.text() if target == "banner" else self.rk_bg_path.text()) or ""
+            if path and not os.path.isabs(path):
+                path = os.path.join(self._repo_root, path)
+            if path and os.path.exists(path):
+                pix = QtGui.QPixmap(path)
+                scaled = pix.scaled(label.size(), QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+                label.setPixmap(scaled)
             else:
-                self.rk_image.clear()
-        except Exception as e:
-            # Fallback: just show raw background
-            try:
-                rk_bg = self.rk_bg_path.text() or ""
-                if rk_bg and not os.path.isabs(rk_bg):
-                    rk_bg = os.path.join(self._repo_root, rk_bg)
-                if rk_bg and os.path.exists(rk_bg):
-                    pix = QtGui.QPixmap(rk_bg)
-                    scaled = pix.scaled(self.rk_image.size(), QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-                    self.rk_image.setPixmap(scaled)
-                else:
-                    self.rk_image.clear()
-            except Exception:
-                self.rk_image.clear()
+                label.clear()
+        except Exception:
+            label.clear()
 
     def on_refresh_preview_local(self):
         """Refresh preview using local rendering (no bot required)."""
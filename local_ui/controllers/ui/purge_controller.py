@@ -1,28 +1,36 @@
 """Controller mixin for the Purge tab in the local UI.
 
 Sends a ``purge`` action to the bot control API and displays results.
-Polls ``purge_status`` in the background so the user sees live progress.
+Live progress arrives as ``purge`` events; ``purge_status`` is polled only
+while the event stream is unavailable.
 """
 
 from PySide6 import QtCore, QtWidgets
 
+from services.guild_snapshot_cache import get_snapshot_cache
+
 
 class PurgeControllerMixin:
     """Methods wired to Purge-tab widgets."""
 
     # ---- guild / channel loading ----
 
+    def _load_cached_purge_guilds(self):
+        """Fill the combos from the last persisted snapshot without asking the bot."""
+        try:
+            cached = get_snapshot_cache().cached()
+        except Exception:
+            cached = None
+        if cached:
+            self._on_purge_guild_snapshot(cached)
+
     def on_purge_refresh_guilds(self):
         """Fetch guild/channel snapshot from bot and populate combos."""
         try:
             self._set_status("Purge: fetching guilds…")
         except Exception:
             pass
-        self.send_cmd_async(
-            {"action": "guild_snapshot"},
-            timeout=8.0,
-            cb=self._on_purge_guild_snapshot,
-        )
+        self.fetch_guild_snapshot_async(timeout=8.0, cb=self._on_purge_guild_snapshot)
 
     def _on_purge_guild_snapshot(self, resp: dict):
         try:
@@ -35,6 +43,7 @@ class PurgeControllerMixin:
             if combo is None:
                 return
 
+            previous = combo.currentData()
             combo.blockSignals(True)
             combo.clear()
             combo.addItem("— select guild —", None)
@@ -46,13 +55,16 @@ class PurgeControllerMixin:
                 )
             combo.blockSignals(False)
 
-            # auto-select first real guild
-            if combo.count() > 1:
-                combo.setCurrentIndex(1)
-                self._on_purge_guild_changed(1)
+            # keep the current guild across refreshes, else the first real one
+            index = combo.findData(previous) if previous else -1
+            if index < 1 and combo.count() > 1:
+                index = 1
+            if index >= 1:
+                combo.setCurrentIndex(index)
+                self._on_purge_guild_changed(index)
 
             try:
-                self._set_status("Purge: guilds loaded")
+                self._set_status("Purge: guilds loaded (cached)" if resp.get("cached") else "Purge: guilds loaded")
             except Exception:
                 pass
         except Exception as e:
@@ -142,8 +154,12 @@ class PurgeControllerMixin:
         """Called when the bot acknowledges the purge start."""
         try:
             if resp.get("ok"):
-                self._purge_set_progress("Purge running… polling for updates")
-                self._start_purge_polling()
+                self._purge_awaiting = True
+                if self._events_connected():
+                    self._purge_set_progress("Purge running… waiting for updates")
+                else:
+                    self._purge_set_progress("Purge running… polling for updates")
+                    self._start_purge_polling()
             else:
                 error = resp.get("error", "unknown error")
                 self._purge_set_progress(f"Failed: {error}")
@@ -199,6 +215,7 @@ class PurgeControllerMixin:
                     f"Channel: #{channel}  |  {mins:02d}:{secs:02d}"
                 )
             elif finished:
+                self._purge_awaiting = False
                 self._stop_purge_polling()
                 self._purge_set_ui_enabled(True)
                 if error:
@@ -1,4 +1,7 @@
 from .control_api_client import send_cmd
+from .event_subscriber import EventSubscriber
 from .file_ops import open_tracked_writer, prune_backups, rotate_log_file
+from .guild_snapshot_cache import fetch_guild_snapshot, get_snapshot_cache
 from .log_format import format_db_row
 from .log_poller import LogPoller
+from .preview_renderer import PreviewRenderer
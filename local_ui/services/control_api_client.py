@@ -1,12 +1,17 @@
 """TCP client for the bot's local JSON-over-TCP control API.
 
-Sends single-line JSON requests to ``127.0.0.1:8765`` and returns the
-parsed JSON response.
+Requests go over one long-lived connection to ``127.0.0.1:8765`` that is
+authenticated once with a ``hello`` handshake. Every request carries an
+``id`` so several UI threads can share the connection and responses may
+arrive out of order. Bots that do not know the handshake are served with
+the original one-request-per-connection mode.
 """
 
+import itertools
 import json
 import os
 import socket
+import threading
 
 from config.config_io import ensure_env_file, load_env_dict
 from core.repo_paths import get_repo_root
@@ -28,28 +33,199 @@ def _current_control_api_token() -> str:
     return str(os.environ.get("CONTROL_API_TOKEN", "") or "").strip()
 
 
+class HandshakeRejected(Exception):
+    """Raised when the bot answers the ``hello`` handshake with an error."""
+
+
+class ControlApiConnection:
+    """Thread-safe, multiplexed connection to the bot control API.
+
+    The socket is opened lazily on the first request and re-opened after it
+    drops. A background reader thread routes each response line to the
+    waiting caller by its ``id``. Pending requests are kept per socket, so a
+    dying connection only fails the requests that were sent on it.
+    """
+
+    def __init__(self, addr=API_ADDR):
+        self._addr = addr
+        self._conn_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._sock = None
+        # socket -> {request id: slot}; a socket's entry is dropped when it dies
+        self._pending = {}
+        self._ids = itertools.count(1)
+
+    def _register(self, sock):
+        rid = next(self._ids)
+        slot = {"event": threading.Event(), "resp": None}
+        with self._pending_lock:
+            slots = self._pending.get(sock)
+            if slots is not None:
+                slots[rid] = slot
+                return rid, slot
+        # the reader already gave up on this socket
+        slot["resp"] = {"ok": False, "error": "connection closed"}
+        slot["event"].set()
+        return rid, slot
+
+    def _unregister(self, sock, rid):
+        with self._pending_lock:
+            self._pending.get(sock, {}).pop(rid, None)
+
+    def _fail_pending(self, sock, error: str):
+        with self._pending_lock:
+            pending = list(self._pending.pop(sock, {}).values())
+        for slot in pending:
+            slot["resp"] = {"ok": False, "error": error}
+            slot["event"].set()
+
+    def _reader_loop(self, sock):
+        try:
+            with sock.makefile("rb") as fh:
+                for raw in fh:
+                    try:
+                        resp = json.loads(raw.decode())
+                    except Exception:
+                        continue
+                    if not isinstance(resp, dict) or "event" in resp:
+                        # pushed events belong to subscribers, not callers
+                        continue
+                    with self._pending_lock:
+                        slots = self._pending.get(sock, {})
+                        rid = resp.pop("id", None)
+                        if rid is None and slots:
+                            # servers without request ids answer in order
+                            rid = min(slots)
+                        slot = slots.pop(rid, None)
+                    if slot is not None:
+                        slot["resp"] = resp
+                        slot["event"].set()
+        except Exception:
+            pass
+        finally:
+            # no _conn_lock here: a caller may hold it while waiting on us
+            if self._sock is sock:
+                self._sock = None
+            try:
+                sock.close()
+            except Exception:
+                pass
+            self._fail_pending(sock, "connection closed")
+
+    def _write(self, sock, payload: dict):
+        sock.sendall((json.dumps(payload) + "\n").encode())
+
+    def _open(self, timeout: float):
+        sock = socket.create_connection(self._addr, timeout=timeout)
+        sock.settimeout(None)
+        with self._pending_lock:
+            self._pending[sock] = {}
+        self._sock = sock
+        threading.Thread(target=self._reader_loop, args=(sock,), daemon=True).start()
+
+        rid, slot = self._register(sock)
+        hello = {"action": "hello", "id": rid}
+        token = _current_control_api_token()
+        if token:
+            hello["token"] = token
+        try:
+            self._write(sock, hello)
+        except OSError:
+            self._unregister(sock, rid)
+            self._close_locked()
+            raise
+        if not slot["event"].wait(timeout):
+            self._unregister(sock, rid)
+            self._close_locked()
+            raise TimeoutError("control API handshake timed out")
+        resp = slot["resp"] or {}
+        if not resp.get("ok"):
+            self._close_locked()
+            raise HandshakeRejected(str(resp.get("error") or "handshake failed"))
+
+    def _close_locked(self):
+        sock, self._sock = self._sock, None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except Exception:
+                pass
+            try:
+                sock.close()
+            except Exception:
+                pass
+
+    def close(self):
+        with self._conn_lock:
+            self._close_locked()
+
+    def request(self, cmd: dict, timeout: float = 10.0) -> dict:
+        """Send *cmd* and block until its response arrives or *timeout* passes."""
+        with self._conn_lock:
+            if self._sock is None:
+                self._open(timeout)
+            sock = self._sock
+            rid, slot = self._register(sock)
+            payload = dict(cmd)
+            payload.pop("token", None)
+            payload["id"] = rid
+            try:
+                self._write(sock, payload)
+            except OSError:
+                self._unregister(sock, rid)
+                self._close_locked()
+                raise
+        if not slot["event"].wait(timeout):
+            self._unregister(sock, rid)
+            return {"ok": False, "error": "timed out"}
+        return slot["resp"]
+
+
+_SHARED = ControlApiConnection()
+_LEGACY_MODE = False
+
+
+def _send_oneshot(cmd: dict, timeout: float) -> dict:
+    token = _current_control_api_token()
+    payload = dict(cmd)
+    if token:
+        payload["token"] = token
+
+    with socket.create_connection(API_ADDR, timeout=timeout) as s:
+        s.sendall((json.dumps(payload) + "\n").encode())
+        buf = b""
+        while True:
+            chunk = s.recv(4096)
+            if not chunk:
+                break
+            buf += chunk
+            if b"\n" in buf:
+                break
+        line = buf.split(b"\n", 1)[0]
+        return json.loads(line.decode())
+
+
 def send_cmd(cmd: dict, timeout: float = 10.0) -> dict:
     """Send a JSON command to the bot control API and return the response.
 
     Returns ``{"ok": False, "error": "..."}`` on connection or protocol errors.
     """
+    global _LEGACY_MODE
     try:
-        token = _current_control_api_token()
-        payload = dict(cmd)
-        if token:
-            payload["token"] = token
-
-        with socket.create_connection(API_ADDR, timeout=timeout) as s:
-            s.sendall((json.dumps(payload) + "\n").encode())
-            buf = b""
-            while True:
-                chunk = s.recv(4096)
-                if not chunk:
-                    break
-                buf += chunk
-                if b"\n" in buf:
-                    break
-            line = buf.split(b"\n", 1)[0]
-            return json.loads(line.decode())
+        if _LEGACY_MODE:
+            return _send_oneshot(cmd, timeout)
+        try:
+            resp = _SHARED.request(cmd, timeout=timeout)
+        except HandshakeRejected as exc:
+            if str(exc) != "unknown action":
+                return {"ok": False, "error": str(exc)}
+            # bot predates the handshake; stay on one-shot connections
+            _LEGACY_MODE = True
+            return _send_oneshot(cmd, timeout)
+        if resp.get("error") == "unauthorized":
+            # token rotated in .env: reconnect and authenticate again
+            _SHARED.close()
+            resp = _SHARED.request(cmd, timeout=timeout)
+        return resp
     except Exception as e:
         return {"ok": False, "error": str(e)}
@@ -0,0 +1,107 @@
+"""Background subscriber for control API server-push events.
+
+Opens a dedicated connection, sends a ``subscribe`` request and emits every
+event line through a Qt signal. After a disconnect it reconnects with
+``since_seq`` so missed events are replayed by the bot.
+"""
+
+import json
+import socket
+
+from PySide6 import QtCore
+
+from services.control_api_client import API_ADDR, _current_control_api_token
+
+
+class EventSubscriber(QtCore.QThread):
+    """QThread that streams control API events to the UI thread."""
+
+    event_received = QtCore.Signal(dict)
+    connection_changed = QtCore.Signal(bool)
+
+    def __init__(self, topics=None, reconnect_interval: float = 3.0):
+        super().__init__()
+        self._topics = list(topics or [])
+        self._reconnect_interval = float(reconnect_interval)
+        self._last_seq = None
+        self._stopped = False
+        self._sock = None
+
+    def stop(self):
+        self._stopped = True
+        try:
+            if self._sock is not None:
+                self._sock.shutdown(socket.SHUT_RDWR)
+        except Exception:
+            pass
+        try:
+            self.wait(3000)
+        except Exception:
+            pass
+
+    def _sleep_interruptible(self, seconds: float):
+        remaining_ms = max(1, int(seconds * 1000))
+        while remaining_ms > 0 and not self._stopped and not self.isInterruptionRequested():
+            step = 100 if remaining_ms > 100 else remaining_ms
+            self.msleep(step)
+            remaining_ms -= step
+
+    def _subscribe_request(self) -> dict:
+        req = {"action": "subscribe", "id": 1}
+        if self._topics:
+            req["topics"] = self._topics
+        if self._last_seq is not None:
+            req["since_seq"] = self._last_seq
+        token = _current_control_api_token()
+        if token:
+            req["token"] = token
+        return req
+
+    def _handle_line(self, raw: bytes, state: dict):
+        try:
+            msg = json.loads(raw.decode())
+        except Exception:
+            return
+        if not isinstance(msg, dict):
+            return
+        if msg.get("id") == 1 and "event" not in msg:
+            if not msg.get("ok"):
+                raise ConnectionError(str(msg.get("error") or "subscribe failed"))
+            state["subscribed"] = True
+            self.connection_changed.emit(True)
+            if msg.get("resync"):
+                self.event_received.emit({"event": "resync"})
+            return
+        seq = msg.get("seq")
+        if isinstance(seq, int) and (self._last_seq is None or seq > self._last_seq):
+            self._last_seq = seq
+        self.event_received.emit(msg)
+
+    def run(self):
+        while not self._stopped and not self.isInterruptionRequested():
+            state = {"subscribed": False}
+            try:
+                with socket.create_connection(API_ADDR, timeout=2.0) as sock:
+                    self._sock = sock
+                    sock.settimeout(1.0)
+                    sock.sendall((json.dumps(self._subscribe_request()) + "\n").encode())
+                    buf = b""
+                    while not self._stopped and not self.isInterruptionRequested():
+                        try:
+                            chunk = sock.recv(65536)
+                        except socket.timeout:
+                            continue
+                        if not chunk:
+                            break
+                        buf += chunk
+                        while b"\n" in buf:
+                            line, buf = buf.split(b"\n", 1)
+                            if line.strip():
+                                self._handle_line(line, state)
+            except Exception:
+                pass
+            finally:
+                self._sock = None
+                if state["subscribed"]:
+                    self.connection_changed.emit(False)
+            self._sleep_interruptible(self._reconnect_interval)
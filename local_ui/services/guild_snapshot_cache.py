@@ -0,0 +1,135 @@
+"""Client-side cache for the control API ``guild_snapshot`` action.
+
+The last full snapshot is kept in memory and persisted to
+``data/cache/ui/guild_snapshot.json`` so guild pickers can be filled
+instantly on startup. Refreshes send the cached ``version``/``epoch``; the
+bot answers "unchanged" or a delta of changed/removed guilds, which is
+merged here. Callers always get the classic ``{"ok": True, "guilds": [...]}``
+shape back.
+"""
+
+import json
+import os
+import threading
+
+from core.repo_paths import get_repo_root
+
+from .control_api_client import send_cmd
+
+
+def _cache_path() -> str:
+    return os.path.join(get_repo_root(), "data", "cache", "ui", "guild_snapshot.json")
+
+
+class GuildSnapshotCache:
+    """Versioned guild snapshot merged from full and delta responses."""
+
+    def __init__(self, path: str | None = None):
+        self._path = path or _cache_path()
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._loaded = False
+
+    def _load_locked(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self._path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+            if isinstance(data, dict) and isinstance(data.get("guilds"), list):
+                self._snapshot = data
+        except Exception:
+            self._snapshot = None
+
+    def _save_locked(self):
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            tmp = self._path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(self._snapshot, fh, ensure_ascii=False)
+            os.replace(tmp, self._path)
+        except Exception:
+            pass
+
+    def cached(self) -> dict | None:
+        """Last known snapshot (possibly from a previous session), or None."""
+        with self._lock:
+            self._load_locked()
+            if self._snapshot is None:
+                return None
+            return {"ok": True, "cached": True, "guilds": list(self._snapshot["guilds"])}
+
+    def _merge_locked(self, resp: dict) -> None:
+        if resp.get("unchanged"):
+            return
+        if resp.get("delta") and self._snapshot is not None:
+            removed = {str(gid) for gid in resp.get("removed") or []}
+            changed = {str(g.get("id")): g for g in resp.get("guilds") or []}
+            guilds = []
+            for guild in self._snapshot["guilds"]:
+                gid = str(guild.get("id"))
+                if gid in removed:
+                    continue
+                guilds.append(changed.pop(gid, guild))
+            guilds.extend(changed.values())
+        else:
+            guilds = list(resp.get("guilds") or [])
+        self._snapshot = {"version": resp.get("version"), "epoch": resp.get("epoch"), "guilds": guilds}
+
+    def fetch(self, timeout: float = 8.0) -> dict:
+        """Refresh from the bot and return the merged snapshot."""
+        with self._lock:
+            self._load_locked()
+            cmd = {"action": "guild_snapshot"}
+            if self._snapshot is not None and self._snapshot.get("version") is not None:
+                cmd["since_version"] = self._snapshot["version"]
+                cmd["epoch"] = self._snapshot.get("epoch")
+
+        resp = send_cmd(cmd, timeout=timeout)
+        if not isinstance(resp, dict) or not resp.get("ok"):
+            return resp if isinstance(resp, dict) else {"ok": False, "error": str(resp)}
+        if "version" not in resp:
+            # bot without versioned snapshots: plain full response
+            return resp
+
+        with self._lock:
+            if (resp.get("unchanged") or resp.get("delta")) and self._snapshot is None:
+                # cache was cleared meanwhile; ask for everything
+                resp = send_cmd({"action": "guild_snapshot"}, timeout=timeout)
+                if not resp.get("ok"):
+                    return resp
+            changed = not resp.get("unchanged")
+            self._merge_locked(resp)
+            if changed:
+                self._save_locked()
+            return {"ok": True, "version": self._snapshot.get("version"), "guilds": list(self._snapshot["guilds"])}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshot = None
+            self._loaded = True
+            try:
+                os.remove(self._path)
+            except Exception:
+                pass
+
+
+_SHARED = None
+_SHARED_LOCK = threading.Lock()
+
+
+def get_snapshot_cache() -> GuildSnapshotCache:
+    global _SHARED
+    with _SHARED_LOCK:
+        if _SHARED is None:
+            _SHARED = GuildSnapshotCache()
+        return _SHARED
+
+
+def fetch_guild_snapshot(timeout: float = 8.0) -> dict:
+    """Drop-in replacement for ``send_cmd({"action": "guild_snapshot"})``."""
+    try:
+        return get_snapshot_cache().fetch(timeout=timeout)
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
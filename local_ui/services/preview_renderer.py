@@ -0,0 +1,90 @@
+"""Background renderer for the live preview tab.
+
+The preview controller submits render parameters per target ("banner",
+"rank"). Each submission gets a new generation number; only the newest job
+per target is rendered and results whose generation has been superseded
+are dropped, so fast typing or slider drags never queue up stale renders.
+
+Images go straight to ``QImage`` without a PNG round-trip.
+"""
+
+import threading
+
+from PySide6 import QtCore, QtGui
+
+
+def _to_qimage(image) -> QtGui.QImage:
+    rgb = image.convert("RGB")
+    data = rgb.tobytes("raw", "RGB")
+    qimage = QtGui.QImage(data, rgb.width, rgb.height, rgb.width * 3, QtGui.QImage.Format_RGB888)
+    # detach from the Python buffer before it goes out of scope
+    return qimage.copy()
+
+
+class PreviewRenderer(QtCore.QThread):
+    """QThread that renders the latest preview job per target."""
+
+    rendered = QtCore.Signal(str, int, QtGui.QImage)
+    failed = QtCore.Signal(str, int, str)
+
+    def __init__(self, renderers: dict, parent=None):
+        super().__init__(parent)
+        # target -> callable(**params, encode=False) returning a PIL image
+        self._renderers = dict(renderers)
+        self._cond = threading.Condition()
+        self._jobs = {}
+        self._generations = {}
+        self._stopped = False
+
+    def submit(self, target: str, params: dict) -> int:
+        """Queue a render for *target*, replacing any job not yet started."""
+        with self._cond:
+            generation = self._generations.get(target, 0) + 1
+            self._generations[target] = generation
+            self._jobs[target] = (generation, dict(params))
+            self._cond.notify()
+        if not self.isRunning() and not self._stopped:
+            self.start()
+        return generation
+
+    def invalidate(self, target: str) -> None:
+        """Drop pending and in-flight results for *target* (e.g. a bot-rendered image won)."""
+        with self._cond:
+            self._generations[target] = self._generations.get(target, 0) + 1
+            self._jobs.pop(target, None)
+
+    def is_current(self, target: str, generation: int) -> bool:
+        with self._cond:
+            return self._generations.get(target) == generation
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._jobs.clear()
+            self._cond.notify_all()
+        try:
+            self.wait(3000)
+        except Exception:
+            pass
+
+    def run(self):
+        while True:
+            with self._cond:
+                while not self._jobs and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                target, (generation, params) = self._jobs.popitem()
+
+            renderer = self._renderers.get(target)
+            if renderer is None or not self.is_current(target, generation):
+                continue
+            try:
+                image = renderer(**params, encode=False)
+                qimage = _to_qimage(image)
+            except Exception as e:
+                if self.is_current(target, generation):
+                    self.failed.emit(target, generation, str(e))
+                continue
+            if self.is_current(target, generation):
+                self.rendered.emit(target, generation, qimage)
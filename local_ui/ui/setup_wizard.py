@@ -3,6 +3,7 @@ from config.config_io import (config_json_path, ensure_env_file, load_env_dict,
                               save_json_deep_merged, save_json_merged)
 from PySide6 import QtWidgets
 from services.control_api_client import send_cmd
+from services.guild_snapshot_cache import fetch_guild_snapshot
 
 # Platform mapping for social channels
 _SOCIAL_PLATFORMS = ["Twitch", "YouTube", "Twitter / X", "TikTok", "Instagram"]
@@ -452,7 +453,7 @@ class SetupWizardDialog(QtWidgets.QDialog):
         if self._snapshot_cache is not None:
             return self._snapshot_cache
         try:
-            resp = send_cmd({"action": "guild_snapshot"}, timeout=8.0)
+            resp = fetch_guild_snapshot(timeout=8.0)
         except Exception as exc:
             QtWidgets.QMessageBox.warning(self, "Snapshot", f"Bot nicht erreichbar: {exc}")
             return None
@@ -0,0 +1,37 @@
+"""Tiny line chart used for the dashboard's metric history."""
+
+from PySide6 import QtCore, QtGui, QtWidgets
+
+
+class SparklineWidget(QtWidgets.QWidget):
+    """Draws a list of numbers as a single polyline scaled to the widget."""
+
+    def __init__(self, color: str = "#4aa3ff", parent=None):
+        super().__init__(parent)
+        self._values = []
+        self._color = QtGui.QColor(color)
+        self.setMinimumSize(120, 22)
+        self.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+
+    def set_values(self, values):
+        self._values = [float(v) for v in (values or []) if isinstance(v, (int, float))]
+        if self._values:
+            self.setToolTip(f"min {min(self._values):.2f} — max {max(self._values):.2f} — last {self._values[-1]:.2f}")
+        self.update()
+
+    def paintEvent(self, _event):
+        if len(self._values) < 2:
+            return
+        painter = QtGui.QPainter(self)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        rect = self.rect().adjusted(1, 2, -1, -2)
+        lo, hi = min(self._values), max(self._values)
+        span = (hi - lo) or 1.0
+        step = rect.width() / float(len(self._values) - 1)
+        points = [
+            QtCore.QPointF(rect.left() + i * step, rect.bottom() - (v - lo) / span * rect.height())
+            for i, v in enumerate(self._values)
+        ]
+        painter.setPen(QtGui.QPen(self._color, 1.4))
+        painter.drawPolyline(points)
+        painter.end()
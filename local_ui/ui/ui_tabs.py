@@ -1,6 +1,8 @@
 from controllers.features.features_controller import FEATURE_DEFS, FEATURE_ORDER
 from PySide6 import QtGui, QtWidgets
 
+from .sparkline import SparklineWidget
+
 
 def build_dashboard_tab(window, tabs: QtWidgets.QTabWidget):
     dash = QtWidgets.QWidget()
@@ -38,6 +40,31 @@ def build_dashboard_tab(window, tabs: QtWidgets.QTabWidget):
     monitor_grid.addWidget(QtWidgets.QLabel("Cogs:"), 3, 0)
     monitor_grid.addWidget(window.mon_cogs, 3, 1)
 
+    window.mon_lag = QtWidgets.QLabel("—")
+    window.mon_guilds = QtWidgets.QLabel("—")
+    monitor_grid.addWidget(QtWidgets.QLabel("Loop lag:"), 3, 2)
+    monitor_grid.addWidget(window.mon_lag, 3, 3)
+    monitor_grid.addWidget(QtWidgets.QLabel("Guilds:"), 4, 0)
+    monitor_grid.addWidget(window.mon_guilds, 4, 1)
+
+    # metric history (filled from metrics_history + live status samples)
+    window.mon_sparklines = {
+        "cpu_percent": SparklineWidget("#4aa3ff"),
+        "memory_rss_mb": SparklineWidget("#7bd88f"),
+        "loop_lag_ms": SparklineWidget("#ffb347"),
+        "gateway_ping_ms": SparklineWidget("#d291ff"),
+    }
+    spark_labels = {
+        "cpu_percent": "CPU",
+        "memory_rss_mb": "Memory",
+        "loop_lag_ms": "Loop lag",
+        "gateway_ping_ms": "Ping",
+    }
+    for idx, (key, spark) in enumerate(window.mon_sparklines.items()):
+        row, col = 5 + idx // 2, (idx % 2) * 2
+        monitor_grid.addWidget(QtWidgets.QLabel(f"{spark_labels[key]}:"), row, col)
+        monitor_grid.addWidget(spark, row, col + 1)
+
     console_box = QtWidgets.QGroupBox("Live Console")
     console_layout = QtWidgets.QVBoxLayout(console_box)
     window.dash_console = QtWidgets.QPlainTextEdit()
@@ -1121,33 +1148,35 @@ def build_welcome_and_rank_tabs(window, tabs: QtWidgets.QTabWidget, QtCore):
     window.pv_save.clicked.connect(lambda: window._save_preview(reload_after=False))
     window.pv_save_reload.clicked.connect(lambda: window._save_preview(reload_after=True))
 
+    # while editing, previews render at most every 80 ms; the timer is not
+    # restarted by further input, so the last change is always rendered
     window._preview_debounce = QtCore.QTimer(window)
     window._preview_debounce.setSingleShot(True)
-    window._preview_debounce.setInterval(250)
+    window._preview_debounce.setInterval(80)
     window._preview_debounce.timeout.connect(window._apply_live_preview)
 
-    window.pv_name.textChanged.connect(lambda: window._preview_debounce.start())
-    window.pv_banner_path.textChanged.connect(lambda: window._preview_debounce.start())
-    window.pv_message.textChanged.connect(lambda: window._preview_debounce.start())
-    window.pv_bg_mode.currentIndexChanged.connect(lambda _v: window._preview_debounce.start())
-    window.pv_bg_zoom.valueChanged.connect(lambda _v: window._preview_debounce.start())
-    window.pv_bg_x.valueChanged.connect(lambda _v: window._preview_debounce.start())
-    window.pv_bg_y.valueChanged.connect(lambda _v: window._preview_debounce.start())
-    window.pv_title.textChanged.connect(lambda: window._preview_debounce.start())
-    window.pv_title_font.currentTextChanged.connect(lambda _t: window._preview_debounce.start())
-    window.pv_user_font.currentTextChanged.connect(lambda _t: window._preview_debounce.start())
-    window.pv_title_size.valueChanged.connect(lambda _v: window._preview_debounce.start())
-    window.pv_user_size.valueChanged.connect(lambda _v: window._preview_debounce.start())
-    window.pv_title_color.textChanged.connect(lambda: window._preview_debounce.start())
-    window.pv_user_color.textChanged.connect(lambda: window._preview_debounce.start())
-    window.pv_title_x.valueChanged.connect(lambda _v: window._preview_debounce.start())
-    window.pv_title_y.valueChanged.connect(lambda _v: window._preview_debounce.start())
-    window.pv_user_x.valueChanged.connect(lambda _v: window._preview_debounce.start())
-    window.pv_user_y.valueChanged.connect(lambda _v: window._preview_debounce.start())
-    window.pv_text_x.valueChanged.connect(lambda _v: window._preview_debounce.start())
-    window.pv_text_y.valueChanged.connect(lambda _v: window._preview_debounce.start())
-    window.pv_avatar_x.valueChanged.connect(lambda _v: window._preview_debounce.start())
-    window.pv_avatar_y.valueChanged.connect(lambda _v: window._preview_debounce.start())
+    window.pv_name.textChanged.connect(lambda: window._schedule_live_preview())
+    window.pv_banner_path.textChanged.connect(lambda: window._schedule_live_preview())
+    window.pv_message.textChanged.connect(lambda: window._schedule_live_preview())
+    window.pv_bg_mode.currentIndexChanged.connect(lambda _v: window._schedule_live_preview())
+    window.pv_bg_zoom.valueChanged.connect(lambda _v: window._schedule_live_preview())
+    window.pv_bg_x.valueChanged.connect(lambda _v: window._schedule_live_preview())
+    window.pv_bg_y.valueChanged.connect(lambda _v: window._schedule_live_preview())
+    window.pv_title.textChanged.connect(lambda: window._schedule_live_preview())
+    window.pv_title_font.currentTextChanged.connect(lambda _t: window._schedule_live_preview())
+    window.pv_user_font.currentTextChanged.connect(lambda _t: window._schedule_live_preview())
+    window.pv_title_size.valueChanged.connect(lambda _v: window._schedule_live_preview())
+    window.pv_user_size.valueChanged.connect(lambda _v: window._schedule_live_preview())
+    window.pv_title_color.textChanged.connect(lambda: window._schedule_live_preview())
+    window.pv_user_color.textChanged.connect(lambda: window._schedule_live_preview())
+    window.pv_title_x.valueChanged.connect(lambda _v: window._schedule_live_preview())
+    window.pv_title_y.valueChanged.connect(lambda _v: window._schedule_live_preview())
+    window.pv_user_x.valueChanged.connect(lambda _v: window._schedule_live_preview())
+    window.pv_user_y.valueChanged.connect(lambda _v: window._schedule_live_preview())
+    window.pv_text_x.valueChanged.connect(lambda _v: window._schedule_live_preview())
+    window.pv_text_y.valueChanged.connect(lambda _v: window._schedule_live_preview())
+    window.pv_avatar_x.valueChanged.connect(lambda _v: window._schedule_live_preview())
+    window.pv_avatar_y.valueChanged.connect(lambda _v: window._schedule_live_preview())
     window.pv_name.textChanged.connect(window._mark_preview_dirty)
     window.pv_banner_path.textChanged.connect(window._mark_preview_dirty)
     window.pv_message.textChanged.connect(window._mark_preview_dirty)
@@ -1170,14 +1199,14 @@ def build_welcome_and_rank_tabs(window, tabs: QtWidgets.QTabWidget, QtCore):
     window.pv_text_y.valueChanged.connect(window._mark_preview_dirty)
     window.pv_avatar_x.valueChanged.connect(window._mark_preview_dirty)
     window.pv_avatar_y.valueChanged.connect(window._mark_preview_dirty)
-    window.pv_avatar_size.valueChanged.connect(lambda _v: window._preview_debounce.start())
+    window.pv_avatar_size.valueChanged.connect(lambda _v: window._schedule_live_preview())
     window.pv_avatar_size.valueChanged.connect(window._mark_preview_dirty)
-    window.rk_name.textChanged.connect(lambda: window._preview_debounce.start())
-    window.rk_bg_path.textChanged.connect(lambda: window._preview_debounce.start())
-    window.rk_bg_mode.currentIndexChanged.connect(lambda _v: window._preview_debounce.start())
-    window.rk_bg_zoom.valueChanged.connect(lambda _v: window._preview_debounce.start())
-    window.rk_bg_x.valueChanged.connect(lambda _v: window._preview_debounce.start())
-    window.rk_bg_y.valueChanged.connect(lambda _v: window._preview_debounce.start())
+    window.rk_name.textChanged.connect(lambda: window._schedule_live_preview())
+    window.rk_bg_path.textChanged.connect(lambda: window._schedule_live_preview())
+    window.rk_bg_mode.currentIndexChanged.connect(lambda _v: window._schedule_live_preview())
+    window.rk_bg_zoom.valueChanged.connect(lambda _v: window._schedule_live_preview())
+    window.rk_bg_x.valueChanged.connect(lambda _v: window._schedule_live_preview())
+    window.rk_bg_y.valueChanged.connect(lambda _v: window._schedule_live_preview())
 
     for _combo in (
         window.rk_username_font,
@@ -1187,7 +1216,7 @@ def build_welcome_and_rank_tabs(window, tabs: QtWidgets.QTabWidget, QtCore):
         window.rk_voice_font,
         window.rk_achievements_font,
     ):
-        _combo.currentTextChanged.connect(lambda _t: window._preview_debounce.start())
+        _combo.currentTextChanged.connect(lambda _t: window._schedule_live_preview())
 
     for _spin in (
         window.rk_username_size,
@@ -1216,7 +1245,7 @@ def build_welcome_and_rank_tabs(window, tabs: QtWidgets.QTabWidget, QtCore):
         window.rk_bar_width,
         window.rk_bar_height,
     ):
-        _spin.valueChanged.connect(lambda _v: window._preview_debounce.start())
+        _spin.valueChanged.connect(lambda _v: window._schedule_live_preview())
 
     for _line in (
         window.rk_username_color,
@@ -1228,7 +1257,7 @@ def build_welcome_and_rank_tabs(window, tabs: QtWidgets.QTabWidget, QtCore):
         window.rk_bar_bg_color,
         window.rk_bar_fill_color,
     ):
-        _line.textChanged.connect(lambda: window._preview_debounce.start())
+        _line.textChanged.connect(lambda: window._schedule_live_preview())
 
 
 # =====================================================================
@@ -1762,6 +1791,7 @@ def build_purge_tab(window, tabs: QtWidgets.QTabWidget):
     window.purge_refresh_btn.clicked.connect(window.on_purge_refresh_guilds)
     window.purge_guild_combo.currentIndexChanged.connect(window._on_purge_guild_changed)
     window.purge_execute_btn.clicked.connect(window.on_purge_execute)
+    window._load_cached_purge_guilds()
 
     tabs.addTab(purge, "Purge")
 
@@ -0,0 +1,119 @@
+"""Micro-benchmark for the social feed parsers (whole-body vs. streamed).
+
+Usage:
+    python scripts/dev/bench_feed_parsers.py [iterations]
+
+Builds a ~600 KB profile page with video links in the middle and compares
+the old whole-body regex with ``PatternScanner`` fed in
+``STREAM_CHUNK_SIZE`` chunks the way ``FeedClient.get_streamed`` does.
+"read" is how much of the page the scanner needed before it stopped; both
+must return the same items. "unchanged" is the cost of an unchanged page,
+which only hashes that prefix. The YouTube row times the whole-body Atom
+parser the cog uses for those small feeds.
+"""
+
+import hashlib
+import os
+import re
+import sys
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+for path in (REPO_ROOT, os.path.join(REPO_ROOT, "src")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from mybot.cogs.community import socials  # noqa: E402
+from mybot.utils.feed_http import STREAM_CHUNK_SIZE  # noqa: E402
+
+CHANNEL = "UCbenchmark000000000000"
+USER = "someone"
+
+
+def _atom_fixture(entries: int = 15) -> bytes:
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" '
+        'xmlns:media="http://search.yahoo.com/mrss/" xmlns="http://www.w3.org/2005/Atom">\n'
+        f"<title>Bench Channel</title><yt:channelId>{CHANNEL}</yt:channelId>\n"
+    ]
+    for i in range(entries):
+        parts.append(
+            f"<entry><id>yt:video:vid{i:08d}</id><yt:videoId>vid{i:08d}</yt:videoId>"
+            f"<yt:channelId>{CHANNEL}</yt:channelId><title>Video number {i}</title>"
+            f"<author><name>Bench Channel</name></author>"
+            f"<published>2024-01-{i % 28 + 1:02d}T12:00:00+00:00</published>"
+            f"<media:group><media:title>Video number {i}</media:title>"
+            f"<media:description>{'Lorem ipsum dolor sit amet. ' * 40}</media:description>"
+            f"</media:group></entry>\n"
+        )
+    parts.append("</feed>\n")
+    return "".join(parts).encode("utf-8")
+
+
+def _html_fixture(size: int = 600 * 1024) -> bytes:
+    filler = '<div class="x">' + "a" * 200 + "</div>\n"
+    head = filler * (size // 3 // len(filler))
+    links = "".join(f'<a href="/@{USER}/video/{7300000000000000000 + i}">v</a>' for i in range(30))
+    tail = filler * (size * 2 // 3 // len(filler))
+    return (head + links + tail).encode("utf-8")
+
+
+# --- the whole-body implementation the scanner replaced ------------------
+
+def _legacy_tiktok(body: bytes) -> list:
+    text = body.decode("utf-8", errors="replace")
+    ids = []
+    for vid in re.findall(rf"/@{re.escape(USER)}/video/(\d+)", text, re.IGNORECASE):
+        if vid not in ids:
+            ids.append(vid)
+        if len(ids) >= socials.SCRAPED_ITEMS:
+            break
+    return socials._tiktok_items(ids, USER)
+
+
+# --- streamed ----------------------------------------------------------------
+
+def _streamed(body: bytes, parser):
+    read = 0
+    for start in range(0, len(body), STREAM_CHUNK_SIZE):
+        chunk = body[start:start + STREAM_CHUNK_SIZE]
+        read += len(chunk)
+        if parser.feed(chunk):
+            break
+    return parser.close(), read
+
+
+def _bench(fn, iterations: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1000.0
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    atom = _atom_fixture()
+    youtube_ms = _bench(lambda: socials._parse_youtube_feed(atom.decode("utf-8"), CHANNEL), iterations)
+    print(f" youtube: whole {youtube_ms:7.3f} ms  ({len(atom) / 1024:.1f} KiB Atom feed)")
+
+    page = _html_fixture()
+    make_parser = lambda: socials._tiktok_parser(USER)  # noqa: E731
+    streamed_items, read = _streamed(page, make_parser())
+    if streamed_items != _legacy_tiktok(page):
+        raise SystemExit("tiktok: streamed and whole-body results differ")
+    whole_ms = _bench(lambda: _legacy_tiktok(page), iterations)
+    stream_ms = _bench(lambda: _streamed(page, make_parser()), iterations)
+    unchanged_ms = _bench(lambda: hashlib.sha1(page[:read]).hexdigest(), iterations)
+    print(
+        f"  tiktok: whole {whole_ms:7.3f} ms  streamed {stream_ms:7.3f} ms  "
+        f"unchanged {unchanged_ms:7.3f} ms  read {read / 1024:7.1f} of {len(page) / 1024:7.1f} KiB  "
+        f"speedup {whole_ms / stream_ms:.2f}x"
+    )
+    print(f"({iterations} iterations per run, {STREAM_CHUNK_SIZE // 1024} KiB chunks)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Micro-benchmark for rank card rendering with and without the layer cache.
+
+Usage:
+    python scripts/dev/bench_rankcard.py [iterations]
+
+"cold" clears the static layer cache before every card (the old behaviour:
+background resize, font loads and mask on each call); "warm" reuses it the
+way consecutive /rank calls for the same guild do. "compose" excludes the
+PNG encode, "total" includes it. The last table compares the output
+encoders a guild can pick (``IMAGE_FORMAT``) by encode time and size.
+"""
+
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+for path in (REPO_ROOT, os.path.join(REPO_ROOT, "src")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from mybot.cogs.leveling import rank  # noqa: E402
+from mybot.utils.image_encoding import FORMATS, encode_image  # noqa: E402
+
+
+def _bench(iterations: int, cold: bool, encode: bool) -> float:
+    rank.clear_layer_cache()
+    rank.render_rankcard(username="warmup", encode=encode)
+    started = time.perf_counter()
+    for i in range(iterations):
+        if cold:
+            rank.clear_layer_cache()
+        rank.render_rankcard(
+            username=f"User{i}", level=i % 50, xp=i * 7, xp_needed=500, messages=i, encode=encode
+        )
+    return (time.perf_counter() - started) / iterations * 1000.0
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    for label, encode in (("compose", False), ("total", True)):
+        cold_ms = _bench(iterations, cold=True, encode=encode)
+        warm_ms = _bench(iterations, cold=False, encode=encode)
+        print(
+            f"{label:>7}: cold {cold_ms:7.1f} ms/card  warm {warm_ms:7.1f} ms/card  "
+            f"speedup {cold_ms / warm_ms:.2f}x"
+        )
+    print(f"({iterations} cards per run)")
+
+    card = rank.render_rankcard(username="Encoder", level=12, xp=340, xp_needed=500, encode=False)
+    for fmt in FORMATS:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            data = encode_image(card, {"format": fmt})
+        encode_ms = (time.perf_counter() - started) / iterations * 1000.0
+        print(f"{fmt:>12}: encode {encode_ms:7.1f} ms  {len(data) / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
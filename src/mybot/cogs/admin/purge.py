@@ -145,6 +145,9 @@ class Purge(commands.Cog):
 
         def _progress(deleted_in_ch: int, ch_name: str):
             self._purge_current_channel = ch_name
+            self._publish_purge_status()
+
+        self._publish_purge_status()
 
         try:
             me = channels[0].guild.me if channels else None
@@ -163,6 +166,7 @@ class Purge(commands.Cog):
                     reason=reason, progress_callback=_progress,
                 )
                 self._purge_deleted += count
+                self._publish_purge_status()
 
             elapsed = time.time() - self._purge_started_at
             print(f"[Purge] DONE — {self._purge_deleted} messages deleted in {elapsed:.1f}s")
@@ -172,6 +176,14 @@ class Purge(commands.Cog):
         finally:
             self._purge_running = False
             self._purge_finished = True
+            self._publish_purge_status()
+
+    def _publish_purge_status(self) -> None:
+        """Notify ``on_purge_progress`` listeners (control API subscriptions)."""
+        try:
+            self.bot.dispatch("purge_progress", self.get_purge_status())
+        except Exception:
+            pass
 
     def get_purge_status(self) -> dict:
         """Return current purge status for UI polling."""
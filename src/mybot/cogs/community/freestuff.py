@@ -6,17 +6,21 @@ Supported sources: Epic Games, Steam, GOG, Humble Bundle, misc.
 
 import asyncio
 import datetime
+import os
 import traceback
 
-import aiohttp
 import discord
 from discord import app_commands
 from discord.ext import commands, tasks
 
+from mybot.cogs.community.freestuff_sources import (fetch_sources,
+                                                   register_source)
 from mybot.utils.config import load_cog_config
+from mybot.utils.feed_http import get_feed_client
 from mybot.utils.i18n import translate
-from mybot.utils.jsonstore import safe_load_json, safe_save_json
+from mybot.utils.jsonstore import safe_load_json
 from mybot.utils.paths import guild_data_path
+from mybot.utils.seen_store import get_seen_store
 
 # ---------------------------------------------------------------------------
 # Config helpers
@@ -58,95 +62,98 @@ def _all_sources(guild_id: int | str | None = None) -> dict[str, bool]:
 # Tracking already-posted items
 # ---------------------------------------------------------------------------
 
-def _load_posted(guild_id: int | str | None) -> list:
+def _legacy_posted_ids(guild_id: int | str | None) -> list:
+    """Posted ids from the old ``freestuff_data.json`` (imported once into the seen store)."""
     path = guild_data_path(guild_id, "freestuff_data.json")
-    if not path:
+    if not path or not os.path.exists(path):
         return []
     data = safe_load_json(path, default={"posted": []})
     return data.get("posted", [])
 
 
-def _save_posted(guild_id: int | str | None, posted: list):
-    path = guild_data_path(guild_id, "freestuff_data.json")
-    if path:
-        # Keep only the last 200 entries to avoid unbounded growth
-        safe_save_json(path, {"posted": posted[-200:]})
-
-
 # ---------------------------------------------------------------------------
 # RSS / API fetching (lightweight – no external library needed)
 # ---------------------------------------------------------------------------
 
-async def _fetch_epic_free_games() -> list[dict]:
-    """Fetch currently free games from Epic Games Store API."""
-    url = "https://store-site-backend-static.ak.epicgames.com/freeGamesPromotions?locale=en-US"
+EPIC_FREE_GAMES_URL = "https://store-site-backend-static.ak.epicgames.com/freeGamesPromotions?locale=en-US"
+
+
+def _parse_epic_free_games(data: dict) -> list[dict]:
+    """Currently free promotions from an Epic ``freeGamesPromotions`` payload."""
     items = []
+    elements = (
+        data.get("data", {})
+        .get("Catalog", {})
+        .get("searchStore", {})
+        .get("elements", [])
+    )
+    now = datetime.datetime.now(datetime.timezone.utc)
+    for elem in elements:
+        title = elem.get("title", "Unknown")
+        promos = elem.get("promotions")
+        if not promos:
+            continue
+        offers = promos.get("promotionalOffers", [])
+        for offer_group in offers:
+            for offer in offer_group.get("promotionalOffers", []):
+                discount = offer.get("discountSetting", {}).get("discountPercentage", 100)
+                if discount != 0:
+                    continue
+                start = offer.get("startDate", "")
+                end = offer.get("endDate", "")
+                # Build a store URL slug
+                slug = ""
+                for mapping in elem.get("catalogNs", {}).get("mappings", []):
+                    slug = mapping.get("pageSlug", "")
+                    if slug:
+                        break
+                if not slug:
+                    slug = elem.get("productSlug") or elem.get("urlSlug") or ""
+                store_url = f"https://store.epicgames.com/en-US/p/{slug}" if slug else ""
+                # Thumbnail
+                image_url = ""
+                for img in elem.get("keyImages", []):
+                    if img.get("type") in ("OfferImageWide", "DieselStoreFrontWide", "Thumbnail"):
+                        image_url = img.get("url", "")
+                        break
+                items.append({
+                    "source": "Epic Games",
+                    "title": title,
+                    "url": store_url,
+                    "image": image_url,
+                    "id": f"epic:{slug or title}",
+                })
+    return items
+
+
+@register_source("epic", "Epic Games", ttl=30 * 60)
+async def _fetch_epic_free_games() -> list[dict] | None:
+    """Fetch currently free games from Epic Games Store API.
+
+    Conditional request: an unchanged payload is not parsed again, and not
+    downloaded at all when the CDN honours the stored validators.
+    """
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=15)) as resp:
-                if resp.status != 200:
-                    return []
-                data = await resp.json()
-        elements = (
-            data.get("data", {})
-            .get("Catalog", {})
-            .get("searchStore", {})
-            .get("elements", [])
+        return await get_feed_client().get_parsed(
+            EPIC_FREE_GAMES_URL, lambda resp: _parse_epic_free_games(resp.json()), source="epic"
         )
-        now = datetime.datetime.now(datetime.timezone.utc)
-        for elem in elements:
-            title = elem.get("title", "Unknown")
-            promos = elem.get("promotions")
-            if not promos:
-                continue
-            offers = promos.get("promotionalOffers", [])
-            for offer_group in offers:
-                for offer in offer_group.get("promotionalOffers", []):
-                    discount = offer.get("discountSetting", {}).get("discountPercentage", 100)
-                    if discount != 0:
-                        continue
-                    start = offer.get("startDate", "")
-                    end = offer.get("endDate", "")
-                    # Build a store URL slug
-                    slug = ""
-                    for mapping in elem.get("catalogNs", {}).get("mappings", []):
-                        slug = mapping.get("pageSlug", "")
-                        if slug:
-                            break
-                    if not slug:
-                        slug = elem.get("productSlug") or elem.get("urlSlug") or ""
-                    store_url = f"https://store.epicgames.com/en-US/p/{slug}" if slug else ""
-                    # Thumbnail
-                    image_url = ""
-                    for img in elem.get("keyImages", []):
-                        if img.get("type") in ("OfferImageWide", "DieselStoreFrontWide", "Thumbnail"):
-                            image_url = img.get("url", "")
-                            break
-                    items.append({
-                        "source": "Epic Games",
-                        "title": title,
-                        "url": store_url,
-                        "image": image_url,
-                        "id": f"epic:{slug or title}",
-                    })
     except Exception:
         traceback.print_exc()
-    return items
+        return None
 
 
-async def _fetch_all_sources(guild_id: int | str | None) -> list[dict]:
-    """Aggregate free stuff from all enabled sources."""
-    sources = _all_sources(guild_id)
-    items: list[dict] = []
+# Future: register Steam, GOG, Humble and misc fetchers the same way; each
+# returns a list of dicts with source, title, url, image, id keys.
 
-    if sources.get("epic"):
-        items.extend(await _fetch_epic_free_games())
 
-    # Future: add Steam, GOG, Humble, misc fetchers here.
-    # They follow the same pattern: return list of dicts with
-    # source, title, url, image, id keys.
+def _enabled_keys(guild_id: int | str | None) -> list[str]:
+    return [key for key, enabled in _all_sources(guild_id).items() if enabled]
 
-    return items
+
+async def _fetch_all_sources(guild_id: int | str | None) -> list[dict]:
+    """Aggregate free stuff from all enabled sources (served from the shared cache)."""
+    fetched, _refreshed = await fetch_sources(_enabled_keys(guild_id))
+    return [item for items in fetched.values() for item in items]
 
 
 # ---------------------------------------------------------------------------
@@ -220,22 +227,37 @@ class FreeStuff(commands.Cog):
     # Automated loop
     # ------------------------------------------------------------------
 
-    @tasks.loop(minutes=30)
+    @tasks.loop(minutes=5)
     async def check_free_stuff(self):
-        """Periodically check all guilds for free stuff (every 30 minutes)."""
-        for guild in self.bot.guilds:
+        """Fetch each source once its TTL expired and post new items to all guilds."""
+        guilds = list(self.bot.guilds)
+        enabled = {guild.id: _enabled_keys(guild.id) for guild in guilds if _channel_id(guild.id)}
+        try:
+            fetched, refreshed = await fetch_sources({key for keys in enabled.values() for key in keys})
+        except Exception as exc:
+            print(f"[FreeStuff] Source fetch failed: {exc}")
+            return
+        if not refreshed:
+            return
+        for guild in guilds:
+            if guild.id not in enabled:
+                continue
+            items = [item for key in enabled[guild.id] for item in fetched.get(key, [])]
             try:
-                await self._check_guild(guild)
+                await self._check_guild(guild, items)
             except Exception as exc:
                 print(f"[FreeStuff] Error checking guild {guild.id}: {exc}")
-            await asyncio.sleep(2)  # small delay between guilds
 
     @check_free_stuff.before_loop
     async def before_check(self):
         await self.bot.wait_until_ready()
 
-    async def _check_guild(self, guild: discord.Guild) -> int:
-        """Check and post free stuff for a single guild. Returns count of new items posted."""
+    async def _check_guild(self, guild: discord.Guild, items: list[dict] | None = None) -> int:
+        """Check and post free stuff for a single guild. Returns count of new items posted.
+
+        *items* are the already fetched items of the guild's enabled sources;
+        when omitted they are taken from the shared source cache.
+        """
         guild_id = guild.id
         channel_id = _channel_id(guild_id)
         if not channel_id:
@@ -247,14 +269,18 @@ class FreeStuff(commands.Cog):
         if channel is None:
             return 0
 
-        items = await _fetch_all_sources(guild_id)
-        posted = _load_posted(guild_id)
-        posted_set = set(posted)
+        if items is None:
+            items = await _fetch_all_sources(guild_id)
+        store = get_seen_store()
+        seen = await store.bucket("freestuff", guild_id, legacy=lambda: _legacy_posted_ids(guild_id))
         new_count = 0
 
         for item in items:
             item_id = item.get("id", "")
-            if not item_id or item_id in posted_set:
+            if not item_id:
+                continue
+            if item_id in seen:
+                seen.touch(item_id)
                 continue
 
             embed = discord.Embed(
@@ -269,15 +295,12 @@ class FreeStuff(commands.Cog):
 
             try:
                 await channel.send(embed=embed)
-                posted.append(item_id)
-                posted_set.add(item_id)
+                seen.add(item_id)
                 new_count += 1
             except Exception as exc:
                 print(f"[FreeStuff] Failed to post item {item_id}: {exc}")
 
-        if new_count:
-            _save_posted(guild_id, posted)
-
+        await asyncio.to_thread(store.flush)
         return new_count
 
 
@@ -0,0 +1,121 @@
+"""Registry of free-stuff sources with a shared, per-source TTL cache.
+
+A source is an async function returning a list of item dicts (``source``,
+``title``, ``url``, ``image``, ``id``) or None when the fetch failed. It is
+registered under the key used by the guild config toggle
+(``SOURCE_<KEY>``)::
+
+    @register_source("epic", "Epic Games", ttl=30 * 60)
+    async def _fetch_epic_free_games() -> list[dict] | None:
+        ...
+
+:func:`fetch_sources` fetches every requested source at most once per TTL,
+no matter how many guilds enable it. Guilds then only filter the cached
+items by their enabled sources. A failed fetch keeps serving the previous
+items and is retried after ``RETRY_SECONDS``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+DEFAULT_TTL_SECONDS = 30 * 60
+RETRY_SECONDS = 5 * 60
+
+
+class FreeSource(NamedTuple):
+    key: str
+    label: str
+    fetch: Callable[[], Awaitable[Optional[List[dict]]]]
+    ttl: float
+
+
+_REGISTRY: Dict[str, FreeSource] = {}
+
+
+def register_source(key: str, label: str, ttl: float = DEFAULT_TTL_SECONDS):
+    """Decorator registering an async fetcher as free-stuff source *key*."""
+    def _decorator(fetch):
+        _REGISTRY[key.lower()] = FreeSource(key.lower(), label, fetch, float(ttl))
+        return fetch
+
+    return _decorator
+
+
+def registered_sources() -> Dict[str, FreeSource]:
+    return dict(_REGISTRY)
+
+
+class _Entry:
+    __slots__ = ("items", "expires_at", "fetched_at", "fetches", "failures", "lock")
+
+    def __init__(self):
+        self.items: List[dict] = []
+        self.expires_at = 0.0
+        self.fetched_at = 0.0
+        self.fetches = 0
+        self.failures = 0
+        self.lock = asyncio.Lock()
+
+
+class SourceCache:
+    """Last fetch result per source, refreshed once its TTL has passed."""
+
+    def __init__(self):
+        self._entries: Dict[str, _Entry] = {}
+
+    async def get(self, source: FreeSource) -> Tuple[List[dict], bool]:
+        """``(items, refreshed)`` for *source*; concurrent callers share one fetch."""
+        entry = self._entries.setdefault(source.key, _Entry())
+        if time.monotonic() < entry.expires_at:
+            return entry.items, False
+        async with entry.lock:
+            if time.monotonic() < entry.expires_at:
+                return entry.items, False
+            try:
+                items = await source.fetch()
+            except Exception as exc:
+                print(f"[FreeStuff] {source.label} fetch failed: {exc}")
+                items = None
+            entry.fetches += 1
+            if items is None:
+                entry.failures += 1
+                entry.expires_at = time.monotonic() + min(source.ttl, RETRY_SECONDS)
+                return entry.items, False
+            entry.items = list(items)
+            entry.fetched_at = time.time()
+            entry.expires_at = time.monotonic() + source.ttl
+            return entry.items, True
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            key: {
+                "items": len(entry.items),
+                "fetches": entry.fetches,
+                "failures": entry.failures,
+                "fetched_at": entry.fetched_at,
+                "expires_in_s": round(max(0.0, entry.expires_at - now), 1),
+            }
+            for key, entry in self._entries.items()
+        }
+
+
+_CACHE = SourceCache()
+
+
+def get_source_cache() -> SourceCache:
+    return _CACHE
+
+
+async def fetch_sources(keys: Iterable[str]) -> Tuple[Dict[str, List[dict]], bool]:
+    """Cached items per registered source in *keys*, fetched concurrently.
+
+    The flag is True when at least one source was actually refetched.
+    """
+    wanted = [_REGISTRY[key] for key in dict.fromkeys(k.lower() for k in keys) if key in _REGISTRY]
+    results = await asyncio.gather(*(_CACHE.get(source) for source in wanted))
+    items = {source.key: result[0] for source, result in zip(wanted, results)}
+    return items, any(result[1] for result in results)
@@ -0,0 +1,80 @@
+"""Cross-guild aggregation of social media subscriptions.
+
+Every guild's ``social_media.json`` maps Discord channels to creators per
+platform. :func:`collect_subscriptions` folds all guilds into one table per
+platform::
+
+    {"YOUTUBE": {"uc123": Feed(creator="UC123", targets={guild_id: channel_id, ...})}}
+
+The SocialMedia cog fetches each unique creator once per cycle and fans the
+items out to every target, so cycle cost follows the number of distinct
+creators rather than guilds × creators.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, NamedTuple
+
+# Per-guild caps the fetchers used to apply to each guild's creator list.
+PER_GUILD_LIMITS = {"TWITCH": 100, "YOUTUBE": 20, "TIKTOK": 10, "INSTAGRAM": 10}
+
+# Platforms that are actually fetched (Twitter/X and custom feeds are placeholders).
+FETCHED_PLATFORMS = ("TWITCH", "YOUTUBE", "TIKTOK", "INSTAGRAM")
+
+
+class Feed(NamedTuple):
+    creator: str
+    # guild id -> channel id; like the per-guild lookup, the last entry wins
+    targets: Dict[int, int]
+
+
+def creator_key(platform: str, creator: str) -> str:
+    """Normalized creator identity used for dedup and item matching."""
+    key = str(creator or "").strip()
+    if platform in ("TIKTOK", "INSTAGRAM"):
+        key = key.lstrip("@")
+    return key.lower()
+
+
+def collect_subscriptions(guild_cfgs: Dict[int, dict]) -> Dict[str, Dict[str, Feed]]:
+    """Union of enabled (platform, creator) subscriptions across guilds."""
+    table: Dict[str, Dict[str, Feed]] = {p: {} for p in FETCHED_PLATFORMS}
+    for guild_id, cfg in guild_cfgs.items():
+        for platform in FETCHED_PLATFORMS:
+            platform_cfg = (cfg or {}).get(platform, {})
+            if not isinstance(platform_cfg, dict) or not platform_cfg.get("ENABLED"):
+                continue
+            feeds = table[platform]
+            seen_in_guild = set()
+            for entry in platform_cfg.get("CHANNELS", []) or []:
+                if not isinstance(entry, dict):
+                    continue
+                try:
+                    channel_id = int(entry.get("CHANNEL_ID", 0) or 0)
+                except (TypeError, ValueError):
+                    channel_id = 0
+                for creator in entry.get("CREATORS", []) or []:
+                    key = creator_key(platform, creator)
+                    if not key:
+                        continue
+                    if key not in seen_in_guild:
+                        if len(seen_in_guild) >= PER_GUILD_LIMITS[platform]:
+                            continue
+                        seen_in_guild.add(key)
+                    feed = feeds.get(key)
+                    if feed is None:
+                        feed = feeds[key] = Feed(str(creator).strip(), {})
+                    if channel_id:
+                        feed.targets[guild_id] = channel_id
+    return {platform: feeds for platform, feeds in table.items() if feeds}
+
+
+def creators(feeds: Dict[str, Feed]) -> List[str]:
+    """Creator names to fetch for one platform, one per unique creator."""
+    return [feed.creator for feed in feeds.values() if feed.targets]
+
+
+def targets_for(feeds: Dict[str, Feed], platform: str, creator: str) -> Dict[int, int]:
+    """``{guild_id: channel_id}`` subscribed to *creator*."""
+    feed = feeds.get(creator_key(platform, creator))
+    return feed.targets if feed is not None else {}
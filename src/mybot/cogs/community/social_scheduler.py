@@ -0,0 +1,226 @@
+"""Adaptive per-creator polling schedule for the SocialMedia cog.
+
+Every subscribed (platform, creator) gets its own next-check time in a
+heap. After each check the interval adapts:
+
+    new item seen       → interval halves (down to the platform minimum)
+    Twitch creator live → checked every ``LIVE_INTERVAL`` seconds
+    stream just ended   → back to the platform base interval
+    nothing new         → after ``QUIET_CHECKS`` quiet checks in a row the
+                          interval grows by half (up to the maximum)
+    fetch failed        → exponential backoff from the base interval
+
+No creator is ever checked less often than the old fixed 5-minute loop by
+default. Twitch logins are batched, so backing off saves almost nothing and
+Twitch stays capped at ``TWITCH_MAX_INTERVAL``. The other platforms cost one
+request per creator; their cap is ``SOCIAL_MAX_INTERVAL`` seconds (default
+300), which can be raised to let quiet creators back off further.
+
+Intervals get ±10 % jitter so creators do not synchronise. Each tick the cog
+takes due creators only while the global request budget
+(``SOCIAL_REQUEST_BUDGET`` requests per minute, default 30) allows;
+everything else stays due for the next tick. Twitch creators are checked in
+batches of up to 100 logins per request.
+"""
+
+from __future__ import annotations
+
+import heapq
+import os
+import random
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# platform -> (base, minimum) interval in seconds; the maximum comes from
+# _max_interval() and the base never exceeds it
+INTERVALS: Dict[str, Tuple[float, float]] = {
+    "TWITCH": (90.0, 60.0),
+    "YOUTUBE": (300.0, 180.0),
+    "TIKTOK": (300.0, 240.0),
+    "INSTAGRAM": (300.0, 240.0),
+}
+LIVE_INTERVAL = 300.0
+TWITCH_BATCH = 100
+TWITCH_MAX_INTERVAL = 300.0
+DEFAULT_MAX_INTERVAL = 300.0
+# consecutive checks without new items before an interval starts growing
+QUIET_CHECKS = 3
+JITTER = 0.1
+DEFAULT_BUDGET_PER_MINUTE = 30
+# new creators are spread over this many seconds instead of all at once
+INITIAL_STAGGER_SECONDS = 60.0
+
+
+def _budget_from_env() -> int:
+    try:
+        return max(1, int(os.getenv("SOCIAL_REQUEST_BUDGET", DEFAULT_BUDGET_PER_MINUTE)))
+    except (TypeError, ValueError):
+        return DEFAULT_BUDGET_PER_MINUTE
+
+
+def _max_interval_from_env() -> float:
+    try:
+        return max(60.0, float(os.getenv("SOCIAL_MAX_INTERVAL", DEFAULT_MAX_INTERVAL)))
+    except (TypeError, ValueError):
+        return DEFAULT_MAX_INTERVAL
+
+
+def _limits(platform: str, max_interval: float) -> Tuple[float, float, float]:
+    """(base, minimum, maximum) for *platform* under the configured cap."""
+    base, minimum = INTERVALS[platform]
+    maximum = TWITCH_MAX_INTERVAL if platform == "TWITCH" else max_interval
+    return min(base, maximum), min(minimum, maximum), maximum
+
+
+class _Entry:
+    __slots__ = ("platform", "key", "next_at", "interval", "failures", "quiet", "seen", "live", "checks")
+
+    def __init__(self, platform: str, key: str, next_at: float, interval: float):
+        self.platform = platform
+        self.key = key
+        self.next_at = next_at
+        self.interval = interval
+        self.failures = 0
+        self.quiet = 0
+        self.seen: Optional[set] = None
+        self.live = False
+        self.checks = 0
+
+
+class SocialScheduler:
+    """Heap of per-creator next-check times with a per-minute request budget."""
+
+    def __init__(self, budget_per_minute: Optional[int] = None, max_interval: Optional[float] = None):
+        self.budget_per_minute = budget_per_minute or _budget_from_env()
+        self.max_interval = max_interval or _max_interval_from_env()
+        self._entries: Dict[Tuple[str, str], _Entry] = {}
+        self._heap: List[Tuple[float, str, str]] = []
+        self._tokens = float(self.budget_per_minute)
+        self._refilled = time.monotonic()
+        self.deferred = 0
+
+    # --------------------------------------------------
+    # subscriptions
+    # --------------------------------------------------
+
+    def sync(self, keys: Iterable[Tuple[str, str]]) -> None:
+        """Track exactly *keys* (``(platform, creator_key)``); new ones start soon."""
+        now = time.monotonic()
+        wanted = set(keys)
+        for key in list(self._entries):
+            if key not in wanted:
+                del self._entries[key]
+        for platform, creator in wanted:
+            if (platform, creator) not in self._entries and platform in INTERVALS:
+                base = _limits(platform, self.max_interval)[0]
+                entry = _Entry(platform, creator, now + random.uniform(0, INITIAL_STAGGER_SECONDS), base)
+                self._entries[(platform, creator)] = entry
+                heapq.heappush(self._heap, (entry.next_at, platform, creator))
+
+    # --------------------------------------------------
+    # picking due creators
+    # --------------------------------------------------
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            float(self.budget_per_minute),
+            self._tokens + (now - self._refilled) * self.budget_per_minute / 60.0,
+        )
+        self._refilled = now
+
+    def pop_due(self) -> Dict[str, List[str]]:
+        """Due creator keys per platform that fit in the request budget."""
+        now = time.monotonic()
+        self._refill(now)
+        due: Dict[str, List[str]] = {}
+        kept = []
+        twitch_batch = 0
+        while self._heap and self._heap[0][0] <= now:
+            next_at, platform, creator = heapq.heappop(self._heap)
+            entry = self._entries.get((platform, creator))
+            if entry is None or entry.next_at != next_at:
+                continue  # unsubscribed or rescheduled
+            if platform == "TWITCH":
+                # one request covers a whole batch of logins
+                cost = 1.0 if twitch_batch % TWITCH_BATCH == 0 else 0.0
+            else:
+                cost = 1.0
+            if self._tokens < cost:
+                kept.append((next_at, platform, creator))
+                self.deferred += 1
+                continue
+            self._tokens -= cost
+            if platform == "TWITCH":
+                twitch_batch += 1
+            due.setdefault(platform, []).append(creator)
+        for item in kept:
+            heapq.heappush(self._heap, item)
+        return due
+
+    # --------------------------------------------------
+    # results
+    # --------------------------------------------------
+
+    def _reschedule(self, entry: _Entry, at: float) -> None:
+        at += entry.interval * random.uniform(-JITTER, JITTER)
+        entry.next_at = at
+        heapq.heappush(self._heap, (at, entry.platform, entry.key))
+
+    def record(self, platform: str, creator: str, items: Optional[list]) -> None:
+        """Adapt *creator*'s interval to a check result (None = failed)."""
+        entry = self._entries.get((platform, creator))
+        if entry is None:
+            return
+        base, minimum, maximum = _limits(platform, self.max_interval)
+        now = time.monotonic()
+        entry.checks += 1
+
+        if items is None:
+            entry.failures += 1
+            backoff = min(maximum, base * 2 ** min(entry.failures, 10))
+            self._reschedule(entry, now + backoff)
+            return
+
+        entry.failures = 0
+        ids = {item.get("id") for item in items}
+        fresh = entry.seen is not None and bool(ids - entry.seen)
+        was_live = entry.live
+        entry.seen = ids
+        entry.live = platform == "TWITCH" and bool(items)
+
+        if fresh or entry.live:
+            entry.quiet = 0
+        else:
+            entry.quiet += 1
+
+        if fresh:
+            entry.interval = max(minimum, entry.interval * 0.5)
+        elif was_live and not entry.live:
+            entry.interval = base
+        elif entry.quiet >= QUIET_CHECKS:
+            entry.interval = min(maximum, entry.interval * 1.5)
+        delay = LIVE_INTERVAL if entry.live else entry.interval
+        self._reschedule(entry, now + delay)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        per_platform: Dict[str, dict] = {}
+        for entry in self._entries.values():
+            info = per_platform.setdefault(entry.platform, {"creators": 0, "live": 0, "failing": 0, "intervals": []})
+            info["creators"] += 1
+            info["live"] += int(entry.live)
+            info["failing"] += int(entry.failures > 0)
+            info["intervals"].append(entry.interval)
+        for info in per_platform.values():
+            intervals = info.pop("intervals")
+            info["avg_interval_s"] = round(sum(intervals) / len(intervals), 1) if intervals else 0.0
+        due = sum(1 for entry in self._entries.values() if entry.next_at <= now)
+        return {
+            "budget_per_minute": self.budget_per_minute,
+            "max_interval_s": self.max_interval,
+            "tokens": round(self._tokens, 2),
+            "due": due,
+            "deferred": self.deferred,
+            "platforms": per_platform,
+        }
+
@@ -9,20 +9,26 @@ All settings are per-guild and stored in ``social_media.json``.
 """
 
 import asyncio
+import html
 import os
 import re as _re
-import traceback
 from datetime import datetime, timezone
 
-import aiohttp
 import discord
 from discord import app_commands
 from discord.ext import commands, tasks
 
+from mybot.cogs.community.social_feed import (collect_subscriptions,
+                                              creator_key, targets_for)
+from mybot.cogs.community.social_scheduler import (TWITCH_BATCH,
+                                                   SocialScheduler)
 from mybot.utils.config import load_cog_config
+from mybot.utils.feed_http import get_feed_client
+from mybot.utils.feed_parsers import PatternScanner
 from mybot.utils.i18n import translate
 from mybot.utils.jsonstore import safe_load_json, safe_save_json
 from mybot.utils.paths import guild_data_path
+from mybot.utils.seen_store import get_seen_store
 
 # ---------------------------------------------------------------------------
 # Supported platforms
@@ -36,6 +42,9 @@ PLATFORM_CHOICES = [
     app_commands.Choice(name="Instagram", value="INSTAGRAM"),
 ]
 
+# The loop only wakes up this often; each creator has its own schedule.
+TICK_SECONDS = 15
+
 # ---------------------------------------------------------------------------
 # Config helpers
 # ---------------------------------------------------------------------------
@@ -66,77 +75,56 @@ def _all_creators(platform_cfg: dict) -> list[str]:
     return creators
 
 
-def _creator_to_channel_id(platform_cfg: dict) -> dict[str, int]:
-    """Build a creator→channel_id lookup from the CHANNELS list."""
-    mapping: dict[str, int] = {}
-    for entry in _channels_list(platform_cfg):
-        ch_id = int(entry.get("CHANNEL_ID", 0) or 0)
-        if not ch_id:
-            continue
-        for c in entry.get("CREATORS", []):
-            c = str(c).strip().lower()
-            if c:
-                mapping[c] = ch_id
-    return mapping
-
-
 # ---------------------------------------------------------------------------
 # State tracking (already posted)
 # ---------------------------------------------------------------------------
 
-def _load_posted(guild_id: int | str | None) -> dict:
+def _legacy_posted_ids(guild_id: int | str | None) -> list[str]:
+    """Posted ids from the old ``social_media_data.json`` (imported once into the seen store)."""
     path = guild_data_path(guild_id, "social_media_data.json")
-    if not path:
-        return {"twitch": [], "youtube": [], "twitter": [], "tiktok": [], "instagram": [], "custom": []}
-    data = safe_load_json(path, default={"twitch": [], "youtube": [], "twitter": [], "tiktok": [], "instagram": [], "custom": []})
-    return data
-
-
-def _save_posted(guild_id: int | str | None, data: dict):
-    path = guild_data_path(guild_id, "social_media_data.json")
-    if path:
-        for key in ("twitch", "youtube", "twitter", "tiktok", "instagram", "custom"):
-            if key in data and isinstance(data[key], list):
-                data[key] = data[key][-100:]
-        safe_save_json(path, data)
+    if not path or not os.path.exists(path):
+        return []
+    data = safe_load_json(path, default={})
+    return [item_id for ids in data.values() if isinstance(ids, list) for item_id in ids]
 
 
 # ---------------------------------------------------------------------------
 # Twitch API (uses Helix — requires Client-ID + OAuth token)
 # ---------------------------------------------------------------------------
 
-async def _fetch_twitch_streams(usernames: list[str], client_id: str, oauth_token: str) -> list[dict]:
-    """Check if given Twitch usernames are currently live."""
-    if not usernames or not client_id or not oauth_token:
+def _twitch_credentials() -> tuple[str, str] | None:
+    client_id = os.getenv("TWITCH_CLIENT_ID", "")
+    oauth_token = os.getenv("TWITCH_OAUTH_TOKEN", "")
+    return (client_id, oauth_token) if client_id and oauth_token else None
+
+
+async def _fetch_twitch_live(logins: list[str], client_id: str, oauth_token: str) -> list[dict] | None:
+    """Live streams among up to 100 Twitch *logins*; None if the request failed."""
+    if not logins or not client_id or not oauth_token:
         return []
+    headers = {
+        "Client-ID": client_id,
+        "Authorization": f"Bearer {oauth_token}",
+    }
+    params = "&".join(f"user_login={u.strip().lower()}" for u in logins[:100])
+    resp = await get_feed_client().get(f"https://api.twitch.tv/helix/streams?{params}", headers=headers)
+    if resp is None or resp.status != 200:
+        return None
     items = []
-    try:
-        params = "&".join(f"user_login={u.strip().lower()}" for u in usernames[:100])
-        url = f"https://api.twitch.tv/helix/streams?{params}"
-        headers = {
-            "Client-ID": client_id,
-            "Authorization": f"Bearer {oauth_token}",
-        }
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=15)) as resp:
-                if resp.status != 200:
-                    return []
-                data = await resp.json()
-        for stream in data.get("data", []):
-            items.append({
-                "source": "twitch",
-                "id": f"twitch:{stream.get('id', '')}",
-                "username": stream.get("user_name", ""),
-                "title": stream.get("title", ""),
-                "game": stream.get("game_name", ""),
-                "url": f"https://twitch.tv/{stream.get('user_login', '')}",
-                "thumbnail": (stream.get("thumbnail_url", "")
-                              .replace("{width}", "440")
-                              .replace("{height}", "248")),
-                "viewers": stream.get("viewer_count", 0),
-            })
-    except Exception:
-        traceback.print_exc()
+    for stream in resp.json().get("data", []):
+        items.append({
+            "source": "twitch",
+            "id": f"twitch:{stream.get('id', '')}",
+            "creator": stream.get("user_login", ""),
+            "username": stream.get("user_name", ""),
+            "title": stream.get("title", ""),
+            "game": stream.get("game_name", ""),
+            "url": f"https://twitch.tv/{stream.get('user_login', '')}",
+            "thumbnail": (stream.get("thumbnail_url", "")
+                          .replace("{width}", "440")
+                          .replace("{height}", "248")),
+            "viewers": stream.get("viewer_count", 0),
+        })
     return items
 
 
@@ -144,41 +132,24 @@ async def _fetch_twitch_streams(usernames: list[str], client_id: str, oauth_toke
 # YouTube RSS (no API key needed — public RSS feed)
 # ---------------------------------------------------------------------------
 
-async def _fetch_youtube_latest(channel_ids: list[str]) -> list[dict]:
-    """Fetch latest videos from YouTube channels via RSS."""
+YOUTUBE_ITEMS = 3
+
+
+def _youtube_items(entries: list[dict], cid: str) -> list[dict]:
     items = []
-    try:
-        async with aiohttp.ClientSession() as session:
-            for cid in channel_ids[:20]:
-                cid = cid.strip()
-                if not cid:
-                    continue
-                url = f"https://www.youtube.com/feeds/videos.xml?channel_id={cid}"
-                try:
-                    async with session.get(url, timeout=aiohttp.ClientTimeout(total=15)) as resp:
-                        if resp.status != 200:
-                            continue
-                        text = await resp.text()
-                    entries = text.split("<entry>")[1:]
-                    for entry in entries[:3]:
-                        video_id = _xml_tag(entry, "yt:videoId")
-                        title = _xml_tag(entry, "title")
-                        author = _xml_tag(entry, "name")
-                        published = _xml_tag(entry, "published")
-                        if video_id:
-                            items.append({
-                                "source": "youtube",
-                                "id": f"youtube:{video_id}",
-                                "title": title or "New Video",
-                                "author": author or "",
-                                "url": f"https://www.youtube.com/watch?v={video_id}",
-                                "thumbnail": f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg",
-                                "published": published or "",
-                            })
-                except Exception:
-                    continue
-    except Exception:
-        traceback.print_exc()
+    for entry in entries:
+        video_id = entry.get("videoId", "")
+        if video_id:
+            items.append({
+                "source": "youtube",
+                "id": f"youtube:{video_id}",
+                "creator": cid,
+                "title": entry.get("title") or "New Video",
+                "author": entry.get("name") or "",
+                "url": f"https://www.youtube.com/watch?v={video_id}",
+                "thumbnail": f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg",
+                "published": entry.get("published") or "",
+            })
     return items
 
 
@@ -198,130 +169,172 @@ def _xml_tag(text: str, tag: str) -> str:
     end = text.find(f"</{tag}>", start)
     if end == -1:
         return ""
-    return text[start:end].strip()
+    return html.unescape(text[start:end].strip())
+
+
+def _parse_youtube_feed(text: str, cid: str) -> list[dict]:
+    # channel feeds are ~15 small entries; plain string search over the whole
+    # body is cheaper than incremental XML parsing
+    entries = []
+    for entry in text.split("<entry>")[1:][:YOUTUBE_ITEMS]:
+        entries.append({
+            "videoId": _xml_tag(entry, "yt:videoId"),
+            "title": _xml_tag(entry, "title"),
+            "name": _xml_tag(entry, "name"),
+            "published": _xml_tag(entry, "published"),
+        })
+    return _youtube_items(entries, cid)
+
+
+async def _fetch_youtube_channel(cid: str) -> list[dict] | None:
+    """Latest videos of one channel; None if the feed could not be fetched."""
+    cid = cid.strip()
+    url = f"https://www.youtube.com/feeds/videos.xml?channel_id={cid}"
+    return await get_feed_client().get_parsed(
+        url, lambda resp: _parse_youtube_feed(resp.text(), cid), source="youtube"
+    )
 
 
 # ---------------------------------------------------------------------------
-# TikTok (public page scraping — no API key needed)
+# TikTok / Instagram (public page scraping — no API key needed)
 # ---------------------------------------------------------------------------
 
-async def _fetch_tiktok_latest(usernames: list[str]) -> list[dict]:
-    """Fetch latest TikTok video IDs by parsing the public profile page."""
-    items = []
-    try:
-        async with aiohttp.ClientSession() as session:
-            for username in usernames[:10]:
-                username = username.strip().lstrip("@")
-                if not username:
-                    continue
-                url = f"https://www.tiktok.com/@{username}"
-                try:
-                    headers = {
-                        "User-Agent": (
-                            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                            "AppleWebKit/537.36 (KHTML, like Gecko) "
-                            "Chrome/120.0.0.0 Safari/537.36"
-                        ),
-                        "Accept-Language": "en-US,en;q=0.9",
-                    }
-                    async with session.get(
-                        url,
-                        headers=headers,
-                        timeout=aiohttp.ClientTimeout(total=20),
-                        allow_redirects=True,
-                    ) as resp:
-                        if resp.status != 200:
-                            continue
-                        text = await resp.text()
-                    pattern = rf'/@{_re.escape(username)}/video/(\d+)'
-                    video_ids = _re.findall(pattern, text, _re.IGNORECASE)
-                    seen = set()
-                    for vid in video_ids:
-                        if vid in seen:
-                            continue
-                        seen.add(vid)
-                        items.append({
-                            "source": "tiktok",
-                            "id": f"tiktok:{vid}",
-                            "username": username,
-                            "title": f"New TikTok from @{username}",
-                            "url": f"https://www.tiktok.com/@{username}/video/{vid}",
-                        })
-                        if len(seen) >= 5:
-                            break
-                except Exception:
-                    continue
-    except Exception:
-        traceback.print_exc()
-    return items
+_BROWSER_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "en-US,en;q=0.9",
+}
+_SCRAPE_TIMEOUT = 20
+SCRAPED_ITEMS = 5
+
+
+def _tiktok_items(video_ids: list[str], username: str) -> list[dict]:
+    return [{
+        "source": "tiktok",
+        "id": f"tiktok:{vid}",
+        "creator": username,
+        "username": username,
+        "title": f"New TikTok from @{username}",
+        "url": f"https://www.tiktok.com/@{username}/video/{vid}",
+    } for vid in video_ids]
+
+
+def _tiktok_parser(username: str) -> PatternScanner:
+    """Scans the profile page until ``SCRAPED_ITEMS`` video links were seen."""
+    return PatternScanner(
+        rf'/@{_re.escape(username)}/video/(\d+)',
+        SCRAPED_ITEMS,
+        flags=_re.IGNORECASE,
+        build=lambda ids: _tiktok_items(ids, username),
+    )
 
 
-async def _fetch_instagram_latest(usernames: list[str]) -> list[dict]:
-    """Fetch latest Instagram post IDs by parsing the public profile page."""
-    items = []
-    try:
-        async with aiohttp.ClientSession() as session:
-            for username in usernames[:10]:
-                username = username.strip().lstrip("@")
-                if not username:
-                    continue
-                url = f"https://www.instagram.com/{username}/"
-                try:
-                    headers = {
-                        "User-Agent": (
-                            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                            "AppleWebKit/537.36 (KHTML, like Gecko) "
-                            "Chrome/120.0.0.0 Safari/537.36"
-                        ),
-                        "Accept-Language": "en-US,en;q=0.9",
-                    }
-                    async with session.get(
-                        url,
-                        headers=headers,
-                        timeout=aiohttp.ClientTimeout(total=20),
-                        allow_redirects=True,
-                    ) as resp:
-                        if resp.status != 200:
-                            continue
-                        text = await resp.text()
-                    # Extract shortcodes from /p/<shortcode>/ links
-                    pattern = r'/p/([A-Za-z0-9_-]+)/'
-                    shortcodes = _re.findall(pattern, text)
-                    seen = set()
-                    for code in shortcodes:
-                        if code in seen:
-                            continue
-                        seen.add(code)
-                        items.append({
-                            "source": "instagram",
-                            "id": f"instagram:{code}",
-                            "username": username,
-                            "title": f"New post from @{username}",
-                            "url": f"https://www.instagram.com/p/{code}/",
-                        })
-                        if len(seen) >= 5:
-                            break
-                except Exception:
-                    continue
-    except Exception:
-        traceback.print_exc()
-    return items
+async def _fetch_tiktok_user(username: str) -> list[dict] | None:
+    username = username.strip().lstrip("@")
+    return await get_feed_client().get_streamed(
+        f"https://www.tiktok.com/@{username}",
+        lambda: _tiktok_parser(username),
+        source="tiktok",
+        headers=_BROWSER_HEADERS,
+        timeout=_SCRAPE_TIMEOUT,
+    )
+
+
+def _instagram_items(codes: list[str], username: str) -> list[dict]:
+    return [{
+        "source": "instagram",
+        "id": f"instagram:{code}",
+        "creator": username,
+        "username": username,
+        "title": f"New post from @{username}",
+        "url": f"https://www.instagram.com/p/{code}/",
+    } for code in codes]
+
+
+def _instagram_parser(username: str) -> PatternScanner:
+    """Scans the profile page until ``SCRAPED_ITEMS`` post shortcodes were seen."""
+    # shortcodes come from /p/<shortcode>/ links
+    return PatternScanner(
+        r'/p/([A-Za-z0-9_-]+)/',
+        SCRAPED_ITEMS,
+        build=lambda codes: _instagram_items(codes, username),
+    )
+
+
+async def _fetch_instagram_user(username: str) -> list[dict] | None:
+    username = username.strip().lstrip("@")
+    return await get_feed_client().get_streamed(
+        f"https://www.instagram.com/{username}/",
+        lambda: _instagram_parser(username),
+        source="instagram",
+        headers=_BROWSER_HEADERS,
+        timeout=_SCRAPE_TIMEOUT,
+    )
+
+
+_CREATOR_FETCHERS = {
+    "YOUTUBE": _fetch_youtube_channel,
+    "TIKTOK": _fetch_tiktok_user,
+    "INSTAGRAM": _fetch_instagram_user,
+}
 
 
 # ---------------------------------------------------------------------------
-# Cog
+# Notifications
 # ---------------------------------------------------------------------------
 
-def _resolve_channel_for_creator(bot, guild, creator_map: dict[str, int], creator_key: str):
-    """Return the Discord channel for a creator using the channel mapping."""
-    ch_id = creator_map.get(creator_key.lower(), 0)
-    if ch_id:
-        ch = bot.get_channel(ch_id) or guild.get_channel(ch_id)
-        if ch:
-            return ch
-    return None
+PLATFORM_LABELS = {"TWITCH": "Twitch", "YOUTUBE": "YouTube", "TIKTOK": "TikTok", "INSTAGRAM": "Instagram"}
 
 
+def _build_embed(platform: str, item: dict) -> discord.Embed:
+    """Notification embed for one fetched item."""
+    now = datetime.now(timezone.utc)
+    if platform == "TWITCH":
+        embed = discord.Embed(
+            title=f"🟣 {item['username']} is LIVE!",
+            description=f"**{item['title']}**\n\nPlaying: {item['game']}\n👁 {item['viewers']} viewers",
+            url=item["url"],
+            color=discord.Color.purple(),
+            timestamp=now,
+        )
+        if item.get("thumbnail"):
+            embed.set_image(url=item["thumbnail"])
+    elif platform == "YOUTUBE":
+        embed = discord.Embed(
+            title=f"🔴 {item['author']} uploaded a new video!",
+            description=f"**{item['title']}**",
+            url=item["url"],
+            color=discord.Color.red(),
+            timestamp=now,
+        )
+        if item.get("thumbnail"):
+            embed.set_image(url=item["thumbnail"])
+    elif platform == "TIKTOK":
+        embed = discord.Embed(
+            title=f"\U0001f3b5 {item['username']} posted a new TikTok!",
+            description=f"**{item['title']}**",
+            url=item["url"],
+            color=discord.Color.from_rgb(0, 0, 0),
+            timestamp=now,
+        )
+    else:
+        embed = discord.Embed(
+            title=f"\U0001f4f7 {item['username']} posted on Instagram!",
+            description=f"**{item['title']}**",
+            url=item["url"],
+            color=discord.Color.from_rgb(225, 48, 108),
+            timestamp=now,
+        )
+    return embed
+
+
+# ---------------------------------------------------------------------------
+# Cog
+# ---------------------------------------------------------------------------
+
 class SocialMedia(commands.Cog):
     """Monitors social media and posts notifications to configured channels.
 
@@ -331,6 +344,8 @@ class SocialMedia(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
+        self._cycle_lock = asyncio.Lock()
+        self.scheduler = SocialScheduler()
         self.check_socials.start()
 
     def cog_unload(self):
@@ -591,15 +606,13 @@ class SocialMedia(commands.Cog):
     # Automated loop
     # ------------------------------------------------------------------
 
-    @tasks.loop(minutes=5)
+    @tasks.loop(seconds=TICK_SECONDS)
     async def check_socials(self):
-        """Periodically check all guilds for social media updates."""
-        for guild in self.bot.guilds:
-            try:
-                await self._check_guild(guild)
-            except Exception as exc:
-                print(f"[SocialMedia] Error checking guild {guild.id}: {exc}")
-            await asyncio.sleep(2)
+        """Check the creators whose scheduled next check is due."""
+        try:
+            await self._run_cycle(list(self.bot.guilds))
+        except Exception as exc:
+            print(f"[SocialMedia] Check cycle failed: {exc}")
 
     @check_socials.before_loop
     async def before_check(self):
@@ -607,167 +620,104 @@ class SocialMedia(commands.Cog):
 
     async def _check_guild(self, guild: discord.Guild) -> int:
         """Check and post social updates for a single guild. Returns count of new items posted."""
-        guild_id = guild.id
-        cfg = _cfg(guild_id)
-        posted_data = _load_posted(guild_id)
-        total_new = 0
-
-        # --- Twitch ---
-        twitch_cfg = cfg.get("TWITCH", {})
-        if isinstance(twitch_cfg, dict) and twitch_cfg.get("ENABLED"):
-            creator_map = _creator_to_channel_id(twitch_cfg)
-            usernames = _all_creators(twitch_cfg)
-            client_id = os.getenv("TWITCH_CLIENT_ID", "")
-            oauth_token = os.getenv("TWITCH_OAUTH_TOKEN", "")
-            if usernames and client_id and oauth_token:
-                streams = await _fetch_twitch_streams(usernames, client_id, oauth_token)
-                posted_set = set(posted_data.get("twitch", []))
-                for stream in streams:
-                    sid = stream["id"]
-                    if sid in posted_set:
-                        continue
-                    target_ch = _resolve_channel_for_creator(
-                        self.bot, guild, creator_map,
-                        stream.get("username", "").lower(),
-                    )
-                    if not target_ch:
-                        continue
-                    embed = discord.Embed(
-                        title=f"🟣 {stream['username']} is LIVE!",
-                        description=f"**{stream['title']}**\n\nPlaying: {stream['game']}\n👁 {stream['viewers']} viewers",
-                        url=stream["url"],
-                        color=discord.Color.purple(),
-                        timestamp=datetime.now(timezone.utc),
-                    )
-                    if stream.get("thumbnail"):
-                        embed.set_image(url=stream["thumbnail"])
-                    try:
-                        await target_ch.send(embed=embed)
-                        posted_data.setdefault("twitch", []).append(sid)
-                        total_new += 1
-                    except Exception as exc:
-                        print(f"[SocialMedia] Twitch post failed: {exc}")
-
-        # --- YouTube ---
-        youtube_cfg = cfg.get("YOUTUBE", {})
-        if isinstance(youtube_cfg, dict) and youtube_cfg.get("ENABLED"):
-            creator_map = _creator_to_channel_id(youtube_cfg)
-            yt_channel_ids = _all_creators(youtube_cfg)
-            if yt_channel_ids:
-                videos = await _fetch_youtube_latest(yt_channel_ids)
-                posted_set = set(posted_data.get("youtube", []))
-                for video in videos:
-                    vid = video["id"]
-                    if vid in posted_set:
-                        continue
-                    # For YouTube, try matching by author name (lowercase) first,
-                    # but the creator list holds channel IDs, so try both.
-                    author_key = (video.get("author") or "").lower()
-                    target_ch = _resolve_channel_for_creator(self.bot, guild, creator_map, author_key)
-                    if not target_ch:
-                        # Try matching the YouTube channel ID itself from the video URL
-                        for yt_cid in yt_channel_ids:
-                            target_ch = _resolve_channel_for_creator(self.bot, guild, creator_map, yt_cid.lower())
-                            if target_ch:
-                                break
-                    if not target_ch:
-                        continue
-                    embed = discord.Embed(
-                        title=f"🔴 {video['author']} uploaded a new video!",
-                        description=f"**{video['title']}**",
-                        url=video["url"],
-                        color=discord.Color.red(),
-                        timestamp=datetime.now(timezone.utc),
-                    )
-                    if video.get("thumbnail"):
-                        embed.set_image(url=video["thumbnail"])
-                    try:
-                        await target_ch.send(embed=embed)
-                        posted_data.setdefault("youtube", []).append(vid)
-                        total_new += 1
-                    except Exception as exc:
-                        print(f"[SocialMedia] YouTube post failed: {exc}")
-
-        # --- Twitter/X ---
-        twitter_cfg = cfg.get("TWITTER", {})
-        if isinstance(twitter_cfg, dict) and twitter_cfg.get("ENABLED"):
-            # Twitter/X API requires Bearer token; placeholder for future implementation
-            pass
-
-        # --- TikTok ---
-        tiktok_cfg = cfg.get("TIKTOK", {})
-        if isinstance(tiktok_cfg, dict) and tiktok_cfg.get("ENABLED"):
-            creator_map = _creator_to_channel_id(tiktok_cfg)
-            usernames = _all_creators(tiktok_cfg)
-            if usernames:
-                videos = await _fetch_tiktok_latest(usernames)
-                posted_set = set(posted_data.get("tiktok", []))
-                for video in videos:
-                    vid = video["id"]
-                    if vid in posted_set:
+        counts = await self._run_cycle([guild], forced=True)
+        return counts.get(guild.id, 0)
+
+    async def _run_cycle(self, guilds: list, forced: bool = False) -> dict[int, int]:
+        """Fetch due creators once each and post new items to all subscribers.
+
+        *forced* checks every creator of *guilds* right away (``/socialcheck``)
+        instead of only those the scheduler says are due. Returns the number
+        of new items posted per guild id.
+        """
+        async with self._cycle_lock:
+            guild_map = {guild.id: guild for guild in guilds}
+            subs = collect_subscriptions({gid: _cfg(gid) for gid in guild_map})
+            if not _twitch_credentials():
+                subs.pop("TWITCH", None)
+            wanted = {
+                platform: [key for key, feed in feeds.items() if feed.targets]
+                for platform, feeds in subs.items()
+            }
+            if forced:
+                due = wanted
+            else:
+                self.scheduler.sync((p, key) for p, keys in wanted.items() for key in keys)
+                due = self.scheduler.pop_due()
+            if not any(due.values()):
+                return {}
+
+            results = await self._fetch_due(subs, due)
+            fetched: dict[str, list[dict]] = {}
+            for platform, by_creator in results.items():
+                for key, items in by_creator.items():
+                    self.scheduler.record(platform, key, items)
+                    fetched.setdefault(platform, []).extend(items or [])
+            return await self._fan_out(guild_map, subs, fetched)
+
+    async def _fetch_due(self, subs: dict, due: dict[str, list[str]]) -> dict[str, dict[str, list[dict] | None]]:
+        """Fetch *due* creator keys concurrently; None marks a failed check."""
+        jobs = []
+        for platform, keys in due.items():
+            feeds = subs.get(platform, {})
+            keys = [key for key in keys if key in feeds]
+            if platform == "TWITCH":
+                credentials = _twitch_credentials()
+                for start in range(0, len(keys), TWITCH_BATCH):
+                    batch = keys[start:start + TWITCH_BATCH]
+                    logins = [feeds[key].creator for key in batch]
+                    jobs.append((platform, batch, _fetch_twitch_live(logins, *credentials)))
+            elif platform in _CREATOR_FETCHERS:
+                for key in keys:
+                    jobs.append((platform, [key], _CREATOR_FETCHERS[platform](feeds[key].creator)))
+
+        results: dict[str, dict[str, list[dict] | None]] = {}
+        outcomes = await asyncio.gather(*(job for _, _, job in jobs), return_exceptions=True)
+        for (platform, keys, _), outcome in zip(jobs, outcomes):
+            by_creator = results.setdefault(platform, {})
+            if isinstance(outcome, BaseException):
+                print(f"[SocialMedia] {PLATFORM_LABELS[platform]} fetch failed: {outcome}")
+                outcome = None
+            if outcome is None:
+                by_creator.update(dict.fromkeys(keys))
+            elif platform == "TWITCH":
+                # one response covers the whole batch; only live logins appear
+                for key in keys:
+                    by_creator[key] = []
+                for item in outcome:
+                    by_creator.setdefault(creator_key(platform, item.get("creator", "")), []).append(item)
+            else:
+                by_creator[keys[0]] = outcome
+        return results
+
+    async def _fan_out(self, guild_map: dict, subs: dict, fetched: dict[str, list[dict]]) -> dict[int, int]:
+        """Post fetched items to every subscribing guild that has not seen them."""
+        store = get_seen_store()
+        counts: dict[int, int] = {}
+        for platform, items in fetched.items():
+            feeds = subs.get(platform, {})
+            for item in items:
+                targets = targets_for(feeds, platform, item.get("creator", ""))
+                for guild_id, channel_id in targets.items():
+                    guild = guild_map.get(guild_id)
+                    if guild is None:
                         continue
-                    target_ch = _resolve_channel_for_creator(
-                        self.bot, guild, creator_map,
-                        (video.get("username") or "").lower(),
-                    )
-                    if not target_ch:
+                    seen = await store.bucket("socials", guild_id, legacy=lambda: _legacy_posted_ids(guild_id))
+                    if item["id"] in seen:
+                        seen.touch(item["id"])
                         continue
-                    embed = discord.Embed(
-                        title=f"\U0001f3b5 {video['username']} posted a new TikTok!",
-                        description=f"**{video['title']}**",
-                        url=video["url"],
-                        color=discord.Color.from_rgb(0, 0, 0),
-                        timestamp=datetime.now(timezone.utc),
-                    )
-                    try:
-                        await target_ch.send(embed=embed)
-                        posted_data.setdefault("tiktok", []).append(vid)
-                        total_new += 1
-                    except Exception as exc:
-                        print(f"[SocialMedia] TikTok post failed: {exc}")
-
-        # --- Instagram ---
-        instagram_cfg = cfg.get("INSTAGRAM", {})
-        if isinstance(instagram_cfg, dict) and instagram_cfg.get("ENABLED"):
-            creator_map = _creator_to_channel_id(instagram_cfg)
-            usernames = _all_creators(instagram_cfg)
-            if usernames:
-                posts = await _fetch_instagram_latest(usernames)
-                posted_set = set(posted_data.get("instagram", []))
-                for post in posts:
-                    pid = post["id"]
-                    if pid in posted_set:
-                        continue
-                    target_ch = _resolve_channel_for_creator(
-                        self.bot, guild, creator_map,
-                        (post.get("username") or "").lower(),
-                    )
+                    target_ch = self.bot.get_channel(channel_id) or guild.get_channel(channel_id)
                     if not target_ch:
                         continue
-                    embed = discord.Embed(
-                        title=f"\U0001f4f7 {post['username']} posted on Instagram!",
-                        description=f"**{post['title']}**",
-                        url=post["url"],
-                        color=discord.Color.from_rgb(225, 48, 108),
-                        timestamp=datetime.now(timezone.utc),
-                    )
                     try:
-                        await target_ch.send(embed=embed)
-                        posted_data.setdefault("instagram", []).append(pid)
-                        total_new += 1
+                        await target_ch.send(embed=_build_embed(platform, item))
+                        seen.add(item["id"])
+                        counts[guild_id] = counts.get(guild_id, 0) + 1
                     except Exception as exc:
-                        print(f"[SocialMedia] Instagram post failed: {exc}")
-
-        # --- Custom webhooks/feeds ---
-        custom_cfg = cfg.get("CUSTOM", {})
-        if isinstance(custom_cfg, dict) and custom_cfg.get("ENABLED"):
-            # Custom source placeholder for user-defined RSS/webhook feeds
-            pass
-
-        if total_new:
-            _save_posted(guild_id, posted_data)
+                        print(f"[SocialMedia] {PLATFORM_LABELS[platform]} post failed: {exc}")
 
-        return total_new
+        await asyncio.to_thread(store.flush)
+        return counts
 
 
 async def setup(bot):
@@ -1,14 +1,14 @@
 """Achievement checking cog — awards achievements when user stats meet requirements."""
 
-import os
+import asyncio
 import io
 
 import discord
-from discord.ext import commands
-from PIL import Image, ImageOps
+from discord.ext import commands, tasks
 
-from mybot.utils.paths import REPO_ROOT
+from mybot.runtime.instrumentation import timed
 
+from .utils.achievement_assets import get_asset, resolve_image_path, warm
 from .utils.level_config import (get_achievement_channel_id,
                                  get_achievement_entries,
                                  get_message_templates)
@@ -19,6 +19,35 @@ class Achievements(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+        # guild_id -> achievement image values last validated/warmed
+        self._image_sigs: dict = {}
+        self.asset_loop.start()
+
+    def cog_unload(self):
+        self.asset_loop.stop()
+
+    # ==========================================================
+    # IMAGE ASSETS
+    # ==========================================================
+
+    @tasks.loop(seconds=30)
+    async def asset_loop(self):
+        """Validate and pre-process achievement images when a guild's config changes."""
+        for guild in list(self.bot.guilds):
+            entries = get_achievement_entries(guild_id=guild.id)
+            sig = tuple(sorted((name, (entry or {}).get("image", "")) for name, entry in entries.items()))
+            if self._image_sigs.get(guild.id) == sig:
+                continue
+            self._image_sigs[guild.id] = sig
+            problems = await asyncio.to_thread(warm, entries)
+            for problem in problems:
+                print(f"[Achievements] guild {guild.id}: {problem}")
+
+    @asset_loop.before_loop
+    async def _before_asset_loop(self):
+        await self.bot.wait_until_ready()
+
+    @timed("Achievements.check_achievements")
     async def check_achievements(self, member):
         guild_id = getattr(getattr(member, 'guild', None), 'id', None)
 
@@ -87,19 +116,10 @@ class Achievements(commands.Cog):
                         if image_value.lower().startswith(("http://", "https://")):
                             image_url = image_value
                         else:
-                            abs_path = image_value
-                            if not os.path.isabs(abs_path):
-                                abs_path = os.path.abspath(os.path.join(REPO_ROOT, image_value))
-                            if os.path.exists(abs_path) and os.path.isfile(abs_path):
-                                try:
-                                    with Image.open(abs_path) as img:
-                                        fixed = ImageOps.exif_transpose(img).convert("RGB")
-                                        buf = io.BytesIO()
-                                        fixed.save(buf, format="PNG")
-                                        buf.seek(0)
-                                    image_file = discord.File(buf, filename="achievement.png")
-                                except Exception:
-                                    image_file = None
+                            # pre-processed once per file version (see asset_loop)
+                            asset = await asyncio.to_thread(get_asset, resolve_image_path(image_value))
+                            if asset is not None:
+                                image_file = discord.File(io.BytesIO(asset.data), filename=asset.filename)
 
                     if image_url or image_file is not None:
                         embed = discord.Embed(description=item.get("message", ""), color=0xF1C40F)
@@ -107,7 +127,7 @@ class Achievements(commands.Cog):
                             embed.set_image(url=image_url)
                             await channel.send(embed=embed)
                         else:
-                            embed.set_image(url="attachment://achievement.png")
+                            embed.set_image(url=f"attachment://{image_file.filename}")
                             await channel.send(embed=embed, file=image_file)
                     else:
                         await channel.send(item.get("message", ""))
@@ -2,20 +2,24 @@
 
 from __future__ import annotations
 
+import collections
 import io
 import json
 import os
+import threading
 from typing import Optional
 
-import aiohttp
 import discord
 from discord import app_commands
 from discord.ext import commands
 from PIL import Image, ImageDraw, ImageFont
 
+from mybot.utils.avatar_service import get_avatar_service
 from mybot.utils.config_store import config_json_path, load_json_dict
-from mybot.utils.i18n import translate
+from mybot.utils.i18n import get_language_for_guild, translate
+from mybot.utils.image_encoding import encoding_from_config, extension as image_extension
 from mybot.utils.paths import REPO_ROOT
+from mybot.utils.render_service import get_render_service
 
 from .levels import xp_for_level
 
@@ -170,6 +174,94 @@ def _compose_rank_background(
     return canvas
 
 
+# ======================================================
+# STATIC LAYER CACHE
+# ======================================================
+
+# Composed backgrounds, fonts, colors and the avatar mask only change with
+# the guild's rank config, so they are built once per config version and
+# every card starts from a copy of the cached background.
+LAYER_CACHE_SIZE = 16
+
+_COLOR_FALLBACKS = (
+    (255, 255, 255),
+    (200, 200, 200),
+    (200, 200, 200),
+    (200, 200, 200),
+    (200, 200, 200),
+    (200, 200, 200),
+    (50, 50, 50),
+    (140, 110, 255),
+)
+
+
+class _RankLayers:
+    __slots__ = ("background", "mask", "fonts", "colors")
+
+    def __init__(self, background, mask, fonts, colors):
+        self.background = background
+        self.mask = mask
+        self.fonts = fonts
+        self.colors = colors
+
+
+_LAYER_CACHE: "collections.OrderedDict[tuple, _RankLayers]" = collections.OrderedDict()
+_LAYER_LOCK = threading.Lock()
+
+
+def _file_version(path: str | None) -> tuple:
+    resolved = path or ""
+    if resolved and not os.path.isabs(resolved):
+        resolved = os.path.join(REPO_ROOT, resolved)
+    try:
+        st = os.stat(resolved)
+        return (resolved, st.st_mtime_ns, st.st_size)
+    except OSError:
+        return (resolved, None, None)
+
+
+def _rank_layers(background: tuple, avatar_size: int, fonts: tuple, colors: tuple) -> _RankLayers:
+    """Return the cached static layers for one rank config version.
+
+    The key covers every config-driven input plus the mtimes of the
+    background and font files, so editing the config or replacing an asset
+    produces a new version instead of a stale card.
+    """
+    bg_path = background[0] or "assets/rankcard.png"
+    key = (
+        tuple(background),
+        _file_version(bg_path),
+        avatar_size,
+        tuple((path, size, _file_version(path)) for path, size in fonts),
+        tuple(colors),
+    )
+    with _LAYER_LOCK:
+        layers = _LAYER_CACHE.get(key)
+        if layers is not None:
+            _LAYER_CACHE.move_to_end(key)
+            return layers
+
+    bg_image = _compose_rank_background(bg_path, CARD_WIDTH, CARD_HEIGHT, *background[1:])
+    mask = Image.new("L", (avatar_size, avatar_size), 0)
+    ImageDraw.Draw(mask).ellipse((0, 0, avatar_size, avatar_size), fill=255)
+    layers = _RankLayers(
+        bg_image,
+        mask,
+        tuple(_safe_truetype(path, size) for path, size in fonts),
+        tuple(_parse_hex_color(c, fb) for c, fb in zip(colors, _COLOR_FALLBACKS)),
+    )
+    with _LAYER_LOCK:
+        _LAYER_CACHE[key] = layers
+        while len(_LAYER_CACHE) > LAYER_CACHE_SIZE:
+            _LAYER_CACHE.popitem(last=False)
+    return layers
+
+
+def clear_layer_cache() -> None:
+    with _LAYER_LOCK:
+        _LAYER_CACHE.clear()
+
+
 # ======================================================
 # RENDERER (also used by UI preview)
 # ======================================================
@@ -230,8 +322,14 @@ def render_rankcard(
     achievements_font_size: int = 33,
     achievements_color: str = "#C8C8C8",
     guild_id: int | str | None = None,
-) -> bytes:
-    """Render rank card and return PNG bytes (used by bot + UI)."""
+    language: str | None = None,
+    encode: bool = True,
+) -> bytes | Image.Image:
+    """Render rank card and return PNG bytes (used by bot + UI).
+
+    With ``encode=False`` the composed image is returned instead. *language*
+    overrides the guild's language for the card labels.
+    """
 
     avatar_size = _clamp_int(avatar_size, 16, 2000, AVATAR_SIZE)
     bar_width = _clamp_int(bar_width, 1, 10000, BAR_WIDTH)
@@ -254,15 +352,29 @@ def render_rankcard(
     achievements_x = _to_int(achievements_x, DEFAULT_POS["achievements_x"])
     achievements_y = _to_int(achievements_y, DEFAULT_POS["achievements_y"])
 
-    card = _compose_rank_background(
-        bg_path,
-        CARD_WIDTH,
-        CARD_HEIGHT,
-        bg_mode,
-        bg_zoom,
-        bg_offset_x,
-        bg_offset_y,
+    layers = _rank_layers(
+        (bg_path, bg_mode, bg_zoom, bg_offset_x, bg_offset_y),
+        avatar_size,
+        (
+            (username_font, username_font_size),
+            (level_font, level_font_size),
+            (xp_font, xp_font_size),
+            (messages_font, messages_font_size),
+            (voice_font, voice_font_size),
+            (achievements_font, achievements_font_size),
+        ),
+        (
+            username_color,
+            level_color,
+            xp_color,
+            messages_color,
+            voice_color,
+            achievements_color,
+            bar_bg_color,
+            bar_fill_color,
+        ),
     )
+    card = layers.background.copy()
     draw = ImageDraw.Draw(card)
 
     # Avatar
@@ -273,39 +385,33 @@ def render_rankcard(
     if avatar is None:
         avatar = Image.new("RGBA", (avatar_size, avatar_size), (100, 100, 100, 255))
     avatar = avatar.resize((avatar_size, avatar_size))
-    mask = Image.new("L", (avatar_size, avatar_size), 0)
-    ImageDraw.Draw(mask).ellipse((0, 0, avatar_size, avatar_size), fill=255)
-    avatar.putalpha(mask)
+    avatar.putalpha(layers.mask)
     card.paste(avatar, (avatar_x, avatar_y), avatar)
 
     # Fonts + colors
-    font_username = _safe_truetype(username_font, username_font_size)
-    font_level = _safe_truetype(level_font, level_font_size)
-    font_xp = _safe_truetype(xp_font, xp_font_size)
-    font_messages = _safe_truetype(messages_font, messages_font_size)
-    font_voice = _safe_truetype(voice_font, voice_font_size)
-    font_achievements = _safe_truetype(achievements_font, achievements_font_size)
-
-    color_username = _parse_hex_color(username_color, (255, 255, 255))
-    color_level = _parse_hex_color(level_color, (200, 200, 200))
-    color_xp = _parse_hex_color(xp_color, (200, 200, 200))
-    color_messages = _parse_hex_color(messages_color, (200, 200, 200))
-    color_voice = _parse_hex_color(voice_color, (200, 200, 200))
-    color_achievements = _parse_hex_color(achievements_color, (200, 200, 200))
-    color_bar_bg = _parse_hex_color(bar_bg_color, (50, 50, 50))
-    color_bar_fill = _parse_hex_color(bar_fill_color, (140, 110, 255))
+    font_username, font_level, font_xp, font_messages, font_voice, font_achievements = layers.fonts
+    (
+        color_username,
+        color_level,
+        color_xp,
+        color_messages,
+        color_voice,
+        color_achievements,
+        color_bar_bg,
+        color_bar_fill,
+    ) = layers.colors
 
     # Username + Level + XP text
     draw.text((username_x, username_y), username, font=font_username, fill=color_username)
 
-    level_text = translate("rank.card.level", guild_id=guild_id, level=level, default=f"Level {level}")
+    level_text = translate("rank.card.level", guild_id=guild_id, language=language, level=level, default=f"Level {level}")
     draw.text((level_x, level_y), level_text, font=font_level, fill=color_level)
 
     # Sanitise XP values before using them in text or progress bar
     xp = _to_int(xp, 0)
     xp_needed = _to_int(xp_needed, 0)
 
-    xp_text = translate("rank.card.xp_progress", guild_id=guild_id, current=xp, needed=xp_needed, default=f"{xp}/{xp_needed} XP")
+    xp_text = translate("rank.card.xp_progress", guild_id=guild_id, language=language, current=xp, needed=xp_needed, default=f"{xp}/{xp_needed} XP")
     draw.text((xp_x, xp_y), xp_text, font=font_xp, fill=color_xp)
 
     # Progress bar
@@ -314,20 +420,23 @@ def render_rankcard(
     draw.rectangle((bar_x, bar_y, bar_x + int(bar_width * progress), bar_y + bar_height), fill=color_bar_fill)
 
     # Stats
-    messages_text = translate("rank.card.messages", guild_id=guild_id, value=messages, default=f"💬 {messages}")
+    messages_text = translate("rank.card.messages", guild_id=guild_id, language=language, value=messages, default=f"💬 {messages}")
     draw.text((messages_x, messages_y), messages_text, font=font_messages, fill=color_messages)
 
-    voice_text = translate("rank.card.voice", guild_id=guild_id, value=voice_minutes, default=f"🎤 {voice_minutes}m")
+    voice_text = translate("rank.card.voice", guild_id=guild_id, language=language, value=voice_minutes, default=f"🎤 {voice_minutes}m")
     draw.text((voice_x, voice_y), voice_text, font=font_voice, fill=color_voice)
 
     achievements_text = translate(
         "rank.card.achievements",
         guild_id=guild_id,
+        language=language,
         value=achievements_count,
         default=f"🏆 {achievements_count}",
     )
     draw.text((achievements_x, achievements_y), achievements_text, font=font_achievements, fill=color_achievements)
 
+    if not encode:
+        return card
     buffer = io.BytesIO()
     card.save(buffer, "PNG")
     return buffer.getvalue()
@@ -415,19 +524,14 @@ class Rank(commands.Cog):
         user = self.bot.db.get_user(member.id, guild_id=guild_id)
         cfg = _load_rank_cfg(guild_id=guild_id)
 
-        avatar_bytes: bytes | None = None
-        try:
-            timeout = aiohttp.ClientTimeout(total=8)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(member.display_avatar.url) as resp:
-                    if resp.status == 200:
-                        avatar_bytes = await resp.read()
-        except Exception:
-            avatar_bytes = None
-
         def conf(key: str, default):
             return cfg.get(key, default)
 
+        avatar_bytes = await get_avatar_service().fetch(
+            getattr(member, "display_avatar", None),
+            _clamp_int(conf("AVATAR_SIZE", AVATAR_SIZE), 16, 2000, AVATAR_SIZE),
+        )
+
         text_off_x = int(cfg.get("TEXT_OFFSET_X", 0) or 0)
         text_off_y = int(cfg.get("TEXT_OFFSET_Y", 0) or 0)
         avatar_off_x = int(cfg.get("AVATAR_OFFSET_X", 0) or 0)
@@ -436,7 +540,7 @@ class Rank(commands.Cog):
         info_size_legacy = conf("INFO_FONT_SIZE", 60)
         info_color_legacy = conf("INFO_COLOR", "#C8C8C8")
 
-        png_bytes = render_rankcard(
+        params = dict(
             bg_path=conf("BG_PATH", "assets/rankcard.png"),
             bg_mode=conf("BG_MODE", "cover"),
             bg_zoom=conf("BG_ZOOM", 100),
@@ -490,9 +594,16 @@ class Rank(commands.Cog):
             achievements_font_size=conf("ACHIEVEMENTS_FONT_SIZE", 33),
             achievements_color=conf("ACHIEVEMENTS_COLOR", info_color_legacy),
             guild_id=guild_id,
+            # resolved here: render workers do not see language changes, and
+            # the language must be part of the result cache key
+            language=get_language_for_guild(guild_id),
         )
+        # PIL work runs in the render pool so /rank spam does not stall the loop;
+        # unchanged stats/config/avatar are answered from the result cache
+        encoding = encoding_from_config(cfg)
+        image_bytes = await get_render_service().render("rankcard", params, encoding=encoding)
 
-        return discord.File(io.BytesIO(png_bytes), filename="rank.png")
+        return discord.File(io.BytesIO(image_bytes), filename=f"rank.{image_extension(encoding)}")
 
     # ==================================================
     # ADMIN COMMANDS
@@ -1,6 +1,7 @@
 # utils package for leveling (packaged copy)
 
 __all__ = [
+    "achievement_assets",
     "database",
     "level_config",
     "rank_card",
@@ -0,0 +1,113 @@
+"""Preprocessed achievement images.
+
+Achievement entries may point at a local image file. Instead of decoding,
+EXIF-rotating and re-encoding that file for every unlock message, each file
+is prepared once per (mtime, size) into ready-to-send bytes: rotated,
+converted to RGB, downscaled to ``MAX_EDGE`` pixels and encoded as PNG,
+or as WebP when the PNG would exceed ``MAX_PNG_BYTES``.
+
+The Achievements cog validates and warms these assets in a thread when a
+guild's achievement images change, so unlock messages only copy bytes.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Dict, NamedTuple, Optional
+
+from PIL import Image, ImageOps
+
+from mybot.utils.image_encoding import encode_image
+from mybot.utils.paths import REPO_ROOT
+
+MAX_EDGE = 1024
+MAX_PNG_BYTES = 1024 * 1024
+MAX_CACHE_ENTRIES = 256
+
+
+class PreparedAsset(NamedTuple):
+    data: bytes
+    filename: str
+    width: int
+    height: int
+
+
+# abs path -> ((mtime_ns, size), asset or None for files that failed to decode)
+_CACHE: Dict[str, tuple] = {}
+_ERRORS: Dict[str, str] = {}
+_LOCK = threading.Lock()
+
+
+def resolve_image_path(value: str) -> Optional[str]:
+    """Absolute path for a local achievement image value; None for URLs/empty."""
+    value = str(value or "").strip()
+    if not value or value.lower().startswith(("http://", "https://")):
+        return None
+    if not os.path.isabs(value):
+        value = os.path.abspath(os.path.join(REPO_ROOT, value))
+    return value
+
+
+def _prepare(path: str) -> PreparedAsset:
+    with Image.open(path) as img:
+        fixed = ImageOps.exif_transpose(img).convert("RGB")
+    fixed.thumbnail((MAX_EDGE, MAX_EDGE))
+    data = encode_image(fixed, {"format": "png", "compress_level": 6})
+    filename = "achievement.png"
+    if len(data) > MAX_PNG_BYTES:
+        data = encode_image(fixed, {"format": "webp", "quality": 85})
+        filename = "achievement.webp"
+    return PreparedAsset(data, filename, fixed.width, fixed.height)
+
+
+def get_asset(path: str) -> Optional[PreparedAsset]:
+    """Prepared asset for *path*, re-processed only when the file changed.
+
+    Blocking on a cache miss; call through ``asyncio.to_thread`` from the loop.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    version = (st.st_mtime_ns, st.st_size)
+    with _LOCK:
+        cached = _CACHE.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    try:
+        asset = _prepare(path)
+        error = None
+    except Exception as e:
+        asset = None
+        error = str(e) or e.__class__.__name__
+    with _LOCK:
+        if len(_CACHE) >= MAX_CACHE_ENTRIES and path not in _CACHE:
+            _CACHE.pop(next(iter(_CACHE)), None)
+        _CACHE[path] = (version, asset)
+        if error:
+            _ERRORS[path] = error
+        else:
+            _ERRORS.pop(path, None)
+    return asset
+
+
+def warm(entries: dict) -> list[str]:
+    """Prepare every local image in achievement *entries*; return problems."""
+    problems = []
+    for name, entry in (entries or {}).items():
+        path = resolve_image_path((entry or {}).get("image", ""))
+        if path is None:
+            continue
+        if not os.path.isfile(path):
+            problems.append(f"{name}: image not found ({path})")
+        elif get_asset(path) is None:
+            problems.append(f"{name}: unreadable image ({_ERRORS.get(path, 'unknown error')})")
+    return problems
+
+
+def clear_cache() -> None:
+    with _LOCK:
+        _CACHE.clear()
+        _ERRORS.clear()
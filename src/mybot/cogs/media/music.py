@@ -2,14 +2,17 @@ import asyncio
 import os
 import re
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional
-from urllib.parse import quote
+from urllib.parse import parse_qs, quote, urlsplit
 
 import aiohttp
 import discord
 from discord.ext import commands
 
+from mybot.cogs.media.query_cache import get_query_cache
+from mybot.utils.ytdl_resolver import get_ytdl_resolver
+
 try:
     from mybot.utils.i18n import translate, translate_for_ctx, translate_for_interaction
 except Exception:  # pragma: no cover
@@ -21,13 +24,6 @@ except Exception:
     YoutubeDL = None
 
 
-YTDL_OPTS = {
-    "format": "bestaudio/best",
-    "quiet": True,
-    "no_warnings": True,
-    "noplaylist": True,
-}
-
 FFMPEG_OPTIONS = (
     "-reconnect",
     "1",
@@ -38,12 +34,62 @@ FFMPEG_OPTIONS = (
 )
 
 
+# Spotify imports: parallel YouTube searches and status edits per second.
+SPOTIFY_SEARCH_CONCURRENCY = 4
+PROGRESS_EDIT_INTERVAL = 0.5
+
+# Queued tracks are resolved to a stream URL just before they play; the next
+# PREFETCH_AHEAD tracks are resolved in the background while one is playing.
+PREFETCH_AHEAD = 2
+# Stream URLs without an ``expire`` parameter are assumed valid this long.
+STREAM_URL_TTL = 2 * 3600
+# Re-resolve a cached URL when less than this (plus the track length) is left.
+# A URL resolved within the margin is used as is, even for longer tracks.
+STREAM_REFRESH_MARGIN = 10 * 60
+
+
+def _stream_expiry(url: str, resolved_at: float) -> float:
+    try:
+        return float(parse_qs(urlsplit(url).query)["expire"][0])
+    except Exception:
+        return resolved_at + STREAM_URL_TTL
+
+
 @dataclass
 class Track:
     title: str
-    source: str
+    # what yt-dlp resolves: a webpage URL or a "ytsearch:..." query
+    query: str
     requester: discord.Member
     duration: Optional[int] = None
+    stream_url: Optional[str] = None
+    expires_at: float = 0.0
+    resolved_at: float = 0.0
+    _resolving: Optional[asyncio.Future] = field(default=None, repr=False, compare=False)
+
+    def stream_is_fresh(self) -> bool:
+        if not self.stream_url:
+            return False
+        now = time.time()
+        if now - self.resolved_at < STREAM_REFRESH_MARGIN:
+            # just resolved; re-resolving would not get a longer-lived URL
+            return now < self.expires_at
+        needed = STREAM_REFRESH_MARGIN + (self.duration or 0)
+        return now + needed < self.expires_at
+
+    def apply_info(self, info: Dict) -> None:
+        """Take stream URL, page URL and metadata from a yt-dlp result."""
+        if info.get("webpage_url"):
+            self.query = info["webpage_url"]
+        if info.get("duration"):
+            self.duration = int(info["duration"])
+        if "formats" in info and info.get("url"):
+            # full extraction; flat search results only carry the page URL
+            self.stream_url = info["url"]
+            self.resolved_at = time.time()
+            self.expires_at = _stream_expiry(self.stream_url, self.resolved_at)
+        elif info.get("url") and not self.query.startswith(("http://", "https://")):
+            self.query = info["url"]
 
 
 class Music(commands.Cog, name="music"):
@@ -62,11 +108,17 @@ class Music(commands.Cog, name="music"):
         self._spotify_token_expires_at: float = 0.0
         # map guild_id -> asyncio.Event used to cancel ongoing imports
         self._import_cancel_events: Dict[int, asyncio.Event] = {}
+        self._prefetch_tasks: Dict[int, asyncio.Task] = {}
 
     async def cog_load(self):
         # called when cog is loaded
         return
 
+    async def cog_unload(self):
+        for task in self._prefetch_tasks.values():
+            task.cancel()
+        await get_query_cache().save()
+
     @staticmethod
     def _t(ctx, key: str, default: str, **fmt) -> str:
         return translate_for_ctx(ctx, key, default=default, **fmt)
@@ -215,15 +267,83 @@ class Music(commands.Cog, name="music"):
             return None
         return None
 
-    async def _resolve_query(self, query: str) -> Dict:
+    async def _resolve_query(self, query: str, flat: bool = False) -> Dict:
+        """yt-dlp info for *query*; *flat* only looks up search results without
+        resolving their streams (much cheaper). Raises LookupError when there
+        are no results."""
         if YoutubeDL is None:
             raise RuntimeError("yt-dlp not installed. Please `pip install yt-dlp`.")
+        return await get_ytdl_resolver().resolve(query, flat=flat)
 
-        def run():
-            with YoutubeDL(YTDL_OPTS) as ytdl:
-                return ytdl.extract_info(query, download=False)
+    async def _lookup_search(self, query: str, sem: asyncio.Semaphore) -> Optional[Dict]:
+        """Video (``url``, ``title``, ``duration``) for an "artist - title" query.
 
-        return await asyncio.to_thread(run)
+        Served from the shared query cache when possible; otherwise a flat
+        search, limited to *sem* concurrent searches.
+        """
+        cache = get_query_cache()
+        cached, video = await cache.get(query)
+        if cached:
+            return video
+        async with sem:
+            try:
+                info = await self._resolve_query(f"ytsearch:{query}", flat=True)
+            except LookupError:
+                await cache.put(query, None)
+                return None
+        url = info.get("webpage_url") or info.get("url")
+        if not url:
+            return None
+        video = {
+            "id": info.get("id"),
+            "url": url,
+            "title": info.get("title") or query,
+            "duration": info.get("duration"),
+        }
+        await cache.put(query, video)
+        return video
+
+    async def _ensure_stream(self, track: Track) -> str:
+        """Return a fresh stream URL for *track*, resolving it if needed.
+
+        Concurrent callers (playback and prefetch) share one resolution.
+        """
+        if track.stream_is_fresh():
+            return track.stream_url
+        fut = track._resolving
+        if fut is None or fut.done():
+            fut = track._resolving = asyncio.ensure_future(self._resolve_track(track))
+        return await asyncio.shield(fut)
+
+    async def _resolve_track(self, track: Track) -> str:
+        info = await self._resolve_query(track.query)
+        track.stream_url = None
+        track.apply_info(info)
+        if not track.stream_url:
+            raise RuntimeError("no playable stream")
+        return track.stream_url
+
+    def _schedule_prefetch(self, guild_id: int) -> None:
+        task = self._prefetch_tasks.get(guild_id)
+        if task is None or task.done():
+            self._prefetch_tasks[guild_id] = asyncio.ensure_future(self._prefetch(guild_id))
+
+    async def _prefetch(self, guild_id: int) -> None:
+        """Resolve the next queued tracks in the background while one plays."""
+        failed = set()
+        while True:
+            pending = [
+                t for t in self.queues.get(guild_id, [])[:PREFETCH_AHEAD]
+                if not t.stream_is_fresh() and id(t) not in failed
+            ]
+            if not pending:
+                return
+            try:
+                await self._ensure_stream(pending[0])
+            except Exception as e:
+                # retried (and skipped if still failing) when it is its turn
+                failed.add(id(pending[0]))
+                print(f"[Music] Prefetch failed for {pending[0].title!r}: {e}")
 
     async def _ensure_voice(self, ctx: commands.Context):
         # already connected
@@ -303,24 +423,37 @@ class Music(commands.Cog, name="music"):
             return None
 
     async def _play_next(self, guild_id: int):
-        async with self.players_lock:
-            queue = self.queues.get(guild_id, [])
-            guild = self.bot.get_guild(guild_id)
-            if not guild:
-                return
-            if not queue:
-                vc = guild.voice_client
-                if vc and vc.is_connected():
-                    await vc.disconnect()
-                self.now_playing[guild_id] = None
-                return
+        guild = self.bot.get_guild(guild_id)
+        if not guild:
+            return
+        while True:
+            async with self.players_lock:
+                queue = self.queues.get(guild_id, [])
+                if not queue:
+                    vc = guild.voice_client
+                    if vc and vc.is_connected():
+                        await vc.disconnect()
+                    self.now_playing[guild_id] = None
+                    return
+                track = queue.pop(0)
+                self.now_playing[guild_id] = track
 
-            track = queue.pop(0)
-            self.now_playing[guild_id] = track
+            # resolved just in time (usually already prefetched); expired
+            # URLs are refreshed here
+            try:
+                stream_url = await self._ensure_stream(track)
+                break
+            except Exception as e:
+                print(f"[Music] Skipping {track.title!r}: {e}")
 
+        async with self.players_lock:
             vc = guild.voice_client
             if not vc or not vc.is_connected():
                 return
+            if vc.is_playing() or vc.is_paused():
+                # another _play_next won the race; keep this track next in line
+                self.queues.setdefault(guild_id, []).insert(0, track)
+                return
 
             def after(err):
                 coro = self._play_next(guild_id)
@@ -331,9 +464,10 @@ class Music(commands.Cog, name="music"):
                     pass
 
             source = discord.FFmpegPCMAudio(
-                track.source, **{"before_options": " ".join(FFMPEG_OPTIONS)}
+                stream_url, **{"before_options": " ".join(FFMPEG_OPTIONS)}
             )
             vc.play(source, after=after)
+        self._schedule_prefetch(guild_id)
 
     # --- commands ---
     @commands.hybrid_command(name="join", description="Join your voice channel")
@@ -385,8 +519,15 @@ class Music(commands.Cog, name="music"):
                 await ctx.trigger_typing()
         except Exception:
             pass
+        # Only the track that starts right away needs its stream now; queued
+        # ones just need a title and are resolved shortly before they play.
+        idle = (
+            not self.queues.get(guild_id)
+            and not ctx.voice_client.is_playing()
+            and not ctx.voice_client.is_paused()
+        )
         try:
-            info = await self._resolve_query(query)
+            info = await self._resolve_query(query, flat=not idle)
         except Exception as e:
             await ctx.send(
                 self._t(
@@ -398,11 +539,7 @@ class Music(commands.Cog, name="music"):
             )
             return
 
-        if "entries" in info:
-            info = info["entries"][0]
-
-        url = info.get("url") or info.get("webpage_url")
-        if not url:
+        if not (info.get("url") or info.get("webpage_url")):
             await ctx.send(
                 self._t(
                     ctx,
@@ -412,13 +549,12 @@ class Music(commands.Cog, name="music"):
             )
             return
 
-        stream_url = info.get("url") or info.get("webpage_url")
         track = Track(
             title=info.get("title", "Unknown"),
-            source=stream_url,
+            query=query,
             requester=ctx.author,
-            duration=info.get("duration"),
         )
+        track.apply_info(info)
 
         self.queues.setdefault(guild_id, []).append(track)
         await ctx.send(
@@ -433,6 +569,8 @@ class Music(commands.Cog, name="music"):
 
         if not ctx.voice_client.is_playing() and not ctx.voice_client.is_paused():
             await self._play_next(guild_id)
+        else:
+            self._schedule_prefetch(guild_id)
 
     @commands.hybrid_command(
         name="spotify", description="Import Spotify track or playlist into the queue"
@@ -531,57 +669,77 @@ class Music(commands.Cog, name="music"):
         view = ImportCancelView(cancel_event, ctx.author.id, getattr(ctx.guild, "id", None))
         status = await ctx.send(embed=embed, view=view)
 
+        # Searches run in parallel (bounded, cached across guilds); tracks are
+        # still queued in playlist order as soon as all earlier ones are done.
+        sem = asyncio.Semaphore(SPOTIFY_SEARCH_CONCURRENCY)
+        lookups = [asyncio.ensure_future(self._lookup_search(q, sem)) for q in queries]
+        playback = None
+        last_edit = time.monotonic()
         added = 0
         skipped = 0
-        for idx, q in enumerate(queries, start=1):
-            try:
-                info = await self._resolve_query(f"ytsearch:{q}")
-                if "entries" in info:
-                    info = info["entries"][0]
-                stream_url = info.get("url") or info.get("webpage_url")
-                title = info.get("title", q)
-                track = Track(
-                    title=title,
-                    source=stream_url,
-                    requester=ctx.author,
-                    duration=info.get("duration"),
-                )
-                self.queues.setdefault(guild_id, []).append(track)
-                added += 1
-            except Exception:
-                skipped += 1
-
-            # check cancellation
-            if cancel_event.is_set():
+        try:
+            for idx, (q, lookup) in enumerate(zip(queries, lookups), start=1):
                 try:
-                    embed.description = self._t(
-                        ctx,
-                        "music.spotify.desc_cancelled",
-                        "Import canceled: {added} added, {skipped} skipped.",
-                        added=added,
-                        skipped=skipped,
-                    )
-                    for item in view.children:
-                        item.disabled = True
-                    await status.edit(embed=embed, view=view)
+                    video = await lookup
                 except Exception:
-                    pass
-                break
-
-            # update status every 5 items or on the last item
-            if idx % 5 == 0 or idx == total:
-                try:
-                    embed.description = self._t(
-                        ctx,
-                        "music.spotify.desc_progress_dynamic",
-                        "Importing {total} tracks... {added}/{total} added (skipped {skipped})",
-                        total=total,
-                        added=added,
-                        skipped=skipped,
+                    video = None
+                if video:
+                    self.queues.setdefault(guild_id, []).append(
+                        Track(
+                            title=q,
+                            query=video["url"],
+                            requester=ctx.author,
+                            duration=video.get("duration"),
+                        )
                     )
-                    await status.edit(embed=embed, view=view)
-                except Exception:
-                    pass
+                    added += 1
+                    # start playing with the first track instead of after the import
+                    if (
+                        playback is None
+                        and not ctx.voice_client.is_playing()
+                        and not ctx.voice_client.is_paused()
+                    ):
+                        playback = asyncio.ensure_future(self._play_next(guild_id))
+                else:
+                    skipped += 1
+
+                # check cancellation
+                if cancel_event.is_set():
+                    try:
+                        embed.description = self._t(
+                            ctx,
+                            "music.spotify.desc_cancelled",
+                            "Import canceled: {added} added, {skipped} skipped.",
+                            added=added,
+                            skipped=skipped,
+                        )
+                        for item in view.children:
+                            item.disabled = True
+                        await status.edit(embed=embed, view=view)
+                    except Exception:
+                        pass
+                    break
+
+                # throttle status edits; cache hits finish many tracks at once
+                now = time.monotonic()
+                if idx < total and now - last_edit >= PROGRESS_EDIT_INTERVAL:
+                    last_edit = now
+                    try:
+                        embed.description = self._t(
+                            ctx,
+                            "music.spotify.desc_progress_dynamic",
+                            "Importing {total} tracks... {added}/{total} added (skipped {skipped})",
+                            total=total,
+                            added=added,
+                            skipped=skipped,
+                        )
+                        await status.edit(embed=embed, view=view)
+                    except Exception:
+                        pass
+        finally:
+            for lookup in lookups:
+                if not lookup.done():
+                    lookup.cancel()
 
         try:
             embed.description = self._t(
@@ -603,8 +761,12 @@ class Music(commands.Cog, name="music"):
         except KeyError:
             pass
 
-        if not ctx.voice_client.is_playing() and not ctx.voice_client.is_paused():
+        if playback is not None:
+            await playback
+        elif not ctx.voice_client.is_playing() and not ctx.voice_client.is_paused():
             await self._play_next(guild_id)
+        else:
+            self._schedule_prefetch(guild_id)
 
     @commands.hybrid_command(name="skip", description="Skip current track")
     async def skip(self, ctx: commands.Context):
@@ -675,6 +837,9 @@ class Music(commands.Cog, name="music"):
             await vc.disconnect()
         self.queues[guild_id] = []
         self.now_playing[guild_id] = None
+        task = self._prefetch_tasks.pop(guild_id, None)
+        if task is not None:
+            task.cancel()
         await ctx.send(
             self._t(
                 ctx,
@@ -0,0 +1,87 @@
+"""Persistent cache of music search queries resolved to YouTube videos.
+
+Spotify imports turn every track into an "artist - title" search. Searching
+is the slow part of an import, and popular playlists repeat the same songs
+across guilds. :class:`QueryCache` maps normalized queries to
+``{"id", "url", "title", "duration"}`` in ``data/cache/music_queries.json``.
+Entries expire after ``HIT_TTL_SECONDS``. Queries without results are
+remembered for ``MISS_TTL_SECONDS``, so they are not searched again on
+every import.
+
+The file is loaded in a worker thread on first use; saving is debounced and
+done in the default executor (:class:`~mybot.utils.jsonstore.DebouncedJsonFile`,
+shared with the feed validator cache).
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import time
+import unicodedata
+from typing import Dict, Optional, Tuple
+
+from mybot.utils.jsonstore import DebouncedJsonFile
+from mybot.utils.paths import DATA_DIR
+
+QUERY_CACHE_PATH = os.path.join(DATA_DIR, "cache", "music_queries.json")
+HIT_TTL_SECONDS = 30 * 86400
+MISS_TTL_SECONDS = 86400
+MAX_ENTRIES = 20000
+SAVE_DELAY_SECONDS = 10.0
+
+
+def normalize_query(query: str) -> str:
+    """Case-, width- and whitespace-insensitive form of an "artist - title" query."""
+    text = unicodedata.normalize("NFKC", str(query or "")).casefold()
+    text = re.sub(r"[\"'`‘’“”]", "", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _drop_expired(entries: Dict[str, dict]) -> Dict[str, dict]:
+    now = time.time()
+    return {key: entry for key, entry in entries.items() if entry.get("expires_at", 0) > now}
+
+
+class QueryCache:
+    """``normalized query -> video`` map with expiry, persisted as JSON."""
+
+    def __init__(self, path: str = QUERY_CACHE_PATH):
+        self.path = path
+        self._file = DebouncedJsonFile(path, SAVE_DELAY_SECONDS, label="Music", prepare=_drop_expired)
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, query: str) -> Tuple[bool, Optional[dict]]:
+        """``(cached, video)``; *video* is None for a remembered "no results"."""
+        entry = (await self._file.load()).get(normalize_query(query))
+        if entry is None or entry.get("expires_at", 0) <= time.time():
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, entry.get("video")
+
+    async def put(self, query: str, video: Optional[dict]) -> None:
+        entries = await self._file.load()
+        key = normalize_query(query)
+        ttl = HIT_TTL_SECONDS if video else MISS_TTL_SECONDS
+        entries.pop(key, None)
+        entries[key] = {"video": video, "expires_at": time.time() + ttl}
+        while len(entries) > MAX_ENTRIES:
+            entries.pop(next(iter(entries)))
+        self._file.schedule_save()
+
+    async def save(self) -> None:
+        """Write pending changes now (used on unload)."""
+        await self._file.flush()
+
+
+_CACHE: Optional[QueryCache] = None
+
+
+def get_query_cache() -> QueryCache:
+    """Return the process-wide query cache (shared by all guilds)."""
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = QueryCache()
+    return _CACHE
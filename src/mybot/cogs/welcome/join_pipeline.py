@@ -0,0 +1,173 @@
+"""Bounded welcome queue with per-guild join-burst detection.
+
+``Welcome.on_member_join`` hands each join to a :class:`WelcomePipeline`
+instead of rendering and sending inline. A fixed number of workers drain a
+bounded queue; when the queue is full the job is dropped and counted.
+
+The welcome cog tracks joins per guild over a sliding window. Above
+``BURST_THRESHOLD`` joins per ``BURST_WINDOW`` seconds it degrades as
+``BURST_MODE`` says:
+    group – joins are collected for ``BURST_GROUP_DELAY`` seconds and
+            welcomed with one "X, Y and N others" banner
+    text  – each join gets a text-only welcome (no render)
+    off   – always render full banners (the queue still bounds the work)
+
+Workers/queue size come from ``WELCOME_WORKERS`` (default 2) and
+``WELCOME_QUEUE_SIZE`` (default 100).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import os
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+DEFAULT_BURST_THRESHOLD = 10
+DEFAULT_BURST_WINDOW = 60
+DEFAULT_BURST_MODE = "group"
+DEFAULT_GROUP_DELAY = 15
+MAX_GROUP_SIZE = 50
+
+BURST_MODES = ("group", "text", "off")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class WelcomePipeline:
+    """Worker queue for welcome jobs plus join-rate tracking and grouping."""
+
+    def __init__(self, workers: Optional[int] = None, queue_size: Optional[int] = None):
+        self.workers = max(1, workers if workers is not None else _env_int("WELCOME_WORKERS", 2))
+        self.queue_size = max(1, queue_size if queue_size is not None else _env_int("WELCOME_QUEUE_SIZE", 100))
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list = []
+        self._joins: Dict[int, collections.deque] = {}
+        self._windows: Dict[int, float] = {}
+        self._groups: Dict[int, list] = {}
+        self._group_tasks: Dict[int, asyncio.Task] = {}
+        self._stats = collections.Counter()
+
+    # --------------------------------------------------
+    # lifecycle
+    # --------------------------------------------------
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self) -> None:
+        """Start the workers. Must be called from the bot's event loop."""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+
+    def stop(self) -> None:
+        for task in self._tasks + list(self._group_tasks.values()):
+            task.cancel()
+        self._tasks = []
+        self._group_tasks.clear()
+        self._groups.clear()
+
+    # --------------------------------------------------
+    # join rate
+    # --------------------------------------------------
+
+    def record_join(self, guild_id: int, window: float) -> int:
+        """Record a join and return the guild's joins within *window* seconds."""
+        now = time.monotonic()
+        joins = self._joins.setdefault(guild_id, collections.deque())
+        joins.append(now)
+        while joins and now - joins[0] > window:
+            joins.popleft()
+        self._windows[guild_id] = window
+        return len(joins)
+
+    def join_rates(self) -> Dict[int, int]:
+        """Joins per guild within each guild's current window."""
+        now = time.monotonic()
+        rates = {}
+        for guild_id, joins in list(self._joins.items()):
+            window = self._windows.get(guild_id, DEFAULT_BURST_WINDOW)
+            while joins and now - joins[0] > window:
+                joins.popleft()
+            if joins:
+                rates[guild_id] = len(joins)
+            else:
+                self._joins.pop(guild_id, None)
+                self._windows.pop(guild_id, None)
+        return rates
+
+    # --------------------------------------------------
+    # jobs
+    # --------------------------------------------------
+
+    def submit(self, kind: str, job: Callable[[], Awaitable]) -> bool:
+        """Queue *job*; returns False (and counts a drop) if the queue is full."""
+        if self._queue is None:
+            self.start()
+        try:
+            self._queue.put_nowait((kind, job))
+        except asyncio.QueueFull:
+            self._stats[f"dropped_{kind}"] += 1
+            self._stats["dropped"] += 1
+            return False
+        self._stats[f"queued_{kind}"] += 1
+        return True
+
+    def add_to_group(self, guild_id: int, member, delay: float, flush: Callable[[list], Awaitable]) -> None:
+        """Collect *member* into the guild's pending group welcome."""
+        group = self._groups.setdefault(guild_id, [])
+        group.append(member)
+        self._stats["grouped_members"] += 1
+        if len(group) >= MAX_GROUP_SIZE:
+            task = self._group_tasks.pop(guild_id, None)
+            if task is not None:
+                task.cancel()
+            self._flush_group(guild_id, flush)
+        elif guild_id not in self._group_tasks:
+            self._group_tasks[guild_id] = asyncio.get_running_loop().create_task(
+                self._flush_later(guild_id, delay, flush)
+            )
+
+    async def _flush_later(self, guild_id: int, delay: float, flush: Callable[[list], Awaitable]) -> None:
+        await asyncio.sleep(delay)
+        self._group_tasks.pop(guild_id, None)
+        self._flush_group(guild_id, flush)
+
+    def _flush_group(self, guild_id: int, flush: Callable[[list], Awaitable]) -> None:
+        members = self._groups.pop(guild_id, None)
+        if members:
+            self.submit("group", lambda: flush(members))
+
+    async def _worker(self) -> None:
+        while True:
+            kind, job = await self._queue.get()
+            try:
+                await job()
+                self._stats[f"sent_{kind}"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._stats["failed"] += 1
+                print(f"[welcome] {kind} welcome failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "depth": self.depth,
+            "pending_groups": {str(gid): len(members) for gid, members in self._groups.items()},
+            "join_rates": {str(gid): rate for gid, rate in self.join_rates().items()},
+            **dict(self._stats),
+        }
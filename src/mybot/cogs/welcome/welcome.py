@@ -10,14 +10,25 @@ import sys
 from datetime import datetime, timezone
 from typing import Optional
 
-import aiohttp
 import discord
 from discord import app_commands
 from discord.ext import commands
 from PIL import Image, ImageDraw, ImageFont
 
+from mybot.cogs.welcome.join_pipeline import (
+    BURST_MODES,
+    DEFAULT_BURST_MODE,
+    DEFAULT_BURST_THRESHOLD,
+    DEFAULT_BURST_WINDOW,
+    DEFAULT_GROUP_DELAY,
+    WelcomePipeline,
+)
+from mybot.utils.avatar_service import get_avatar_service
 from mybot.utils.config import clear_cog_config_cache, load_cog_config
+from mybot.utils.i18n import translate
+from mybot.utils.image_encoding import encoding_from_config, extension as image_extension
 from mybot.utils.paths import REPO_ROOT
+from mybot.utils.render_service import get_render_service
 
 
 def safe_print(*args, **kwargs):
@@ -178,10 +189,11 @@ def render_welcome_banner(
     avatar_size: int = 360,
     font_welcome_path: str = "assets/fonts/Poppins-Bold.ttf",
     font_username_path: str = "assets/fonts/Poppins-Regular.ttf",
-) -> bytes:
+    encode: bool = True,
+) -> bytes | Image.Image:
     """
     Pure rendering function for welcome banner.
-    Returns PNG bytes. Can be used by UI preview or bot.
+    Returns PNG bytes (or the RGB image with ``encode=False``). Can be used by UI preview or bot.
     """
     width, height = 1500, 550
     username = str(username or "NewMember")
@@ -274,16 +286,69 @@ def render_welcome_banner(
     else:
         final_image = banner.convert("RGB")
 
+    if not encode:
+        return final_image
     buffer = io.BytesIO()
     final_image.save(buffer, "PNG")
     return buffer.getvalue()
 
 
+def _join_names(names: list, total: int, guild_id: int | None) -> str:
+    """"A, B and 23 others" / "A, B and C" in the guild's language."""
+    others = total - len(names)
+    if others > 0:
+        return translate(
+            "welcome.group.others",
+            guild_id=guild_id,
+            names=", ".join(names),
+            count=others,
+            default=f"{', '.join(names)} and {others} others",
+        )
+    if len(names) > 1:
+        first = ", ".join(names[:-1])
+        return translate(
+            "welcome.group.pair",
+            guild_id=guild_id,
+            first=first,
+            last=names[-1],
+            default=f"{first} and {names[-1]}",
+        )
+    return "".join(names)
+
+
+def _group_label(members: list, guild_id: int | None = None) -> str:
+    """Username for a group welcome banner."""
+    return _join_names([clean_username(m) for m in members[:2]], len(members), guild_id)
+
+
+def _group_mentions(members: list, limit: int = 20, guild_id: int | None = None) -> str:
+    return _join_names([m.mention for m in members[:limit]], len(members), guild_id)
+
+
 class Welcome(commands.Cog):
     """Welcome cog: generates banner and posts welcome based on config."""
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.pipeline = WelcomePipeline()
+
+    async def cog_load(self):
+        self.pipeline.start()
+        try:
+            from mybot.runtime.metrics import get_sampler
+
+            get_sampler().register_queue("welcome", lambda _bot: self.pipeline.depth)
+        except Exception:
+            pass
+
+    def cog_unload(self):
+        self.pipeline.stop()
+        try:
+            from mybot.runtime.metrics import get_sampler
+
+            get_sampler().unregister_queue("welcome")
+        except Exception:
+            pass
 
     async def create_banner(self, member: discord.Member, overrides: Optional[dict] = None) -> discord.File:
         """Generate the welcome banner image using shared renderer."""
@@ -291,22 +356,17 @@ class Welcome(commands.Cog):
         cfg = _load_welcome_cfg(guild_id=guild_id)
         if isinstance(overrides, dict):
             cfg = {**cfg, **overrides}
+        return await self._render_banner(cfg, clean_username(member), getattr(member, "display_avatar", None))
 
-        username = clean_username(member)
-
+    async def _render_banner(self, cfg: dict, username: str, avatar) -> discord.File:
         _debug("[DEBUG] Loading avatar...")
-        avatar_bytes: bytes | None = None
-        try:
-            timeout = aiohttp.ClientTimeout(total=8)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(member.display_avatar.url) as resp:
-                    if resp.status == 200:
-                        avatar_bytes = await resp.read()
-        except Exception:
-            avatar_bytes = None
+        avatar_bytes = await get_avatar_service().fetch(
+            avatar,
+            _clamp_int(cfg.get("AVATAR_SIZE", 360), 16, 2000, 360),
+        )
 
         _debug("[DEBUG] Rendering banner...")
-        png_bytes = render_welcome_banner(
+        params = dict(
             banner_path=cfg.get("BANNER_PATH", "assets/welcome.png"),
             username=username,
             title=str(cfg.get("BANNER_TITLE", "WELCOME") or "WELCOME"),
@@ -331,20 +391,18 @@ class Welcome(commands.Cog):
             font_welcome_path=cfg.get("FONT_WELCOME", "assets/fonts/Poppins-Bold.ttf"),
             font_username_path=cfg.get("FONT_USERNAME", "assets/fonts/Poppins-Regular.ttf"),
         )
+        encoding = encoding_from_config(cfg)
+        image_bytes = await get_render_service().render("welcome_banner", params, encoding=encoding)
 
         _debug("[DEBUG] Banner ready")
-        return discord.File(io.BytesIO(png_bytes), filename="welcome.png")
+        return discord.File(io.BytesIO(image_bytes), filename=f"welcome.{image_extension(encoding)}")
 
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
         guild_id = getattr(getattr(member, 'guild', None), 'id', None)
         cfg = _load_welcome_cfg(guild_id=guild_id)
-        verify_channel_id = int(cfg.get("VERIFY_CHANNEL_ID", 0) or 0)
         welcome_channel_id = int(cfg.get("WELCOME_CHANNEL_ID", 0) or 0)
-        rules_channel_id = int(cfg.get("RULES_CHANNEL_ID", 0) or 0)
-        aboutme_channel_id = int(cfg.get("ABOUTME_CHANNEL_ID", 0) or 0)
         role_id = int(cfg.get("ROLE_ID", 0) or 0)
-        welcome_message: Optional[str] = cfg.get("WELCOME_MESSAGE")
 
         _debug(f"[DEBUG] Member join detected: {member}")
         guild = member.guild
@@ -355,44 +413,109 @@ class Welcome(commands.Cog):
 
         _debug(f"[DEBUG] Welcome channel found: {welcome_channel.name}")
 
-        rules_channel = guild.get_channel(rules_channel_id)
-        aboutme_channel = guild.get_channel(aboutme_channel_id)
-        verify_channel = guild.get_channel(verify_channel_id)
         role = guild.get_role(role_id)
         if role:
             await member.add_roles(role)
             _debug("[DEBUG] Role assigned")
 
-        banner = await self.create_banner(member)
-        _debug("[DEBUG] Banner created")
-
+        # rendering/sending runs on the pipeline workers; bursts degrade
+        threshold = _to_int(cfg.get("BURST_THRESHOLD"), 0) or DEFAULT_BURST_THRESHOLD
+        window = _to_int(cfg.get("BURST_WINDOW"), 0) or DEFAULT_BURST_WINDOW
+        mode = str(cfg.get("BURST_MODE") or DEFAULT_BURST_MODE).strip().lower()
+        if mode not in BURST_MODES:
+            mode = DEFAULT_BURST_MODE
+
+        rate = self.pipeline.record_join(guild.id, window)
+        if mode == "off" or rate <= threshold:
+            self.pipeline.submit("full", lambda: self._send_welcome(member, cfg))
+        elif mode == "text":
+            self.pipeline.submit("text", lambda: self._send_welcome(member, cfg, with_banner=False))
+        else:
+            delay = _to_int(cfg.get("BURST_GROUP_DELAY"), 0) or DEFAULT_GROUP_DELAY
+            self.pipeline.add_to_group(guild.id, member, delay, self._send_group_welcome)
+
+    def _format_welcome_message(self, guild, cfg: dict, mention: str) -> Optional[str]:
+        welcome_message: Optional[str] = cfg.get("WELCOME_MESSAGE")
         if not welcome_message:
-            safe_print("[WARN] No WELCOME_MESSAGE configured; sending banner only.")
-            await welcome_channel.send(file=banner)
-            return
+            return None
 
+        rules_channel = guild.get_channel(int(cfg.get("RULES_CHANNEL_ID", 0) or 0))
+        aboutme_channel = guild.get_channel(int(cfg.get("ABOUTME_CHANNEL_ID", 0) or 0))
+        verify_channel = guild.get_channel(int(cfg.get("VERIFY_CHANNEL_ID", 0) or 0))
         rules_mention = rules_channel.mention if rules_channel is not None else "#rules"
         verify_mention = verify_channel.mention if verify_channel is not None else "#verify"
         aboutme_mention = aboutme_channel.mention if aboutme_channel is not None else "#aboutme"
 
         try:
-            description = welcome_message.format(
-                mention=member.mention,
+            return welcome_message.format(
+                mention=mention,
                 rules_channel=rules_mention,
                 verify_channel=verify_mention,
                 aboutme_channel=aboutme_mention,
             )
         except Exception:
             safe_print("[ERROR] Failed formatting WELCOME_MESSAGE; sending banner only.")
+            return None
+
+    async def _send_welcome(self, member: discord.Member, cfg: dict, with_banner: bool = True) -> None:
+        guild = member.guild
+        welcome_channel = guild.get_channel(int(cfg.get("WELCOME_CHANNEL_ID", 0) or 0))
+        if welcome_channel is None:
+            return
+        description = self._format_welcome_message(guild, cfg, member.mention)
+
+        if not with_banner:
+            embed = discord.Embed(
+                description=description or translate(
+                    "welcome.msg.text_fallback",
+                    guild_id=guild.id,
+                    mention=member.mention,
+                    default=f"👋 Welcome {member.mention}!",
+                ),
+                color=discord.Color.from_rgb(140, 110, 255),
+                timestamp=datetime.now(timezone.utc),
+            )
+            await welcome_channel.send(embed=embed)
+            return
+
+        banner = await self._render_banner(cfg, clean_username(member), getattr(member, "display_avatar", None))
+        _debug("[DEBUG] Banner created")
+
+        if description is None:
+            if not cfg.get("WELCOME_MESSAGE"):
+                safe_print("[WARN] No WELCOME_MESSAGE configured; sending banner only.")
             await welcome_channel.send(file=banner)
             return
 
         embed = discord.Embed(description=description, color=discord.Color.from_rgb(140, 110, 255), timestamp=datetime.now(timezone.utc))
-        embed.set_image(url="attachment://welcome.png")
+        embed.set_image(url=f"attachment://{banner.filename}")
         _debug("[DEBUG] Sending message...")
         await welcome_channel.send(file=banner, embed=embed)
         _debug("[DEBUG] Message sent")
 
+    async def _send_group_welcome(self, members: list) -> None:
+        """One banner + message for a batch of joins collected during a burst."""
+        if len(members) == 1:
+            member = members[0]
+            await self._send_welcome(member, _load_welcome_cfg(guild_id=member.guild.id))
+            return
+        guild = members[0].guild
+        cfg = _load_welcome_cfg(guild_id=guild.id)
+        welcome_channel = guild.get_channel(int(cfg.get("WELCOME_CHANNEL_ID", 0) or 0))
+        if welcome_channel is None:
+            return
+
+        banner = await self._render_banner(
+            cfg, _group_label(members, guild.id), getattr(members[0], "display_avatar", None)
+        )
+        description = self._format_welcome_message(guild, cfg, _group_mentions(members, guild_id=guild.id))
+        if description is None:
+            await welcome_channel.send(file=banner)
+            return
+        embed = discord.Embed(description=description, color=discord.Color.from_rgb(140, 110, 255), timestamp=datetime.now(timezone.utc))
+        embed.set_image(url=f"attachment://{banner.filename}")
+        await welcome_channel.send(file=banner, embed=embed)
+
     @commands.hybrid_command(description="Testwelcome command.")
     @app_commands.default_permissions(administrator=True)
     @commands.has_permissions(administrator=True)
@@ -444,7 +567,7 @@ class Welcome(commands.Cog):
             color=discord.Color.from_rgb(140, 110, 255),
             timestamp=datetime.now(timezone.utc),
         )
-        embed.set_image(url="attachment://welcome.png")
+        embed.set_image(url=f"attachment://{banner.filename}")
         _debug("[DEBUG] Sending test welcome message...")
         await target_channel.send(file=banner, embed=embed)
         _debug("[DEBUG] Test welcome message sent")
@@ -3,6 +3,19 @@
 Protocol: each request is a single JSON object followed by a newline.
 Responses are single-line JSON objects.
 
+Connections are long-lived. A client may authenticate once with
+``{"action": "hello", "token": ...}`` and then send further requests
+without a token. Requests that carry an ``"id"`` are pipelined: they run
+concurrently and their responses (echoing the ``id``) are written as soon as
+they finish, possibly out of order. Requests without an ``id`` are answered
+in order, so one-shot clients (send one line with ``token``, read one line,
+close) keep working unchanged.
+
+``{"action": "subscribe", "topics": [...], "since_seq": n}`` turns the
+connection into an event stream as well: matching events are pushed as
+``{"event": ..., "seq": ..., "subscription": ..., "data": ...}`` lines
+(see ``mybot.runtime.event_stream``).
+
 Usage: set environment variable `LOCAL_UI_ENABLE=1` before starting the bot
 and the API will listen on 127.0.0.1:8765 by default.
 """
@@ -19,7 +32,12 @@ from typing import Dict
 
 from discord.ext import commands as _commands
 
+from mybot.runtime import instrumentation, loop_watchdog
+from mybot.runtime.event_stream import get_hub
+from mybot.runtime.guild_snapshots import GuildSnapshotStore
+from mybot.runtime.metrics import get_sampler
 from mybot.utils.env_store import ensure_env_file
+from mybot.utils.feed_http import get_feed_client
 from mybot.utils.i18n import (
     available_languages as _available_languages,
     describe_language as _describe_language,
@@ -29,19 +47,6 @@ from mybot.utils.i18n import (
 )
 from mybot.utils.paths import REPO_ROOT, ensure_runtime_storage
 
-try:
-    import psutil  # type: ignore
-except Exception:
-    psutil = None
-
-_PROC_HANDLE = None
-_CPU_PRIMED = False
-if psutil is not None:
-    try:
-        _PROC_HANDLE = psutil.Process(os.getpid())
-    except Exception:
-        _PROC_HANDLE = None
-
 # helper: clear config cache when reloading so UI edits take effect
 def _clear_config_cache():
     try:
@@ -55,6 +60,10 @@ def _clear_config_cache():
 
 CONTROL_API_STARTED_AT = time.time()
 
+PROTOCOL_VERSION = 2
+# Upper bound of pipelined requests a single connection may have running.
+MAX_INFLIGHT_PER_CONNECTION = 32
+
 ADMIN_TEST_COMMANDS = {
     "testping",
     "testrank",
@@ -100,6 +109,20 @@ def _repo_root() -> str:
         return os.getcwd()
 
 
+# Cached CONTROL_API_TOKEN, keyed by the .env file's stat signature and the
+# process environment value so edits to .env are picked up without re-reading
+# the file on every request.
+_TOKEN_CACHE: Dict[str, object] = {"key": None, "token": ""}
+
+
+def _env_signature(path: str):
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
 def _current_control_api_token() -> str:
     try:
         try:
@@ -108,73 +131,71 @@ def _current_control_api_token() -> str:
             from src.mybot.utils.env_store import env_file_path, load_env_dict
 
         path = env_file_path(_repo_root())
+        env_value = str(os.getenv("CONTROL_API_TOKEN", "") or "").strip()
+        key = (path, _env_signature(path), env_value)
+        if _TOKEN_CACHE["key"] == key:
+            return str(_TOKEN_CACHE["token"])
+
         data = load_env_dict(path)
-        token = str(data.get("CONTROL_API_TOKEN", "") or "").strip()
-        if token:
-            return token
+        token = str(data.get("CONTROL_API_TOKEN", "") or "").strip() or env_value
+        _TOKEN_CACHE["key"] = key
+        _TOKEN_CACHE["token"] = token
+        return token
     except Exception:
         pass
     return str(os.getenv("CONTROL_API_TOKEN", "") or "").strip()
 
 
-def _build_guild_snapshot(bot):
-    guilds_payload = []
-    try:
-        guilds = list(getattr(bot, "guilds", []) or [])
-    except Exception:
-        guilds = []
+def _guild_payload(guild) -> dict:
+    channels = []
+    for channel in list(getattr(guild, "channels", []) or []):
+        channels.append(
+            {
+                "id": getattr(channel, "id", None),
+                "name": getattr(channel, "name", "unknown"),
+                "type": str(getattr(channel, "type", "unknown")),
+                "type_value": int(getattr(getattr(channel, "type", None), "value", 0) or 0),
+                "position": int(getattr(channel, "position", 0) or 0),
+                "parent_id": getattr(channel, "category_id", None),
+            }
+        )
+    channels.sort(key=lambda ch: (str(ch.get("type") or ""), str(ch.get("name") or "")))
 
-    for guild in guilds:
-        try:
-            channels = []
-            for channel in list(getattr(guild, "channels", []) or []):
-                channels.append(
-                    {
-                        "id": getattr(channel, "id", None),
-                        "name": getattr(channel, "name", "unknown"),
-                        "type": str(getattr(channel, "type", "unknown")),
-                    }
-                )
-            channels.sort(key=lambda ch: (str(ch.get("type") or ""), str(ch.get("name") or "")))
+    roles = []
+    for role in list(getattr(guild, "roles", []) or []):
+        rid = getattr(role, "id", None)
+        if rid == getattr(guild, "id", None):
+            continue
+        roles.append(
+            {
+                "id": rid,
+                "name": getattr(role, "name", "unknown"),
+                "position": int(getattr(role, "position", 0) or 0),
+            }
+        )
+    roles.sort(key=lambda r: (-int(r.get("position") or 0), str(r.get("name") or "")))
+
+    emojis = []
+    for emoji in list(getattr(guild, "emojis", []) or []):
+        emojis.append(
+            {
+                "id": getattr(emoji, "id", None),
+                "name": getattr(emoji, "name", "unknown"),
+                "animated": bool(getattr(emoji, "animated", False)),
+            }
+        )
+    emojis.sort(key=lambda e: str(e.get("name") or "").lower())
 
-            roles = []
-            for role in list(getattr(guild, "roles", []) or []):
-                rid = getattr(role, "id", None)
-                if rid == getattr(guild, "id", None):
-                    continue
-                roles.append(
-                    {
-                        "id": rid,
-                        "name": getattr(role, "name", "unknown"),
-                        "position": int(getattr(role, "position", 0) or 0),
-                    }
-                )
-            roles.sort(key=lambda r: (-int(r.get("position") or 0), str(r.get("name") or "")))
+    return {
+        "id": getattr(guild, "id", None),
+        "name": getattr(guild, "name", "unknown"),
+        "channels": channels,
+        "roles": roles,
+        "emojis": emojis,
+    }
 
-            emojis = []
-            for emoji in list(getattr(guild, "emojis", []) or []):
-                emojis.append(
-                    {
-                        "id": getattr(emoji, "id", None),
-                        "name": getattr(emoji, "name", "unknown"),
-                        "animated": bool(getattr(emoji, "animated", False)),
-                    }
-                )
-            emojis.sort(key=lambda e: str(e.get("name") or "").lower())
-
-            guilds_payload.append(
-                {
-                    "id": getattr(guild, "id", None),
-                    "name": getattr(guild, "name", "unknown"),
-                    "channels": channels,
-                    "roles": roles,
-                    "emojis": emojis,
-                }
-            )
-        except Exception:
-            continue
 
-    return {"ok": True, "guilds": guilds_payload}
+_SNAPSHOTS = GuildSnapshotStore(_guild_payload)
 
 
 def _pick_test_guild(bot):
@@ -636,517 +657,787 @@ def _handle_purge_status(bot) -> dict:
     return {"ok": True, **status}
 
 
-async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, bot):
-    try:
-        data = await reader.readline()
-        if not data:
-            return
+def _status_payload(bot) -> dict:
+    """Build the ``status`` response (also feeds ``status`` subscriptions).
+
+    Process and gateway figures come from the metrics sampler's latest
+    sample, so this never blocks the event loop.
+    """
+    uptime_seconds = int(max(0, time.time() - CONTROL_API_STARTED_AT))
+    sample = get_sampler().latest() or {}
+
+    return {
+        "ok": True,
+        "ready": getattr(bot, "is_ready", lambda: False)(),
+        "user": getattr(bot.user, "name", None),
+        "user_id": getattr(bot.user, "id", None),
+        "avatar_url": getattr(getattr(bot.user, "display_avatar", None), "url", None),
+        "cogs": list(getattr(bot, "cogs", {}).keys()),
+        "uptime_seconds": uptime_seconds,
+        "gateway_ping_ms": sample.get("gateway_ping_ms"),
+        "cpu_percent": sample.get("cpu_percent"),
+        "system_cpu_percent": sample.get("system_cpu_percent"),
+        "memory_rss_mb": sample.get("memory_rss_mb"),
+        "loop_lag_ms": sample.get("loop_lag_ms"),
+        "guild_count": sample.get("guild_count"),
+        "member_count": sample.get("member_count"),
+        "queues": sample.get("queues") or {},
+        "sampled_at": sample.get("ts"),
+    }
+
+
+async def _dispatch(bot, req: dict) -> dict:
+    """Run a single authenticated request and return its response payload."""
+    action = req.get("action")
+    if action == "ping":
+        resp = {"ok": True, "msg": "pong"}
+
+    elif action == "status":
+        resp = _status_payload(bot)
+
+    elif action == "metrics_history":
+        # column-oriented series for sparklines; "since" is a sample ts
+        sampler = get_sampler()
         try:
-            req = json.loads(data.decode().strip())
-        except Exception:
-            resp = {"ok": False, "error": "invalid json"}
-            writer.write((json.dumps(resp) + "\n").encode())
-            await writer.drain()
-            return
+            since = float(req["since"]) if req.get("since") is not None else None
+            limit = int(req["limit"]) if req.get("limit") is not None else None
+        except (TypeError, ValueError):
+            return {"ok": False, "error": "invalid since/limit"}
+        resp = {
+            "ok": True,
+            "interval": sampler.interval,
+            "series": sampler.series(since=since, limit=limit),
+        }
+
+    elif action == "metrics":
+        # per-handler latency; optional "enable"/"reset" toggles first
+        if "enable" in req:
+            instrumentation.set_enabled(bool(req.get("enable")))
+        if req.get("reset"):
+            instrumentation.reset()
+        include_guilds = bool(req.get("guilds", True))
+        if req.get("format") == "prometheus":
+            sample = get_sampler().latest() or {}
+            gauges = {
+                "bot_cpu_percent": (sample.get("cpu_percent"), "Bot process CPU percent."),
+                "bot_memory_rss_bytes": (
+                    sample["memory_rss_mb"] * 1024 * 1024 if isinstance(sample.get("memory_rss_mb"), (int, float)) else None,
+                    "Bot process resident memory.",
+                ),
+                "bot_event_loop_lag_seconds": (
+                    sample["loop_lag_ms"] / 1000.0 if isinstance(sample.get("loop_lag_ms"), (int, float)) else None,
+                    "Event loop wake-up delay of the metrics sampler.",
+                ),
+                "bot_gateway_latency_seconds": (
+                    sample["gateway_ping_ms"] / 1000.0 if isinstance(sample.get("gateway_ping_ms"), (int, float)) else None,
+                    "Discord gateway heartbeat latency.",
+                ),
+                "bot_guilds": (sample.get("guild_count"), "Guilds in cache."),
+                "bot_members": (sample.get("member_count"), "Members across cached guilds."),
+            }
+            resp = {"ok": True, "text": instrumentation.render_prometheus(include_guilds=include_guilds, gauges=gauges)}
+        else:
+            try:
+                limit = int(req["limit"]) if req.get("limit") is not None else None
+            except (TypeError, ValueError):
+                return {"ok": False, "error": "invalid limit"}
+            resp = {"ok": True, **instrumentation.snapshot(include_guilds=include_guilds, limit=limit)}
+
+    elif action == "loop_stalls":
+        # ranked event-loop stall report; "enable" starts/stops the watchdog
+        watchdog = loop_watchdog.get_watchdog()
+        if "threshold_ms" in req:
+            try:
+                watchdog.threshold = max(10, int(req["threshold_ms"])) / 1000.0
+            except (TypeError, ValueError):
+                return {"ok": False, "error": "invalid threshold_ms"}
+        if "enable" in req:
+            if req.get("enable") and not watchdog.running:
+                watchdog.start()
+            elif not req.get("enable") and watchdog.running:
+                watchdog.stop()
+        if req.get("reset"):
+            watchdog.reset()
+        try:
+            limit = int(req["limit"]) if req.get("limit") is not None else None
+        except (TypeError, ValueError):
+            return {"ok": False, "error": "invalid limit"}
+        resp = {"ok": True, **watchdog.report(limit=limit, include_stacks=bool(req.get("stacks", True)))}
+        if req.get("write_report"):
+            watchdog.write_report()
+            resp["report_path"] = loop_watchdog.REPORT_PATH
+
+    elif action == "render_stats":
+        from mybot.utils.avatar_service import get_avatar_service
+        from mybot.utils.render_service import get_render_service
+
+        resp = {"ok": True, **get_render_service().stats(), "avatars": get_avatar_service().stats()}
+
+    elif action == "welcome_stats":
+        welcome_cog = bot.get_cog("Welcome")
+        pipeline = getattr(welcome_cog, "pipeline", None)
+        if pipeline is None:
+            resp = {"ok": False, "error": "welcome cog not loaded"}
+        else:
+            resp = {"ok": True, **pipeline.stats()}
 
-        # simple token auth: require matching token when CONTROL_API_TOKEN is set
-        control_api_token = _current_control_api_token()
-        if control_api_token:
-            if req.get("token") != control_api_token:
-                resp = {"ok": False, "error": "unauthorized"}
-                writer.write((json.dumps(resp) + "\n").encode())
-                await writer.drain()
-                return
+    elif action == "resolver_stats":
+        from mybot.utils.ytdl_resolver import get_ytdl_resolver
 
-        action = req.get("action")
-        if action == "ping":
-            resp = {"ok": True, "msg": "pong"}
+        resp = {"ok": True, **get_ytdl_resolver().stats()}
 
-        elif action == "status":
-            uptime_seconds = int(max(0, time.time() - CONTROL_API_STARTED_AT))
-            gateway_ping_ms = None
-            try:
-                latency = getattr(bot, "latency", None)
-                if isinstance(latency, (int, float)):
-                    gateway_ping_ms = int(max(0, latency * 1000.0))
-            except Exception:
-                gateway_ping_ms = None
-
-            cpu_percent = None
-            system_cpu_percent = None
-            memory_rss_mb = None
-            try:
-                global _CPU_PRIMED
-                if _PROC_HANDLE is not None:
-                    if not _CPU_PRIMED:
-                        try:
-                            _PROC_HANDLE.cpu_percent(interval=None)
-                        except Exception:
-                            pass
-                        _CPU_PRIMED = True
-                    cpu_percent = float(_PROC_HANDLE.cpu_percent(interval=0.05))
-                    memory_rss_mb = float(_PROC_HANDLE.memory_info().rss) / (1024.0 * 1024.0)
-                if psutil is not None:
-                    try:
-                        system_cpu_percent = float(psutil.cpu_percent(interval=None))
-                    except Exception:
-                        system_cpu_percent = None
-            except Exception:
-                cpu_percent = None
-                system_cpu_percent = None
-                memory_rss_mb = None
-
-            resp = {
-                "ok": True,
-                "ready": getattr(bot, "is_ready", lambda: False)(),
-                "user": getattr(bot.user, "name", None),
-                "user_id": getattr(bot.user, "id", None),
-                "avatar_url": getattr(getattr(bot.user, "display_avatar", None), "url", None),
-                "cogs": list(getattr(bot, "cogs", {}).keys()),
-                "uptime_seconds": uptime_seconds,
-                "gateway_ping_ms": gateway_ping_ms,
-                "cpu_percent": cpu_percent,
-                "system_cpu_percent": system_cpu_percent,
-                "memory_rss_mb": memory_rss_mb,
-            }
+    elif action == "feed_stats":
+        resp = {"ok": True, **get_feed_client().stats()}
+        scheduler = getattr(bot.get_cog("SocialMedia"), "scheduler", None)
+        if scheduler is not None:
+            resp["social_scheduler"] = scheduler.stats()
+        try:
+            from mybot.cogs.community.freestuff_sources import get_source_cache
+            resp["freestuff_sources"] = get_source_cache().stats()
+        except Exception:
+            pass
 
-        elif action == "shutdown":
-            # polite shutdown request
-            resp = {"ok": True, "msg": "shutting down"}
-            writer.write((json.dumps(resp) + "\n").encode())
-            await writer.drain()
-            # schedule bot close on the loop
-            try:
-                coro = bot.close()
-                asyncio.create_task(coro)
-            except Exception:
-                pass
-            return
+    elif action == "shutdown":
+        # polite shutdown request; the connection schedules bot.close()
+        # once this response has been written
+        resp = {"ok": True, "msg": "shutting down"}
 
-        elif action in ("reload", "reload_cogs"):
-            # ensure any updated JSON configs are re-read by clearing cache
-            _clear_config_cache()
-            # Unload existing cogs first to avoid "Cog already loaded" errors
-            reloaded = []
-            failed = {}
-            unloaded = []
+    elif action in ("reload", "reload_cogs"):
+        # ensure any updated JSON configs are re-read by clearing cache
+        _clear_config_cache()
+        # Unload existing cogs first to avoid "Cog already loaded" errors
+        reloaded = []
+        failed = {}
+        unloaded = []
 
-            try:
-                existing = list(bot.cogs.keys())
-                for cog_name in existing:
-                    try:
-                        res = bot.remove_cog(cog_name)
-                        if asyncio.iscoroutine(res):
-                            await res
-                        unloaded.append(cog_name)
-                    except Exception as e:
-                        failed[f"unload:{cog_name}"] = str(e)
-            except Exception as e:
-                # non-fatal, record and continue
-                failed["unload_all"] = str(e)
+        try:
+            existing = list(bot.cogs.keys())
+            for cog_name in existing:
+                try:
+                    res = bot.remove_cog(cog_name)
+                    if asyncio.iscoroutine(res):
+                        await res
+                    unloaded.append(cog_name)
+                except Exception as e:
+                    failed[f"unload:{cog_name}"] = str(e)
+        except Exception as e:
+            # non-fatal, record and continue
+            failed["unload_all"] = str(e)
 
-            # Prefer to reload the explicit extensions list from the runtime runner
-            extensions = None
+        # Prefer to reload the explicit extensions list from the runtime runner
+        extensions = None
+        try:
             try:
+                import mybot.runtime.lizard as lizard
+            except Exception:
                 try:
-                    import mybot.runtime.lizard as lizard
+                    import src.mybot.runtime.lizard as lizard
                 except Exception:
                     try:
-                        import src.mybot.runtime.lizard as lizard
+                        import mybot.lizard as lizard
                     except Exception:
-                        try:
-                            import mybot.lizard as lizard
-                        except Exception:
-                            import src.mybot.lizard as lizard
-                extensions = getattr(lizard, "extensions", None)
-                loaded_exts_map = getattr(lizard, "loaded_extensions", {})
-            except Exception:
-                # not fatal, fallback to scanning sys.modules
-                extensions = None
-                loaded_exts_map = {}
+                        import src.mybot.lizard as lizard
+            extensions = getattr(lizard, "extensions", None)
+            loaded_exts_map = getattr(lizard, "loaded_extensions", {})
+        except Exception:
+            # not fatal, fallback to scanning sys.modules
+            extensions = None
+            loaded_exts_map = {}
 
-            targets = []
-            if extensions and isinstance(extensions, (list, tuple)):
-                targets = list(extensions)
-            else:
-                # fallback: reload any module under mybot.cogs
-                for name in list(sys.modules.keys()):
-                    if name.startswith("mybot.cogs"):
-                        targets.append(name)
+        targets = []
+        if extensions and isinstance(extensions, (list, tuple)):
+            targets = list(extensions)
+        else:
+            # fallback: reload any module under mybot.cogs
+            for name in list(sys.modules.keys()):
+                if name.startswith("mybot.cogs"):
+                    targets.append(name)
 
-            for name in targets:
+        for name in targets:
+            try:
+                # Try to get module if already imported, else import it
+                module = sys.modules.get(name)
+                if module is None:
+                    module = importlib.import_module(name)
+
+                # If we have a recorded list of cogs added by this extension, remove them first
                 try:
-                    # Try to get module if already imported, else import it
-                    module = sys.modules.get(name)
-                    if module is None:
-                        module = importlib.import_module(name)
+                    cogs_to_remove = loaded_exts_map.get(name) or loaded_exts_map.get(name.replace("src.", "")) or []
+                    for cog_name in list(cogs_to_remove):
+                        if cog_name in bot.cogs:
+                            try:
+                                res = bot.remove_cog(cog_name)
+                                if asyncio.iscoroutine(res):
+                                    await res
+                                unloaded.append(cog_name)
+                            except Exception as e:
+                                failed[f"pre_unload:{cog_name}"] = str(e)
+                except Exception:
+                    pass
 
-                    # If we have a recorded list of cogs added by this extension, remove them first
-                    try:
-                        cogs_to_remove = loaded_exts_map.get(name) or loaded_exts_map.get(name.replace("src.", "")) or []
-                        for cog_name in list(cogs_to_remove):
-                            if cog_name in bot.cogs:
-                                try:
-                                    res = bot.remove_cog(cog_name)
-                                    if asyncio.iscoroutine(res):
-                                        await res
-                                    unloaded.append(cog_name)
-                                except Exception as e:
-                                    failed[f"pre_unload:{cog_name}"] = str(e)
-                    except Exception:
-                        pass
+                # Reload the module (so code changes are picked up)
+                try:
+                    module = importlib.reload(module)
+                except Exception as e:
+                    # If reload fails, record and continue
+                    failed[name] = str(e)
+                    continue
 
-                    # Reload the module (so code changes are picked up)
+                # Call setup() if present
+                if hasattr(module, "setup"):
                     try:
-                        module = importlib.reload(module)
+                        res = module.setup(bot)
+                        if asyncio.iscoroutine(res):
+                            await res
                     except Exception as e:
-                        # If reload fails, record and continue
                         failed[name] = str(e)
                         continue
 
-                    # Call setup() if present
-                    if hasattr(module, "setup"):
-                        try:
-                            res = module.setup(bot)
-                            if asyncio.iscoroutine(res):
-                                await res
-                        except Exception as e:
-                            failed[name] = str(e)
-                            continue
-
-                    reloaded.append(name)
-                except Exception as e:
-                    failed[name] = str(e)
-
-            resp = {"ok": True, "reloaded": reloaded, "failed": failed, "unloaded": unloaded}
-        elif action == "banner_preview":
-            # Request the welcome cog to render a banner for a dummy member and
-            # return the PNG as base64 so the UI can show exactly what the bot
-            # would send.
-            name = req.get("name") or getattr(getattr(bot, "user", None), "name", None) or "NewMember"
-            avatar_url = req.get("avatar_url")
-            overrides = req.get("overrides") if isinstance(req.get("overrides"), dict) else None
+                reloaded.append(name)
+            except Exception as e:
+                failed[name] = str(e)
+
+        resp = {"ok": True, "reloaded": reloaded, "failed": failed, "unloaded": unloaded}
+        get_hub().publish("reload", {k: v for k, v in resp.items() if k != "ok"})
+    elif action == "banner_preview":
+        # Request the welcome cog to render a banner for a dummy member and
+        # return the PNG as base64 so the UI can show exactly what the bot
+        # would send.
+        name = req.get("name") or getattr(getattr(bot, "user", None), "name", None) or "NewMember"
+        avatar_url = req.get("avatar_url")
+        overrides = req.get("overrides") if isinstance(req.get("overrides"), dict) else None
 
+        try:
+            # find welcome cog
+            welcome_cog = None
             try:
-                # find welcome cog
+                welcome_cog = bot.get_cog("Welcome")
+            except Exception:
                 welcome_cog = None
-                try:
-                    welcome_cog = bot.get_cog("Welcome")
-                except Exception:
-                    welcome_cog = None
 
-                if welcome_cog is None:
-                    # try to search cogs dict manually
-                    welcome_cog = bot.cogs.get("Welcome")
+            if welcome_cog is None:
+                # try to search cogs dict manually
+                welcome_cog = bot.cogs.get("Welcome")
+
+            if welcome_cog is None:
+                resp = {"ok": False, "error": "welcome cog not loaded"}
+            else:
+                # construct a minimal dummy member object with required attributes
+                class _Avatar:
+                    def __init__(self, url):
+                        self.url = url
+
+                class _DummyMember:
+                    def __init__(self, name, avatar_url):
+                        self.display_name = name
+                        self.name = name
+                        self.mention = f"@{name}"
+                        self.display_avatar = _Avatar(avatar_url)
+
+                # default avatar: use bot user avatar if available
+                if not avatar_url:
+                    try:
+                        avatar_url = getattr(bot.user, "display_avatar", None)
+                        if avatar_url is not None:
+                            avatar_url = getattr(avatar_url, "url", None)
+                    except Exception:
+                        avatar_url = None
 
-                if welcome_cog is None:
-                    resp = {"ok": False, "error": "welcome cog not loaded"}
+                if not avatar_url:
+                    # fallback to a simple 1x1 png served externally; create_banner will handle failures
+                    avatar_url = "https://httpbin.org/image/png"
+
+                dummy = _DummyMember(name, avatar_url)
+                # call create_banner (coroutine) on the cog
+                try:
+                    sig = inspect.signature(welcome_cog.create_banner)
+                    if "overrides" in sig.parameters:
+                        banner_file = await welcome_cog.create_banner(dummy, overrides=overrides)
+                    else:
+                        banner_file = await welcome_cog.create_banner(dummy)
+                except Exception as e:
+                    resp = {"ok": False, "error": f"banner generation failed: {e}"}
                 else:
-                    # construct a minimal dummy member object with required attributes
-                    class _Avatar:
-                        def __init__(self, url):
-                            self.url = url
-
-                    class _DummyMember:
-                        def __init__(self, name, avatar_url):
-                            self.display_name = name
-                            self.name = name
-                            self.mention = f"@{name}"
-                            self.display_avatar = _Avatar(avatar_url)
-
-                    # default avatar: use bot user avatar if available
-                    if not avatar_url:
-                        try:
-                            avatar_url = getattr(bot.user, "display_avatar", None)
-                            if avatar_url is not None:
-                                avatar_url = getattr(avatar_url, "url", None)
-                        except Exception:
-                            avatar_url = None
-
-                    if not avatar_url:
-                        # fallback to a simple 1x1 png served externally; create_banner will handle failures
-                        avatar_url = "https://httpbin.org/image/png"
-
-                    dummy = _DummyMember(name, avatar_url)
-                    # call create_banner (coroutine) on the cog
                     try:
-                        sig = inspect.signature(welcome_cog.create_banner)
-                        if "overrides" in sig.parameters:
-                            banner_file = await welcome_cog.create_banner(dummy, overrides=overrides)
+                        # discord.File stores a .fp file-like object
+                        fp = getattr(banner_file, "fp", None)
+                        if fp is None:
+                            resp = {"ok": False, "error": "no file buffer returned"}
                         else:
-                            banner_file = await welcome_cog.create_banner(dummy)
+                            try:
+                                fp.seek(0)
+                            except Exception:
+                                pass
+                            data = fp.read()
+                            import base64
+
+                            b64 = base64.b64encode(data).decode()
+                            resp = {"ok": True, "png_base64": b64, "filename": getattr(banner_file, "filename", None)}
                     except Exception as e:
-                        resp = {"ok": False, "error": f"banner generation failed: {e}"}
-                    else:
-                        try:
-                            # discord.File stores a .fp file-like object
-                            fp = getattr(banner_file, "fp", None)
-                            if fp is None:
-                                resp = {"ok": False, "error": "no file buffer returned"}
-                            else:
-                                try:
-                                    fp.seek(0)
-                                except Exception:
-                                    pass
-                                data = fp.read()
-                                import base64
-
-                                b64 = base64.b64encode(data).decode()
-                                resp = {"ok": True, "png_base64": b64}
-                        except Exception as e:
-                            resp = {"ok": False, "error": str(e)}
-            except Exception as e:
-                resp = {"ok": False, "error": str(e)}
+                        resp = {"ok": False, "error": str(e)}
+        except Exception as e:
+            resp = {"ok": False, "error": str(e)}
+
+    elif action == "event_test":
+        test_name = str(req.get("test") or "").strip().lower()
+        channel_id = req.get("channel_id")
+        if not test_name:
+            resp = {"ok": False, "error": "missing test command"}
+        elif test_name == "testall":
+            resp = await _run_admin_test_all(bot, requested_channel_id=channel_id)
+        else:
+            resp = await _run_admin_test(bot, test_name, requested_channel_id=channel_id)
+
+    elif action == "guild_snapshot":
+        resp = _SNAPSHOTS.snapshot(
+            bot,
+            since_version=req.get("since_version"),
+            epoch=req.get("epoch"),
+            guild_id=req.get("guild_id"),
+        )
 
-        elif action == "event_test":
-            test_name = str(req.get("test") or "").strip().lower()
-            channel_id = req.get("channel_id")
-            if not test_name:
-                resp = {"ok": False, "error": "missing test command"}
-            elif test_name == "testall":
-                resp = await _run_admin_test_all(bot, requested_channel_id=channel_id)
+    elif action == "languages_get":
+        guild_details = []
+        try:
+            for guild in getattr(bot, "guilds", []) or []:
+                guild_details.append(
+                    {
+                        "id": str(getattr(guild, "id", "")),
+                        "name": getattr(guild, "name", "unknown"),
+                    }
+                )
+        except Exception:
+            guild_details = []
+        resp = {
+            "ok": True,
+            "languages": [
+                {"code": code, "label": _describe_language(code)} for code in _available_languages()
+            ],
+            "default": _get_default_language(),
+            "guilds": _get_all_guild_languages(),
+            "guild_details": guild_details,
+        }
+
+    elif action == "languages_set":
+        guild_id = req.get("guild_id")
+        language = str(req.get("language") or "").lower()
+        if guild_id in (None, ""):
+            resp = {"ok": False, "error": "guild_id required"}
+        elif not language:
+            resp = {"ok": False, "error": "language required"}
+        else:
+            try:
+                _set_language_for_guild(int(guild_id), language)
+            except ValueError as exc:
+                resp = {"ok": False, "error": str(exc)}
             else:
-                resp = await _run_admin_test(bot, test_name, requested_channel_id=channel_id)
+                resp = {
+                    "ok": True,
+                    "guild_id": str(guild_id),
+                    "language": language,
+                    "guilds": _get_all_guild_languages(),
+                }
 
-        elif action == "guild_snapshot":
-            resp = _build_guild_snapshot(bot)
+    elif action == "purge":
+        resp = await _handle_purge(bot, req)
 
-        elif action == "languages_get":
-            guild_details = []
-            try:
-                for guild in getattr(bot, "guilds", []) or []:
-                    guild_details.append(
-                        {
-                            "id": str(getattr(guild, "id", "")),
-                            "name": getattr(guild, "name", "unknown"),
-                        }
-                    )
-            except Exception:
-                guild_details = []
-            resp = {
-                "ok": True,
-                "languages": [
-                    {"code": code, "label": _describe_language(code)} for code in _available_languages()
-                ],
-                "default": _get_default_language(),
-                "guilds": _get_all_guild_languages(),
-                "guild_details": guild_details,
-            }
+    elif action == "purge_status":
+        resp = _handle_purge_status(bot)
 
-        elif action == "languages_set":
-            guild_id = req.get("guild_id")
-            language = str(req.get("language") or "").lower()
-            if guild_id in (None, ""):
-                resp = {"ok": False, "error": "guild_id required"}
-            elif not language:
-                resp = {"ok": False, "error": "language required"}
-            else:
-                try:
-                    _set_language_for_guild(int(guild_id), language)
-                except ValueError as exc:
-                    resp = {"ok": False, "error": str(exc)}
+    elif action == "sync_guild_commands":
+        # Re-sync slash commands for a guild after feature toggles change
+        gid = req.get("guild_id")
+        if not gid:
+            resp = {"ok": False, "error": "guild_id required"}
+        else:
+            try:
+                from mybot.runtime.lizard import sync_guild_commands
+                await sync_guild_commands(int(gid))
+                resp = {"ok": True, "guild_id": str(gid)}
+            except Exception as e:
+                resp = {"ok": False, "error": f"sync failed: {e}"}
+
+    elif action == "create_channel":
+        # Create a text/voice/category channel on a guild
+        guild_id = req.get("guild_id")
+        channel_name = str(req.get("channel_name") or "").strip()
+        channel_type = str(req.get("channel_type") or "text").strip().lower()
+        if not guild_id:
+            resp = {"ok": False, "error": "guild_id required"}
+        elif not channel_name:
+            resp = {"ok": False, "error": "channel_name required"}
+        else:
+            try:
+                guild = bot.get_guild(int(guild_id))
+                if guild is None:
+                    resp = {"ok": False, "error": f"Guild {guild_id} not found"}
                 else:
+                    if channel_type == "category":
+                        ch = await guild.create_category(channel_name)
+                    elif channel_type == "voice":
+                        ch = await guild.create_voice_channel(channel_name)
+                    else:
+                        ch = await guild.create_text_channel(channel_name)
                     resp = {
                         "ok": True,
-                        "guild_id": str(guild_id),
-                        "language": language,
-                        "guilds": _get_all_guild_languages(),
+                        "channel": {
+                            "id": ch.id,
+                            "name": ch.name,
+                            "type": str(ch.type),
+                        },
                     }
+            except Exception as e:
+                resp = {"ok": False, "error": str(e)}
 
-        elif action == "purge":
-            resp = await _handle_purge(bot, req)
-
-        elif action == "purge_status":
-            resp = _handle_purge_status(bot)
+    elif action == "create_role":
+        # Create a role on a guild
+        guild_id = req.get("guild_id")
+        role_name = str(req.get("role_name") or "").strip()
+        if not guild_id:
+            resp = {"ok": False, "error": "guild_id required"}
+        elif not role_name:
+            resp = {"ok": False, "error": "role_name required"}
+        else:
+            try:
+                guild = bot.get_guild(int(guild_id))
+                if guild is None:
+                    resp = {"ok": False, "error": f"Guild {guild_id} not found"}
+                else:
+                    role = await guild.create_role(name=role_name)
+                    resp = {
+                        "ok": True,
+                        "role": {
+                            "id": role.id,
+                            "name": role.name,
+                        },
+                    }
+            except Exception as e:
+                resp = {"ok": False, "error": str(e)}
 
-        elif action == "sync_guild_commands":
-            # Re-sync slash commands for a guild after feature toggles change
-            gid = req.get("guild_id")
-            if not gid:
-                resp = {"ok": False, "error": "guild_id required"}
-            else:
-                try:
-                    from mybot.runtime.lizard import sync_guild_commands
-                    await sync_guild_commands(int(gid))
-                    resp = {"ok": True, "guild_id": str(gid)}
-                except Exception as e:
-                    resp = {"ok": False, "error": f"sync failed: {e}"}
-
-        elif action == "create_channel":
-            # Create a text/voice/category channel on a guild
-            guild_id = req.get("guild_id")
-            channel_name = str(req.get("channel_name") or "").strip()
-            channel_type = str(req.get("channel_type") or "text").strip().lower()
-            if not guild_id:
-                resp = {"ok": False, "error": "guild_id required"}
-            elif not channel_name:
-                resp = {"ok": False, "error": "channel_name required"}
-            else:
-                try:
-                    guild = bot.get_guild(int(guild_id))
-                    if guild is None:
-                        resp = {"ok": False, "error": f"Guild {guild_id} not found"}
-                    else:
-                        if channel_type == "category":
-                            ch = await guild.create_category(channel_name)
-                        elif channel_type == "voice":
-                            ch = await guild.create_voice_channel(channel_name)
-                        else:
-                            ch = await guild.create_text_channel(channel_name)
-                        resp = {
-                            "ok": True,
-                            "channel": {
-                                "id": ch.id,
-                                "name": ch.name,
-                                "type": str(ch.type),
-                            },
-                        }
-                except Exception as e:
-                    resp = {"ok": False, "error": str(e)}
-
-        elif action == "create_role":
-            # Create a role on a guild
-            guild_id = req.get("guild_id")
-            role_name = str(req.get("role_name") or "").strip()
-            if not guild_id:
-                resp = {"ok": False, "error": "guild_id required"}
-            elif not role_name:
-                resp = {"ok": False, "error": "role_name required"}
+    elif action == "rank_preview":
+        name = req.get("name") or getattr(getattr(bot, "user", None), "name", None) or "NewMember"
+        avatar_url = req.get("avatar_url")
+        try:
+            rank_cog = bot.get_cog("Rank") or bot.cogs.get("Rank")
+            if rank_cog is None:
+                resp = {"ok": False, "error": "rank cog not loaded"}
             else:
+                class _Avatar:
+                    def __init__(self, url):
+                        self.url = url
+
+                class _DummyMember:
+                    def __init__(self, uid, name, avatar_url):
+                        self.id = uid
+                        self.display_name = name
+                        self.name = name
+                        self.mention = f"@{name}"
+                        self.display_avatar = _Avatar(avatar_url)
+
+                if not avatar_url:
+                    try:
+                        avatar_url = getattr(bot.user, "display_avatar", None)
+                        if avatar_url is not None:
+                            avatar_url = getattr(avatar_url, "url", None)
+                    except Exception:
+                        avatar_url = None
+
+                if not avatar_url:
+                    avatar_url = "https://httpbin.org/image/png"
+
+                dummy = _DummyMember(123456789, name, avatar_url)
+                bg_path = req.get("bg_path")
+                bg_mode = req.get("bg_mode")
+                bg_zoom = req.get("bg_zoom")
+                bg_offset_x = req.get("bg_offset_x")
+                bg_offset_y = req.get("bg_offset_y")
+                name_font = req.get("name_font")
+                info_font = req.get("info_font")
+                name_font_size = req.get("name_font_size")
+                info_font_size = req.get("info_font_size")
+                name_color = req.get("name_color")
+                info_color = req.get("info_color")
+                text_offset_x = int(req.get("text_offset_x") or 0)
+                text_offset_y = int(req.get("text_offset_y") or 0)
                 try:
-                    guild = bot.get_guild(int(guild_id))
-                    if guild is None:
-                        resp = {"ok": False, "error": f"Guild {guild_id} not found"}
-                    else:
-                        role = await guild.create_role(name=role_name)
-                        resp = {
-                            "ok": True,
-                            "role": {
-                                "id": role.id,
-                                "name": role.name,
-                            },
-                        }
+                    from mybot.utils.render_service import get_render_service
+
+                    png_bytes = await get_render_service().render("rankcard", dict(
+                        bg_path=bg_path or "assets/rankcard.png",
+                        bg_mode=bg_mode or "cover",
+                        bg_zoom=bg_zoom if bg_zoom is not None else 100,
+                        bg_offset_x=bg_offset_x if bg_offset_x is not None else 0,
+                        bg_offset_y=bg_offset_y if bg_offset_y is not None else 0,
+                        username=name,
+                        level=5,
+                        xp=350,
+                        xp_needed=500,
+                        messages=128,
+                        voice_minutes=45,
+                        achievements_count=3,
+                        avatar_bytes=None,
+                        username_font=name_font or "assets/fonts/Poppins-Bold.ttf",
+                        username_font_size=name_font_size if name_font_size is not None else 90,
+                        username_color=name_color or "#FFFFFF",
+                        level_font=info_font or "assets/fonts/Poppins-Regular.ttf",
+                        level_font_size=info_font_size if info_font_size is not None else 60,
+                        level_color=info_color or "#C8C8C8",
+                        xp_font=info_font or "assets/fonts/Poppins-Regular.ttf",
+                        xp_font_size=33,
+                        xp_color=info_color or "#C8C8C8",
+                        messages_font=info_font or "assets/fonts/Poppins-Regular.ttf",
+                        messages_font_size=33,
+                        messages_color=info_color or "#C8C8C8",
+                        voice_font=info_font or "assets/fonts/Poppins-Regular.ttf",
+                        voice_font_size=33,
+                        voice_color=info_color or "#C8C8C8",
+                        achievements_font=info_font or "assets/fonts/Poppins-Regular.ttf",
+                        achievements_font_size=33,
+                        achievements_color=info_color or "#C8C8C8",
+                        username_x=400 + text_offset_x,
+                        username_y=80 + text_offset_y,
+                        level_x=400 + text_offset_x,
+                        level_y=200 + text_offset_y,
+                        xp_x=1065 + text_offset_x,
+                        xp_y=270 + text_offset_y,
+                        messages_x=400 + text_offset_x,
+                        messages_y=400 + text_offset_y,
+                        voice_x=680 + text_offset_x,
+                        voice_y=400 + text_offset_y,
+                        achievements_x=980 + text_offset_x,
+                        achievements_y=400 + text_offset_y,
+                    ))
                 except Exception as e:
-                    resp = {"ok": False, "error": str(e)}
+                    resp = {"ok": False, "error": f"rank generation failed: {e}"}
+                else:
+                    import base64
+
+                    b64 = base64.b64encode(png_bytes).decode()
+                    resp = {"ok": True, "png_base64": b64}
+        except Exception as e:
+            resp = {"ok": False, "error": str(e)}
 
-        elif action == "rank_preview":
-            name = req.get("name") or getattr(getattr(bot, "user", None), "name", None) or "NewMember"
-            avatar_url = req.get("avatar_url")
+    else:
+        resp = {"ok": False, "error": "unknown action"}
+
+    return resp
+
+
+class _ControlConnection:
+    """One client connection: handshake state, pipelined requests, serialized writes."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, bot):
+        self.reader = reader
+        self.writer = writer
+        self.bot = bot
+        # token this connection authenticated with ("" = not authenticated)
+        self.auth_token = ""
+        self._write_lock = asyncio.Lock()
+        self._inflight = asyncio.Semaphore(MAX_INFLIGHT_PER_CONNECTION)
+        self._tasks: set = set()
+        self._subscriptions: dict = {}
+        self._closing = False
+
+    async def send(self, payload: dict) -> None:
+        if self._closing:
+            return
+        data = (json.dumps(payload) + "\n").encode()
+        async with self._write_lock:
+            self.writer.write(data)
+            await self.writer.drain()
+
+    def _authorize(self, req: dict) -> bool:
+        """Check the request token, or the token accepted by an earlier handshake.
+
+        The configured token is re-checked on every request (cached, see
+        ``_current_control_api_token``) so rotating it in ``.env`` drops
+        existing sessions back to unauthenticated.
+        """
+        control_api_token = _current_control_api_token()
+        if not control_api_token:
+            return True
+        if self.auth_token and self.auth_token == control_api_token:
+            return True
+        if req.get("token") == control_api_token:
+            self.auth_token = control_api_token
+            return True
+        self.auth_token = ""
+        return False
+
+    async def _respond(self, req: dict, rid) -> None:
+        action = req.get("action")
+        try:
+            resp = await _dispatch(self.bot, req)
+        except Exception as exc:
+            resp = {"ok": False, "error": str(exc)}
+        if rid is not None:
+            resp = {**resp, "id": rid}
+        try:
+            await self.send(resp)
+        except Exception:
+            return
+        if action == "shutdown":
             try:
-                rank_cog = bot.get_cog("Rank") or bot.cogs.get("Rank")
-                if rank_cog is None:
-                    resp = {"ok": False, "error": "rank cog not loaded"}
-                else:
-                    class _Avatar:
-                        def __init__(self, url):
-                            self.url = url
-
-                    class _DummyMember:
-                        def __init__(self, uid, name, avatar_url):
-                            self.id = uid
-                            self.display_name = name
-                            self.name = name
-                            self.mention = f"@{name}"
-                            self.display_avatar = _Avatar(avatar_url)
-
-                    if not avatar_url:
-                        try:
-                            avatar_url = getattr(bot.user, "display_avatar", None)
-                            if avatar_url is not None:
-                                avatar_url = getattr(avatar_url, "url", None)
-                        except Exception:
-                            avatar_url = None
-
-                    if not avatar_url:
-                        avatar_url = "https://httpbin.org/image/png"
-
-                    dummy = _DummyMember(123456789, name, avatar_url)
-                    bg_path = req.get("bg_path")
-                    bg_mode = req.get("bg_mode")
-                    bg_zoom = req.get("bg_zoom")
-                    bg_offset_x = req.get("bg_offset_x")
-                    bg_offset_y = req.get("bg_offset_y")
-                    name_font = req.get("name_font")
-                    info_font = req.get("info_font")
-                    name_font_size = req.get("name_font_size")
-                    info_font_size = req.get("info_font_size")
-                    name_color = req.get("name_color")
-                    info_color = req.get("info_color")
-                    text_offset_x = int(req.get("text_offset_x") or 0)
-                    text_offset_y = int(req.get("text_offset_y") or 0)
-                    try:
-                        from mybot.cogs.leveling.rank import render_rankcard
-
-                        png_bytes = render_rankcard(
-                            bg_path=bg_path or "assets/rankcard.png",
-                            bg_mode=bg_mode or "cover",
-                            bg_zoom=bg_zoom if bg_zoom is not None else 100,
-                            bg_offset_x=bg_offset_x if bg_offset_x is not None else 0,
-                            bg_offset_y=bg_offset_y if bg_offset_y is not None else 0,
-                            username=name,
-                            level=5,
-                            xp=350,
-                            xp_needed=500,
-                            messages=128,
-                            voice_minutes=45,
-                            achievements_count=3,
-                            avatar_bytes=None,
-                            username_font=name_font or "assets/fonts/Poppins-Bold.ttf",
-                            username_font_size=name_font_size if name_font_size is not None else 90,
-                            username_color=name_color or "#FFFFFF",
-                            level_font=info_font or "assets/fonts/Poppins-Regular.ttf",
-                            level_font_size=info_font_size if info_font_size is not None else 60,
-                            level_color=info_color or "#C8C8C8",
-                            xp_font=info_font or "assets/fonts/Poppins-Regular.ttf",
-                            xp_font_size=33,
-                            xp_color=info_color or "#C8C8C8",
-                            messages_font=info_font or "assets/fonts/Poppins-Regular.ttf",
-                            messages_font_size=33,
-                            messages_color=info_color or "#C8C8C8",
-                            voice_font=info_font or "assets/fonts/Poppins-Regular.ttf",
-                            voice_font_size=33,
-                            voice_color=info_color or "#C8C8C8",
-                            achievements_font=info_font or "assets/fonts/Poppins-Regular.ttf",
-                            achievements_font_size=33,
-                            achievements_color=info_color or "#C8C8C8",
-                            username_x=400 + text_offset_x,
-                            username_y=80 + text_offset_y,
-                            level_x=400 + text_offset_x,
-                            level_y=200 + text_offset_y,
-                            xp_x=1065 + text_offset_x,
-                            xp_y=270 + text_offset_y,
-                            messages_x=400 + text_offset_x,
-                            messages_y=400 + text_offset_y,
-                            voice_x=680 + text_offset_x,
-                            voice_y=400 + text_offset_y,
-                            achievements_x=980 + text_offset_x,
-                            achievements_y=400 + text_offset_y,
-                        )
-                    except Exception as e:
-                        resp = {"ok": False, "error": f"rank generation failed: {e}"}
-                    else:
-                        import base64
+                asyncio.create_task(self.bot.close())
+            except Exception:
+                pass
 
-                        b64 = base64.b64encode(png_bytes).decode()
-                        resp = {"ok": True, "png_base64": b64}
-            except Exception as e:
-                resp = {"ok": False, "error": str(e)}
+    async def _run_pipelined(self, req: dict, rid) -> None:
+        try:
+            await self._respond(req, rid)
+        finally:
+            self._inflight.release()
 
-        else:
-            resp = {"ok": False, "error": "unknown action"}
+    async def _pump(self, sub) -> None:
+        """Forward a subscription's buffered events to this client."""
+        try:
+            while True:
+                events, dropped = await sub.next_batch()
+                if dropped:
+                    # the client fell behind; it should re-fetch full state
+                    await self.send({"event": "overflow", "subscription": sub.id, "dropped": dropped})
+                for event in events:
+                    await self.send({**event, "subscription": sub.id})
+        except (ConnectionError, OSError):
+            # client went away; drop the subscription instead of dying unobserved
+            if self._subscriptions.get(sub.id, (None,))[0] is sub:
+                self._subscriptions.pop(sub.id, None)
+            get_hub().unsubscribe(sub)
+
+    async def _subscribe(self, req: dict) -> dict:
+        hub = get_hub()
+        topics = req.get("topics")
+        if isinstance(topics, str):
+            topics = [topics]
+        if topics is not None and not isinstance(topics, list):
+            return {"ok": False, "error": "topics must be a list"}
+        sub, resync = hub.subscribe(
+            topics=topics,
+            guild_id=req.get("guild_id"),
+            since_seq=req.get("since_seq"),
+            buffer_size=req.get("buffer") or 0,
+        )
+        task = asyncio.create_task(self._pump(sub))
+        self._subscriptions[sub.id] = (sub, task)
+        return {
+            "ok": True,
+            "subscription": sub.id,
+            "topics": sorted(sub.topics),
+            "seq": hub.seq,
+            "resync": resync,
+        }
+
+    def _unsubscribe(self, sid) -> bool:
+        entry = self._subscriptions.pop(sid, None)
+        if entry is None:
+            return False
+        sub, task = entry
+        get_hub().unsubscribe(sub)
+        task.cancel()
+        return True
+
+    async def run(self) -> None:
+        while True:
+            try:
+                data = await self.reader.readline()
+            except (asyncio.LimitOverrunError, ValueError):
+                await self.send({"ok": False, "error": "request too large"})
+                return
+            except (ConnectionError, OSError):
+                return
+            if not data:
+                return
+            line = data.strip()
+            if not line:
+                continue
+            try:
+                req = json.loads(line.decode())
+                if not isinstance(req, dict):
+                    raise ValueError("request must be an object")
+            except Exception:
+                await self.send({"ok": False, "error": "invalid json"})
+                return
+
+            rid = req.get("id")
+            if not self._authorize(req):
+                resp = {"ok": False, "error": "unauthorized"}
+                if rid is not None:
+                    resp["id"] = rid
+                await self.send(resp)
+                return
 
-        writer.write((json.dumps(resp) + "\n").encode())
-        await writer.drain()
+            if req.get("action") == "hello":
+                resp = {
+                    "ok": True,
+                    "protocol": PROTOCOL_VERSION,
+                    "max_inflight": MAX_INFLIGHT_PER_CONNECTION,
+                }
+                if rid is not None:
+                    resp["id"] = rid
+                await self.send(resp)
+                continue
 
-    finally:
+            if req.get("action") == "subscribe":
+                resp = await self._subscribe(req)
+                if rid is not None:
+                    resp["id"] = rid
+                await self.send(resp)
+                continue
+
+            if req.get("action") == "unsubscribe":
+                try:
+                    sid = int(req.get("subscription"))
+                except (TypeError, ValueError):
+                    sid = None
+                resp = {"ok": self._unsubscribe(sid)}
+                if not resp["ok"]:
+                    resp["error"] = "unknown subscription"
+                if rid is not None:
+                    resp["id"] = rid
+                await self.send(resp)
+                continue
+
+            if rid is None:
+                # legacy request: answer in order before reading the next line
+                await self._respond(req, None)
+                continue
+
+            await self._inflight.acquire()
+            task = asyncio.create_task(self._run_pipelined(req, rid))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def close(self) -> None:
+        for sid in list(self._subscriptions):
+            self._unsubscribe(sid)
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+        self._closing = True
         try:
-            writer.close()
-            await writer.wait_closed()
+            self.writer.close()
+            await self.writer.wait_closed()
         except Exception:
             pass
 
 
+async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, bot):
+    conn = _ControlConnection(reader, writer, bot)
+    try:
+        await conn.run()
+    except Exception:
+        pass
+    finally:
+        await conn.close()
+
+
 async def serve(bot, host: str = "127.0.0.1", port: int = 8765):
+    get_sampler().start(bot)
+    _SNAPSHOTS.attach(bot)
+    get_hub().attach(
+        bot,
+        status_provider=lambda: _status_payload(bot),
+        guild_provider=_SNAPSHOTS.payload,
+    )
     server = await asyncio.start_server(lambda r, w: handle_client(r, w, bot), host, port)
     addrs = ", ".join(str(sock.getsockname()) for sock in server.sockets)
     print(f"Local UI control API listening on {addrs}")
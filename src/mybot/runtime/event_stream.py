@@ -0,0 +1,304 @@
+"""Server-push event fan-out for control API subscribers.
+
+Producers call :meth:`EventHub.publish` with a topic and a JSON-serialisable
+payload. Every event gets a global, monotonically increasing ``seq`` and is
+kept in a short replay history so a reconnecting client can resume with
+``since_seq``. Each subscriber owns a bounded buffer; when a slow consumer
+falls behind, the oldest events are dropped and counted so the client knows
+to resync.
+
+Topics:
+    status  – changed keys of the ``status`` payload (``full`` on subscribe)
+    purge   – purge progress snapshots (``purge_status`` payload)
+    log     – newly inserted rows of the logs database
+    reload  – results of ``reload`` / ``reload_cogs``
+    guild   – channel/role/emoji/guild changes with the guild's snapshot entry
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import itertools
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+TOPICS = ("status", "purge", "log", "reload", "guild")
+
+HISTORY_SIZE = 512
+DEFAULT_BUFFER_SIZE = 256
+MIN_BUFFER_SIZE = 16
+MAX_BUFFER_SIZE = 4096
+STATUS_INTERVAL_SECONDS = 1.0
+
+# Gateway events that change what ``guild_snapshot`` returns.
+_GUILD_EVENTS = (
+    "guild_channel_create",
+    "guild_channel_delete",
+    "guild_channel_update",
+    "guild_role_create",
+    "guild_role_delete",
+    "guild_role_update",
+    "guild_emojis_update",
+    "guild_update",
+    "guild_join",
+    "guild_remove",
+)
+
+
+class Subscription:
+    """One subscriber's topic filter and bounded event buffer."""
+
+    def __init__(self, sid: int, topics: Iterable[str], guild_id: Optional[int], buffer_size: int):
+        self.id = sid
+        self.topics = frozenset(topics)
+        self.guild_id = guild_id
+        self.buffer_size = buffer_size
+        self.dropped = 0
+        self._buffer: collections.deque = collections.deque()
+        self._wakeup = asyncio.Event()
+
+    def matches(self, event: dict) -> bool:
+        if event.get("event") not in self.topics:
+            return False
+        if self.guild_id is None:
+            return True
+        gid = event.get("guild_id")
+        return gid is None or gid == self.guild_id
+
+    def push(self, event: dict) -> None:
+        if len(self._buffer) >= self.buffer_size:
+            self._buffer.popleft()
+            self.dropped += 1
+        self._buffer.append(event)
+        self._wakeup.set()
+
+    async def next_batch(self) -> tuple[list, int]:
+        """Wait for events and return ``(events, dropped_since_last_batch)``."""
+        while not self._buffer:
+            self._wakeup.clear()
+            await self._wakeup.wait()
+        events = list(self._buffer)
+        self._buffer.clear()
+        dropped, self.dropped = self.dropped, 0
+        return events, dropped
+
+
+class EventHub:
+    """Sequenced publish/subscribe hub living on the bot's event loop."""
+
+    def __init__(self, history_size: int = HISTORY_SIZE):
+        self._seq = 0
+        self._history: collections.deque = collections.deque(maxlen=history_size)
+        self._subs: dict[int, Subscription] = {}
+        self._sub_ids = itertools.count(1)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._status_provider: Optional[Callable[[], dict]] = None
+        self._guild_provider: Optional[Callable[[object], dict]] = None
+        self._last_status: dict = {}
+        self._status_task: Optional[asyncio.Task] = None
+        self._attached_bot = None
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    # --------------------------------------------------
+    # publish / subscribe
+    # --------------------------------------------------
+
+    def publish(self, topic: str, data: dict, guild_id=None, **extra) -> None:
+        """Record and fan out an event. Safe to call from worker threads."""
+        if (
+            self._loop is not None
+            and self._loop_thread is not None
+            and threading.get_ident() != self._loop_thread
+        ):
+            try:
+                self._loop.call_soon_threadsafe(lambda: self.publish(topic, data, guild_id, **extra))
+            except RuntimeError:
+                pass
+            return
+
+        try:
+            gid = int(guild_id) if guild_id not in (None, "") else None
+        except (TypeError, ValueError):
+            gid = None
+        self._seq += 1
+        event = {"event": topic, "seq": self._seq, "ts": time.time(), "data": data, **extra}
+        if gid is not None:
+            event["guild_id"] = gid
+        self._history.append(event)
+        for sub in list(self._subs.values()):
+            if sub.matches(event):
+                sub.push(event)
+
+    def subscribe(
+        self,
+        topics: Iterable[str] | None = None,
+        guild_id=None,
+        since_seq: Optional[int] = None,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ) -> tuple[Subscription, bool]:
+        """Register a subscriber and queue any replayed events.
+
+        Returns ``(subscription, resync)``. ``resync`` is True when
+        *since_seq* is older than the replay history, so events were missed
+        and the client should re-fetch full state.
+        """
+        wanted = [t for t in (topics or TOPICS) if t in TOPICS] or list(TOPICS)
+        try:
+            gid = int(guild_id) if guild_id not in (None, "") else None
+        except (TypeError, ValueError):
+            gid = None
+        try:
+            size = int(buffer_size or DEFAULT_BUFFER_SIZE)
+        except (TypeError, ValueError, OverflowError):
+            size = DEFAULT_BUFFER_SIZE
+        size = max(MIN_BUFFER_SIZE, min(MAX_BUFFER_SIZE, size))
+        sub = Subscription(next(self._sub_ids), wanted, gid, size)
+
+        resync = False
+        if since_seq is not None:
+            try:
+                since = int(since_seq)
+            except (TypeError, ValueError):
+                since = None
+            if since is not None:
+                oldest = self._history[0]["seq"] if self._history else self._seq + 1
+                resync = since < oldest - 1 or since > self._seq
+                for event in self._history:
+                    if event["seq"] > since and sub.matches(event):
+                        sub.push(event)
+
+        if "status" in sub.topics and self._last_status:
+            sub.push({"event": "status", "seq": self._seq, "ts": time.time(), "data": dict(self._last_status), "full": True})
+
+        self._subs[sub.id] = sub
+        self._ensure_status_task()
+        return sub, resync
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self._subs.pop(sub.id, None)
+
+    def buffered_events(self) -> int:
+        """Events queued across all subscribers but not yet written."""
+        return sum(len(sub._buffer) for sub in self._subs.values())
+
+    def _has_subscribers(self, topic: str) -> bool:
+        return any(topic in sub.topics for sub in self._subs.values())
+
+    # --------------------------------------------------
+    # status deltas
+    # --------------------------------------------------
+
+    def _ensure_status_task(self) -> None:
+        if self._status_provider is None or not self._has_subscribers("status"):
+            return
+        if self._status_task is not None and not self._status_task.done():
+            return
+        try:
+            self._status_task = asyncio.get_running_loop().create_task(self._status_loop())
+        except RuntimeError:
+            self._status_task = None
+
+    def _publish_status(self) -> None:
+        try:
+            current = dict(self._status_provider() or {})
+        except Exception:
+            return
+        current.pop("ok", None)
+        changed = {k: v for k, v in current.items() if self._last_status.get(k) != v}
+        removed = [k for k in self._last_status if k not in current]
+        self._last_status = current
+        if changed or removed:
+            payload = dict(changed)
+            if removed:
+                payload["_removed"] = removed
+            self.publish("status", payload)
+
+    async def _status_loop(self) -> None:
+        # Stops on its own once nobody listens; subscribe() restarts it.
+        while self._has_subscribers("status"):
+            self._publish_status()
+            await asyncio.sleep(STATUS_INTERVAL_SECONDS)
+
+    # --------------------------------------------------
+    # producers
+    # --------------------------------------------------
+
+    def attach(
+        self,
+        bot,
+        status_provider: Optional[Callable[[], dict]] = None,
+        guild_provider: Optional[Callable[[object], dict]] = None,
+    ) -> None:
+        """Wire the hub to *bot*'s gateway events and the logs database.
+
+        Must be called from the bot's event loop. Calling it again for the
+        same bot only refreshes the providers.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._status_provider = status_provider
+        if status_provider is not None:
+            try:
+                self._last_status = {k: v for k, v in (status_provider() or {}).items() if k != "ok"}
+            except Exception:
+                self._last_status = {}
+        self._guild_provider = guild_provider
+        if self._attached_bot is bot:
+            return
+        self._attached_bot = bot
+
+        async def _on_purge_progress(status: dict):
+            self.publish("purge", dict(status or {}))
+
+        bot.add_listener(_on_purge_progress, "on_purge_progress")
+
+        for name in _GUILD_EVENTS:
+            bot.add_listener(self._make_guild_listener(name), f"on_{name}")
+
+        try:
+            try:
+                from data.logs.storage import database as _logs_db
+            except Exception:
+                _logs_db = None
+            if _logs_db is not None and hasattr(_logs_db, "add_row_listener"):
+                _logs_db.add_row_listener(lambda row: self.publish("log", row, guild_id=row.get("guild_id")))
+        except Exception:
+            pass
+
+    def _make_guild_listener(self, name: str):
+        async def _listener(*args):
+            guild = None
+            # newest object last: (before, after) pairs and (guild, before, after)
+            for arg in reversed(args):
+                guild = getattr(arg, "guild", None) or (arg if hasattr(arg, "channels") else None)
+                if guild is not None:
+                    break
+            if guild is None:
+                return
+            data = {"change": name}
+            provider = self._guild_provider
+            if provider is not None and name != "guild_remove":
+                try:
+                    data["guild"] = provider(guild)
+                except Exception:
+                    pass
+            self.publish("guild", data, guild_id=getattr(guild, "id", None))
+
+        return _listener
+
+
+_HUB: Optional[EventHub] = None
+
+
+def get_hub() -> EventHub:
+    """Return the process-wide event hub."""
+    global _HUB
+    if _HUB is None:
+        _HUB = EventHub()
+    return _HUB
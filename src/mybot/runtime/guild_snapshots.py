@@ -0,0 +1,159 @@
+"""Versioned per-guild snapshots for the control API ``guild_snapshot`` action.
+
+Instead of walking and sorting every guild's channels, roles and emojis on
+each request, :class:`GuildSnapshotStore` keeps one payload per guild and
+rebuilds it only after a channel/role/emoji/guild gateway event marked the
+guild dirty. Every real change bumps a store-wide ``version``; the changed
+guild remembers the version it changed at, removed guilds leave a
+tombstone.
+
+Clients send the ``version`` and ``epoch`` of their last snapshot:
+    same version          → ``{"unchanged": true}``
+    older version         → ``{"delta": true, "guilds": [changed], "removed": [ids]}``
+    other epoch / missing → full ``{"guilds": [...]}``
+
+The epoch changes with every bot start, so versions from a previous run are
+never mistaken for current ones.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, Dict, Optional
+
+from mybot.runtime.event_stream import _GUILD_EVENTS
+
+# guild_available covers reconnects where the cache was rebuilt without
+# individual channel/role events
+_DIRTY_EVENTS = _GUILD_EVENTS + ("guild_available",)
+
+
+class GuildSnapshotStore:
+    """Per-guild snapshot payloads kept current by gateway events."""
+
+    def __init__(self, builder: Callable[[object], dict]):
+        self._builder = builder
+        self.epoch = f"{time.time_ns():x}"
+        self.version = 0
+        # guild id -> (version it last changed at, payload)
+        self._entries: Dict[int, tuple] = {}
+        # guild id -> version it was removed at
+        self._removed: Dict[int, int] = {}
+        self._dirty: set = set()
+        self._attached_bot = None
+        self.builds = 0
+
+    # --------------------------------------------------
+    # gateway events
+    # --------------------------------------------------
+
+    def attach(self, bot) -> None:
+        """Listen for guild changes. Attach before the event hub so its
+        pushed ``guild`` events already see the rebuilt payload."""
+        if self._attached_bot is bot:
+            return
+        self._attached_bot = bot
+        for name in _DIRTY_EVENTS:
+            bot.add_listener(self._make_listener(name), f"on_{name}")
+
+    def _make_listener(self, name: str):
+        async def _listener(*args):
+            for arg in reversed(args):
+                guild = getattr(arg, "guild", None) or (arg if hasattr(arg, "channels") else None)
+                if guild is not None:
+                    break
+            else:
+                return
+            gid = getattr(guild, "id", None)
+            if name == "guild_remove":
+                self._drop(gid)
+            else:
+                self._dirty.add(gid)
+
+        return _listener
+
+    # --------------------------------------------------
+    # entries
+    # --------------------------------------------------
+
+    def _store(self, guild) -> dict:
+        payload = self._builder(guild)
+        self.builds += 1
+        gid = getattr(guild, "id", None)
+        old = self._entries.get(gid)
+        if old is None or old[1] != payload:
+            self.version += 1
+            self._entries[gid] = (self.version, payload)
+            self._removed.pop(gid, None)
+        self._dirty.discard(gid)
+        return self._entries[gid][1]
+
+    def _drop(self, gid) -> None:
+        self._dirty.discard(gid)
+        if self._entries.pop(gid, None) is not None:
+            self.version += 1
+            self._removed[gid] = self.version
+
+    def payload(self, guild) -> dict:
+        """Snapshot entry for *guild*; rebuilt only when it was marked dirty."""
+        gid = getattr(guild, "id", None)
+        entry = self._entries.get(gid)
+        if entry is None or gid in self._dirty:
+            return self._store(guild)
+        return entry[1]
+
+    def _sync(self, bot) -> list:
+        """Bring entries in line with ``bot.guilds``; return live ids in order."""
+        try:
+            guilds = list(getattr(bot, "guilds", []) or [])
+        except Exception:
+            guilds = []
+        order = []
+        for guild in guilds:
+            try:
+                self.payload(guild)
+            except Exception:
+                continue
+            order.append(getattr(guild, "id", None))
+        live = set(order)
+        for gid in [gid for gid in self._entries if gid not in live]:
+            self._drop(gid)
+        return order
+
+    # --------------------------------------------------
+    # requests
+    # --------------------------------------------------
+
+    def snapshot(self, bot, since_version=None, epoch=None, guild_id=None) -> dict:
+        """Response for ``guild_snapshot``: unchanged, a delta or everything."""
+        order = self._sync(bot)
+        if guild_id not in (None, ""):
+            try:
+                wanted: Optional[int] = int(guild_id)
+            except Exception:
+                wanted = None
+            order = [gid for gid in order if gid == wanted]
+        else:
+            wanted = None
+        resp = {"ok": True, "version": self.version, "epoch": self.epoch}
+
+        since = None
+        if since_version not in (None, "") and epoch == self.epoch:
+            try:
+                since = int(since_version)
+            except Exception:
+                since = None
+        if since is None or not 0 <= since <= self.version:
+            resp["guilds"] = [self._entries[gid][1] for gid in order]
+            return resp
+
+        changed = [self._entries[gid][1] for gid in order if self._entries[gid][0] > since]
+        removed = [
+            gid for gid, version in self._removed.items()
+            if version > since and (wanted is None or gid == wanted)
+        ]
+        if not changed and not removed:
+            resp["unchanged"] = True
+        else:
+            resp.update({"delta": True, "guilds": changed, "removed": removed})
+        return resp
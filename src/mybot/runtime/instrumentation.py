@@ -0,0 +1,323 @@
+"""Per-handler latency instrumentation.
+
+:func:`install` patches the bot instance so every dispatched listener,
+prefix/hybrid command invocation and app command call is timed. Each
+handler keeps a call count, an error count and a fixed-bucket latency
+histogram, both overall and per guild, from which p50/p95/p99 are
+estimated. Coroutines that are not dispatched by discord.py (for example
+``Achievements.check_achievements``) can opt in with :func:`timed`.
+
+Recording costs two ``perf_counter`` calls and a bucket lookup per call.
+Set ``BOT_INSTRUMENTATION=0`` to start disabled; the control API
+``metrics`` action can toggle it at runtime.
+"""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+# Upper bounds in seconds (Prometheus style); the last bucket is +Inf.
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Guilds tracked per handler before the rest are folded into "other".
+MAX_GUILD_BUCKETS = 64
+
+_ENABLED = str(os.getenv("BOT_INSTRUMENTATION", "1")).strip().lower() not in ("0", "false", "no", "off")
+
+
+class LatencyStats:
+    """Call/error counters plus a (non-cumulative) bucket histogram."""
+
+    __slots__ = ("count", "errors", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def record(self, seconds: float, failed: bool) -> None:
+        self.count += 1
+        if failed:
+            self.errors += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Estimate the *q* quantile (0..1) in seconds by interpolating buckets."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for idx, n in enumerate(self.buckets):
+            if not n:
+                continue
+            if seen + n >= rank:
+                lower = BUCKETS[idx - 1] if idx > 0 else 0.0
+                upper = BUCKETS[idx] if idx < len(BUCKETS) else self.max
+                upper = min(upper, self.max)
+                lower = min(lower, upper)
+                return lower + (upper - lower) * ((rank - seen) / n)
+            seen += n
+        return self.max
+
+    def summary(self) -> dict:
+        def _ms(value):
+            return round(value * 1000.0, 3) if value is not None else None
+
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": _ms(self.total),
+            "mean_ms": _ms(self.total / self.count) if self.count else None,
+            "max_ms": _ms(self.max),
+            "p50_ms": _ms(self.percentile(0.50)),
+            "p95_ms": _ms(self.percentile(0.95)),
+            "p99_ms": _ms(self.percentile(0.99)),
+        }
+
+
+class HandlerStats(LatencyStats):
+    """Overall stats for one handler plus one :class:`LatencyStats` per guild."""
+
+    __slots__ = ("guilds",)
+
+    def __init__(self):
+        super().__init__()
+        self.guilds: Dict[str, LatencyStats] = {}
+
+    def record_guild(self, guild_key: str, seconds: float, failed: bool) -> None:
+        self.record(seconds, failed)
+        stats = self.guilds.get(guild_key)
+        if stats is None:
+            if len(self.guilds) >= MAX_GUILD_BUCKETS:
+                guild_key = "other"
+                stats = self.guilds.get(guild_key)
+            if stats is None:
+                stats = self.guilds[guild_key] = LatencyStats()
+        stats.record(seconds, failed)
+
+
+_STATS: Dict[Tuple[str, str], HandlerStats] = {}
+_LOCK = threading.Lock()
+_STARTED_AT = time.time()
+
+
+def is_enabled() -> bool:
+    return _ENABLED
+
+
+def set_enabled(enabled: bool) -> None:
+    global _ENABLED
+    _ENABLED = bool(enabled)
+
+
+def reset() -> None:
+    global _STARTED_AT
+    with _LOCK:
+        _STATS.clear()
+        _STARTED_AT = time.time()
+
+
+def record(kind: str, name: str, guild_id, seconds: float, failed: bool = False) -> None:
+    """Add one observation for handler ``kind:name``."""
+    key = (kind, name)
+    guild_key = str(guild_id) if guild_id else "dm"
+    with _LOCK:
+        stats = _STATS.get(key)
+        if stats is None:
+            stats = _STATS[key] = HandlerStats()
+        stats.record_guild(guild_key, seconds, failed)
+
+
+def _guild_id_from(args) -> Optional[int]:
+    for arg in args:
+        gid = getattr(arg, "guild_id", None)
+        if isinstance(gid, int):
+            return gid
+        guild = getattr(arg, "guild", None)
+        gid = getattr(guild, "id", None)
+        if isinstance(gid, int):
+            return gid
+    return None
+
+
+def _handler_name(func) -> str:
+    owner = getattr(func, "__self__", None)
+    name = getattr(func, "__name__", None) or repr(func)
+    if owner is not None:
+        cog_name = getattr(owner, "qualified_name", None) or type(owner).__name__
+        return f"{cog_name}.{name}"
+    return getattr(func, "__qualname__", name)
+
+
+def timed(name: Optional[str] = None, kind: str = "task"):
+    """Decorator timing a coroutine function as handler ``kind:name``.
+
+    The guild bucket is taken from the first argument with a ``guild`` or
+    ``guild_id`` attribute.
+    """
+
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not _ENABLED:
+                return await func(*args, **kwargs)
+            started = time.perf_counter()
+            failed = True
+            try:
+                result = await func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                record(kind, label, _guild_id_from(args), time.perf_counter() - started, failed)
+
+        return wrapper
+
+    return decorator
+
+
+# --------------------------------------------------
+# bot patching
+# --------------------------------------------------
+
+
+def install(bot) -> None:
+    """Wrap *bot*'s listener scheduling, command invoke and app command tree."""
+    if getattr(bot, "_instrumentation_installed", False):
+        return
+    bot._instrumentation_installed = True
+
+    original_schedule = bot._schedule_event
+
+    def _schedule_event(coro, event_name, *args, **kwargs):
+        if not _ENABLED:
+            return original_schedule(coro, event_name, *args, **kwargs)
+        label = f"{event_name}:{_handler_name(coro)}"
+
+        async def _timed_listener(*a, **kw):
+            started = time.perf_counter()
+            failed = True
+            try:
+                result = await coro(*a, **kw)
+                failed = False
+                return result
+            finally:
+                record("listener", label, _guild_id_from(a), time.perf_counter() - started, failed)
+
+        return original_schedule(_timed_listener, event_name, *args, **kwargs)
+
+    bot._schedule_event = _schedule_event
+
+    original_invoke = bot.invoke
+
+    async def invoke(ctx):
+        if not _ENABLED or ctx.command is None:
+            return await original_invoke(ctx)
+        started = time.perf_counter()
+        try:
+            return await original_invoke(ctx)
+        finally:
+            # Bot.invoke swallows CommandError; command_failed tells us
+            record(
+                "command",
+                ctx.command.qualified_name,
+                getattr(ctx.guild, "id", None),
+                time.perf_counter() - started,
+                bool(getattr(ctx, "command_failed", False)),
+            )
+
+    bot.invoke = invoke
+
+    tree = getattr(bot, "tree", None)
+    if tree is None:
+        return
+    original_call = tree._call
+
+    async def _call(interaction):
+        if not _ENABLED:
+            return await original_call(interaction)
+        started = time.perf_counter()
+        failed = True
+        try:
+            await original_call(interaction)
+            failed = bool(getattr(interaction, "command_failed", False))
+        finally:
+            command = getattr(interaction, "command", None)
+            name = getattr(command, "qualified_name", None) or "unknown"
+            record("app_command", name, interaction.guild_id, time.perf_counter() - started, failed)
+
+    tree._call = _call
+
+
+# --------------------------------------------------
+# export
+# --------------------------------------------------
+
+
+def snapshot(include_guilds: bool = True, limit: Optional[int] = None) -> dict:
+    """Summaries of every handler, slowest (by total time) first."""
+    with _LOCK:
+        items = list(_STATS.items())
+        handlers = []
+        for (kind, name), stats in items:
+            entry = {"kind": kind, "name": name, **stats.summary()}
+            if include_guilds:
+                entry["guilds"] = {gid: g.summary() for gid, g in stats.guilds.items()}
+            handlers.append(entry)
+    handlers.sort(key=lambda h: h["total_ms"] or 0.0, reverse=True)
+    if limit is not None and limit >= 0:
+        handlers = handlers[:limit]
+    return {"enabled": _ENABLED, "since": _STARTED_AT, "handlers": handlers}
+
+
+def _label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def render_prometheus(include_guilds: bool = False, gauges: Optional[dict] = None) -> str:
+    """Render all histograms (and optional *gauges*) in Prometheus text format."""
+    lines = [
+        "# HELP bot_handler_duration_seconds Handler latency.",
+        "# TYPE bot_handler_duration_seconds histogram",
+    ]
+    errors = [
+        "# HELP bot_handler_errors_total Handler calls that raised or failed.",
+        "# TYPE bot_handler_errors_total counter",
+    ]
+    with _LOCK:
+        items = sorted(_STATS.items())
+        for (kind, name), stats in items:
+            series = [("", stats)]
+            if include_guilds:
+                series += [(gid, g) for gid, g in sorted(stats.guilds.items())]
+            for gid, s in series:
+                labels = f'kind="{_label(kind)}",handler="{_label(name)}"'
+                if gid:
+                    labels += f',guild="{_label(gid)}"'
+                cumulative = 0
+                for bound, n in zip(BUCKETS, s.buckets):
+                    cumulative += n
+                    lines.append(f'bot_handler_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'bot_handler_duration_seconds_bucket{{{labels},le="+Inf"}} {s.count}')
+                lines.append(f"bot_handler_duration_seconds_sum{{{labels}}} {s.total:.6f}")
+                lines.append(f"bot_handler_duration_seconds_count{{{labels}}} {s.count}")
+                errors.append(f"bot_handler_errors_total{{{labels}}} {s.errors}")
+    lines.extend(errors)
+    for name, (value, help_text) in sorted((gauges or {}).items()):
+        if not isinstance(value, (int, float)):
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
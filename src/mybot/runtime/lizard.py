@@ -23,6 +23,8 @@ logging.basicConfig(
 )
 logging.getLogger("discord").setLevel(logging.WARNING)
 
+from mybot.runtime import instrumentation, loop_watchdog
+from mybot.utils.avatar_service import close_avatar_service
 from mybot.utils.env_store import ensure_env_file
 from mybot.utils.feature_flags import (
     feature_key_for_cog,
@@ -30,7 +32,10 @@ from mybot.utils.feature_flags import (
     get_all_feature_flags,
     COG_FEATURE_MAP,
 )
+from mybot.utils.feed_http import close_feed_client
 from mybot.utils.paths import REPO_ROOT, ensure_guild_configs, ensure_runtime_storage
+from mybot.utils.render_service import shutdown_render_service
+from mybot.utils.ytdl_resolver import shutdown_ytdl_resolver
 
 # ensure project root's `src` is importable (when running as module)
 _src = os.path.join(REPO_ROOT, "src")
@@ -181,6 +186,9 @@ async def _tree_feature_check(interaction: discord.Interaction) -> bool:
 
 bot.tree.interaction_check = _tree_feature_check
 
+# time every listener, command and app command (BOT_INSTRUMENTATION=0 disables)
+instrumentation.install(bot)
+
 
 # ==========================================================
 # PER-GUILD COMMAND SYNC (feature-flag aware)
@@ -430,6 +438,8 @@ async def main():
         return
 
     server_task = _start_control_api_task(bot)
+    # opt-in stall detector (LOOP_WATCHDOG=1)
+    loop_watchdog.start_from_env()
 
     try:
         async with bot:
@@ -441,6 +451,12 @@ async def main():
                 server_task.cancel()
             except Exception:
                 pass
+        if loop_watchdog.get_watchdog().running:
+            loop_watchdog.get_watchdog().stop()
+        shutdown_render_service()
+        shutdown_ytdl_resolver()
+        await close_avatar_service()
+        await close_feed_client()
 
 
 # ==========================================================
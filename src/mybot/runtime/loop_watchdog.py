@@ -0,0 +1,257 @@
+"""Opt-in event-loop stall detector with stack sampling.
+
+A heartbeat callback on the bot's event loop stamps the time every few
+milliseconds. A daemon thread watches that stamp; once it is older than the
+threshold the loop is considered blocked and the loop thread's current
+stack is sampled (repeatedly while the stall lasts). Stalls are aggregated
+by the innermost frame inside this repository, which is usually the call
+site that should move to a thread or process.
+
+Enable with ``LOOP_WATCHDOG=1`` (threshold via ``LOOP_WATCHDOG_THRESHOLD_MS``,
+default 200) or at runtime through the control API ``loop_stalls`` action.
+Each stall is appended to ``data/logs/loop_stalls.log`` and the ranked
+report is rewritten to ``data/logs/loop_stalls_report.txt``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, Optional
+
+from mybot.utils.paths import LOGS_DIR, REPO_ROOT
+
+DEFAULT_THRESHOLD_MS = 200
+HEARTBEAT_SECONDS = 0.02
+STACK_DEPTH = 15
+REPORT_INTERVAL_SECONDS = 30.0
+
+STALL_LOG_PATH = os.path.join(LOGS_DIR, "loop_stalls.log")
+REPORT_PATH = os.path.join(LOGS_DIR, "loop_stalls_report.txt")
+
+_WATCHDOG_FILE = os.path.abspath(__file__)
+
+
+def _env_enabled() -> bool:
+    return str(os.getenv("LOOP_WATCHDOG", "")).strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_threshold_ms() -> int:
+    try:
+        return max(10, int(os.getenv("LOOP_WATCHDOG_THRESHOLD_MS", DEFAULT_THRESHOLD_MS)))
+    except (TypeError, ValueError):
+        return DEFAULT_THRESHOLD_MS
+
+
+def _location_of(stack: traceback.StackSummary) -> str:
+    """Innermost frame from repo code; falls back to the innermost frame."""
+    root = os.path.abspath(REPO_ROOT)
+    for frame in reversed(stack):
+        path = os.path.abspath(frame.filename)
+        if path.startswith(root) and path != _WATCHDOG_FILE and "site-packages" not in path:
+            rel = os.path.relpath(path, root).replace(os.sep, "/")
+            return f"{rel}:{frame.lineno} ({frame.name})"
+    if stack:
+        frame = stack[-1]
+        return f"{frame.filename}:{frame.lineno} ({frame.name})"
+    return "<unknown>"
+
+
+class _Offender:
+    __slots__ = ("location", "stalls", "samples", "total", "max", "last_seen", "stack")
+
+    def __init__(self, location: str):
+        self.location = location
+        self.stalls = 0
+        self.samples = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last_seen = 0.0
+        self.stack = ""
+
+    def to_dict(self) -> dict:
+        return {
+            "location": self.location,
+            "stalls": self.stalls,
+            "samples": self.samples,
+            "total_ms": round(self.total * 1000.0, 1),
+            "max_ms": round(self.max * 1000.0, 1),
+            "last_seen": self.last_seen,
+            "stack": self.stack,
+        }
+
+
+class LoopWatchdog:
+    """Detects event-loop stalls from a helper thread and samples the stack."""
+
+    def __init__(self, threshold_ms: int = DEFAULT_THRESHOLD_MS):
+        self.threshold = max(10, int(threshold_ms)) / 1000.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._beat = time.monotonic()
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._offenders: Dict[str, _Offender] = {}
+        self._stall_count = 0
+        self._last_report = 0.0
+        self._started_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    # --------------------------------------------------
+    # lifecycle
+    # --------------------------------------------------
+
+    def start(self) -> None:
+        """Start watching the running loop. Must be called from that loop."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._started_at = time.time()
+        self._heartbeat()
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        print(f"[watchdog] loop stall detector on (threshold {int(self.threshold * 1000)} ms)")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._thread = None
+        self.write_report()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._offenders.clear()
+            self._stall_count = 0
+
+    def _heartbeat(self) -> None:
+        self._beat = time.monotonic()
+        if not self._stop.is_set() and self._loop is not None:
+            self._handle = self._loop.call_later(HEARTBEAT_SECONDS, self._heartbeat)
+
+    # --------------------------------------------------
+    # watcher thread
+    # --------------------------------------------------
+
+    def _sample_stack(self) -> Optional[traceback.StackSummary]:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return None
+        return traceback.extract_stack(frame)[-STACK_DEPTH:]
+
+    def _watch(self) -> None:
+        poll = min(self.threshold / 4.0, 0.05)
+        while not self._stop.wait(poll):
+            beat = self._beat
+            if time.monotonic() - beat < self.threshold:
+                continue
+            # stalled: sample until the loop beats again
+            samples: Dict[str, list] = {}
+            while not self._stop.is_set() and self._beat == beat:
+                stack = self._sample_stack()
+                if stack is not None:
+                    location = _location_of(stack)
+                    entry = samples.setdefault(location, [0, stack])
+                    entry[0] += 1
+                self._stop.wait(poll)
+            duration = time.monotonic() - beat
+            if samples:
+                self._record(duration, samples)
+
+    def _record(self, duration: float, samples: Dict[str, list]) -> None:
+        # the stall is charged to the location seen most often while blocked
+        location, (count, stack) = max(samples.items(), key=lambda kv: kv[1][0])
+        formatted = "".join(traceback.format_list(stack))
+        now = time.time()
+        with self._lock:
+            self._stall_count += 1
+            offender = self._offenders.get(location)
+            if offender is None:
+                offender = self._offenders[location] = _Offender(location)
+            offender.stalls += 1
+            offender.samples += sum(c for c, _s in samples.values())
+            offender.total += duration
+            offender.max = max(offender.max, duration)
+            offender.last_seen = now
+            offender.stack = formatted
+        try:
+            os.makedirs(LOGS_DIR, exist_ok=True)
+            with open(STALL_LOG_PATH, "a", encoding="utf-8") as fh:
+                stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+                fh.write(f"[{stamp}] loop blocked {duration * 1000.0:.0f} ms at {location}\n{formatted}\n")
+        except Exception:
+            pass
+        if now - self._last_report >= REPORT_INTERVAL_SECONDS:
+            self.write_report()
+
+    # --------------------------------------------------
+    # report
+    # --------------------------------------------------
+
+    def report(self, limit: Optional[int] = None, include_stacks: bool = True) -> dict:
+        with self._lock:
+            offenders = [o.to_dict() for o in self._offenders.values()]
+            stalls = self._stall_count
+        offenders.sort(key=lambda o: o["total_ms"], reverse=True)
+        if limit is not None and limit >= 0:
+            offenders = offenders[:limit]
+        if not include_stacks:
+            for o in offenders:
+                o.pop("stack", None)
+        return {
+            "running": self.running,
+            "threshold_ms": int(self.threshold * 1000),
+            "since": self._started_at,
+            "stalls": stalls,
+            "offenders": offenders,
+        }
+
+    def write_report(self) -> None:
+        self._last_report = time.time()
+        data = self.report()
+        lines = [
+            f"Loop stall report — {time.strftime('%Y-%m-%d %H:%M:%S')}",
+            f"threshold {data['threshold_ms']} ms, {data['stalls']} stall(s)",
+            "",
+        ]
+        for rank, o in enumerate(data["offenders"], start=1):
+            lines.append(
+                f"{rank:>3}. {o['total_ms']:>10.1f} ms total  {o['stalls']:>5} stalls  "
+                f"max {o['max_ms']:.1f} ms  {o['location']}"
+            )
+        try:
+            os.makedirs(LOGS_DIR, exist_ok=True)
+            with open(REPORT_PATH, "w", encoding="utf-8") as fh:
+                fh.write("\n".join(lines) + "\n")
+        except Exception:
+            pass
+
+
+_WATCHDOG: Optional[LoopWatchdog] = None
+
+
+def get_watchdog() -> LoopWatchdog:
+    """Return the process-wide watchdog (created with the env threshold)."""
+    global _WATCHDOG
+    if _WATCHDOG is None:
+        _WATCHDOG = LoopWatchdog(threshold_ms=_env_threshold_ms())
+    return _WATCHDOG
+
+
+def start_from_env() -> None:
+    """Start the watchdog if ``LOOP_WATCHDOG`` is set. Call from the bot loop."""
+    if _env_enabled():
+        get_watchdog().start()
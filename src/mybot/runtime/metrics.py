@@ -0,0 +1,204 @@
+"""Background runtime metrics sampler.
+
+A single task on the bot's event loop records one sample per interval into
+a fixed-size ring buffer. The control API serves ``status`` from the latest
+sample and ``metrics_history`` from the buffer, so dashboard refreshes never
+probe the process themselves.
+
+Each sample holds:
+    ts                  – wall-clock time of the sample
+    cpu_percent         – bot process CPU since the previous sample
+    system_cpu_percent  – host CPU since the previous sample
+    memory_rss_mb       – resident set size of the bot process
+    loop_lag_ms         – how late the sampler's own sleep woke up
+    gateway_ping_ms     – discord.py heartbeat latency
+    guild_count         – guilds in the cache
+    member_count        – sum of ``member_count`` over those guilds
+    queues              – depth of every registered queue
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import os
+import time
+from typing import Callable, Dict, Optional
+
+try:
+    import psutil  # type: ignore
+except Exception:
+    psutil = None
+
+SAMPLE_INTERVAL_SECONDS = 1.0
+HISTORY_SIZE = 600  # ten minutes at the default interval
+
+SERIES_FIELDS = (
+    "cpu_percent",
+    "system_cpu_percent",
+    "memory_rss_mb",
+    "loop_lag_ms",
+    "gateway_ping_ms",
+    "guild_count",
+    "member_count",
+)
+
+
+def _music_queue_depth(bot) -> int:
+    cog = bot.get_cog("Music") if hasattr(bot, "get_cog") else None
+    queues = getattr(cog, "queues", None) or {}
+    return sum(len(q) for q in queues.values())
+
+
+def _render_queue_depth(bot) -> int:
+    from mybot.utils.render_service import get_render_service
+
+    return get_render_service().pending
+
+
+def _event_buffer_depth(bot) -> int:
+    from mybot.runtime.event_stream import get_hub
+
+    return get_hub().buffered_events()
+
+
+class MetricsSampler:
+    """Samples process and bot metrics into a ring buffer."""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL_SECONDS, history_size: int = HISTORY_SIZE):
+        self.interval = float(interval)
+        self._samples: collections.deque = collections.deque(maxlen=int(history_size))
+        self._queues: Dict[str, Callable[[object], int]] = {
+            "music": _music_queue_depth,
+            "event_buffers": _event_buffer_depth,
+            "render": _render_queue_depth,
+        }
+        self._bot = None
+        self._task: Optional[asyncio.Task] = None
+        self._proc = None
+        if psutil is not None:
+            try:
+                self._proc = psutil.Process(os.getpid())
+                # prime the counters; the first real sample then covers one interval
+                self._proc.cpu_percent(interval=None)
+                psutil.cpu_percent(interval=None)
+            except Exception:
+                self._proc = None
+
+    # --------------------------------------------------
+    # queue registry
+    # --------------------------------------------------
+
+    def register_queue(self, name: str, depth: Callable[[object], int]) -> None:
+        """Report ``depth(bot)`` as ``queues[name]`` in every sample."""
+        self._queues[str(name)] = depth
+
+    def unregister_queue(self, name: str) -> None:
+        self._queues.pop(str(name), None)
+
+    # --------------------------------------------------
+    # sampling
+    # --------------------------------------------------
+
+    def start(self, bot) -> None:
+        """Start sampling *bot*. Must be called from the bot's event loop."""
+        self._bot = bot
+        if self._task is not None and not self._task.done():
+            return
+        if not self._samples:
+            self._samples.append(self._sample(loop_lag_ms=0.0))
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (loop.time() - started - self.interval) * 1000.0)
+            try:
+                self._samples.append(self._sample(loop_lag_ms=lag_ms))
+            except Exception as e:
+                print(f"[metrics] sample failed: {e}")
+
+    def _sample(self, loop_lag_ms: float) -> dict:
+        bot = self._bot
+        sample = {
+            "ts": time.time(),
+            "cpu_percent": None,
+            "system_cpu_percent": None,
+            "memory_rss_mb": None,
+            "loop_lag_ms": round(loop_lag_ms, 2),
+            "gateway_ping_ms": None,
+            "guild_count": None,
+            "member_count": None,
+            "queues": {},
+        }
+        if self._proc is not None:
+            try:
+                sample["cpu_percent"] = float(self._proc.cpu_percent(interval=None))
+                sample["memory_rss_mb"] = round(float(self._proc.memory_info().rss) / (1024.0 * 1024.0), 2)
+                sample["system_cpu_percent"] = float(psutil.cpu_percent(interval=None))
+            except Exception:
+                pass
+        if bot is None:
+            return sample
+
+        try:
+            latency = getattr(bot, "latency", None)
+            if isinstance(latency, (int, float)) and latency == latency and latency != float("inf"):
+                sample["gateway_ping_ms"] = int(max(0, latency * 1000.0))
+        except Exception:
+            pass
+        try:
+            guilds = list(getattr(bot, "guilds", []) or [])
+            sample["guild_count"] = len(guilds)
+            sample["member_count"] = sum(int(getattr(g, "member_count", 0) or 0) for g in guilds)
+        except Exception:
+            pass
+        for name, depth in list(self._queues.items()):
+            try:
+                sample["queues"][name] = int(depth(bot))
+            except Exception:
+                sample["queues"][name] = None
+        return sample
+
+    # --------------------------------------------------
+    # readers
+    # --------------------------------------------------
+
+    def latest(self) -> Optional[dict]:
+        return dict(self._samples[-1]) if self._samples else None
+
+    def history(self, since: Optional[float] = None, limit: Optional[int] = None) -> list:
+        samples = list(self._samples)
+        if since is not None:
+            samples = [s for s in samples if s["ts"] > since]
+        if limit is not None and limit >= 0:
+            samples = samples[-limit:] if limit else []
+        return samples
+
+    def series(self, since: Optional[float] = None, limit: Optional[int] = None) -> dict:
+        """Column-oriented view of :meth:`history` (one list per field)."""
+        samples = self.history(since=since, limit=limit)
+        out = {"ts": [s["ts"] for s in samples]}
+        for field in SERIES_FIELDS:
+            out[field] = [s.get(field) for s in samples]
+        names = sorted({name for s in samples for name in (s.get("queues") or {})})
+        out["queues"] = {name: [(s.get("queues") or {}).get(name) for s in samples] for name in names}
+        return out
+
+
+_SAMPLER: Optional[MetricsSampler] = None
+
+
+def get_sampler() -> MetricsSampler:
+    """Return the process-wide metrics sampler."""
+    global _SAMPLER
+    if _SAMPLER is None:
+        _SAMPLER = MetricsSampler()
+    return _SAMPLER
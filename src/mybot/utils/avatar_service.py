@@ -0,0 +1,236 @@
+"""Shared avatar downloads for image features (rank cards, welcome banners).
+
+``await get_avatar_service().fetch(member.display_avatar, size)`` returns the
+avatar bytes in the smallest Discord CDN variant that is at least *size*
+pixels. All downloads share one pooled ``aiohttp`` session. Results are
+kept in an in-memory LRU and, when ``AVATAR_DISK_CACHE=1``, under
+``data/cache/avatars``. Entries are keyed by the avatar hash, so an
+unchanged avatar is never fetched twice and a changed one gets a new key.
+Concurrent requests for the same avatar share one download, and failures
+are remembered for a short time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import hashlib
+import os
+import time
+from typing import Dict, Optional
+
+import aiohttp
+
+from mybot.utils.paths import DATA_DIR
+
+AVATAR_CACHE_DIR = os.path.join(DATA_DIR, "cache", "avatars")
+
+MEMORY_BUDGET_BYTES = 32 * 1024 * 1024
+NEGATIVE_TTL_SECONDS = 300.0
+MAX_NEGATIVE_ENTRIES = 1024
+REQUEST_TIMEOUT_SECONDS = 8.0
+MAX_CONNECTIONS = 16
+
+# Discord CDN only serves power-of-two sizes in this range.
+_MIN_SIZE = 16
+_MAX_SIZE = 4096
+
+
+def cdn_size(pixels: int) -> int:
+    """Smallest valid CDN ``size=`` that is at least *pixels*."""
+    try:
+        wanted = max(_MIN_SIZE, min(_MAX_SIZE, int(pixels)))
+    except (TypeError, ValueError):
+        wanted = 512
+    size = _MIN_SIZE
+    while size < wanted:
+        size *= 2
+    return size
+
+
+class AvatarService:
+    """Pooled, cached and coalesced avatar downloader."""
+
+    def __init__(self, disk_cache: Optional[bool] = None, memory_budget: int = MEMORY_BUDGET_BYTES):
+        if disk_cache is None:
+            disk_cache = str(os.getenv("AVATAR_DISK_CACHE", "")).strip().lower() in ("1", "true", "yes", "on")
+        self.disk_cache = bool(disk_cache)
+        self.memory_budget = int(memory_budget)
+        self._memory: "collections.OrderedDict[str, bytes]" = collections.OrderedDict()
+        self._memory_bytes = 0
+        self._negative: Dict[str, float] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._stats = collections.Counter()
+
+    # --------------------------------------------------
+    # keys
+    # --------------------------------------------------
+
+    @staticmethod
+    def _variant(asset, size: int):
+        """Return ``(cache_key, url)`` for *asset* at CDN *size*."""
+        size = cdn_size(size)
+        avatar_hash = getattr(asset, "key", None)
+        if avatar_hash and hasattr(asset, "with_size"):
+            try:
+                variant = asset.with_static_format("png").with_size(size)
+                return f"{avatar_hash}_{size}", str(variant.url)
+            except Exception:
+                pass
+        # plain objects with only ``url`` (UI previews) or raw URL strings
+        url = str(getattr(asset, "url", asset) or "")
+        return hashlib.sha1(url.encode()).hexdigest(), url
+
+    def _disk_path(self, key: str) -> str:
+        safe = "".join(ch for ch in key if ch.isalnum() or ch in "_-")
+        return os.path.join(AVATAR_CACHE_DIR, f"{safe}.img")
+
+    # --------------------------------------------------
+    # cache layers
+    # --------------------------------------------------
+
+    def _remember(self, key: str, data: bytes) -> None:
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.memory_budget and len(self._memory) > 1:
+            _key, dropped = self._memory.popitem(last=False)
+            self._memory_bytes -= len(dropped)
+
+    def _remember_failure(self, key: str) -> None:
+        now = time.monotonic()
+        self._negative.pop(key, None)
+        self._negative[key] = now + NEGATIVE_TTL_SECONDS
+        # same TTL for every entry, so insertion order is expiry order
+        while self._negative:
+            oldest_key, expires = next(iter(self._negative.items()))
+            if expires > now and len(self._negative) <= MAX_NEGATIVE_ENTRIES:
+                break
+            self._negative.pop(oldest_key)
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._disk_path(key), "rb") as fh:
+                return fh.read()
+        except OSError:
+            return None
+
+    def _write_disk(self, key: str, data: bytes) -> None:
+        try:
+            os.makedirs(AVATAR_CACHE_DIR, exist_ok=True)
+            tmp = self._disk_path(key) + ".tmp"
+            with open(tmp, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, self._disk_path(key))
+        except OSError:
+            pass
+
+    # --------------------------------------------------
+    # fetching
+    # --------------------------------------------------
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS),
+                connector=aiohttp.TCPConnector(limit=MAX_CONNECTIONS),
+            )
+        return self._session
+
+    async def fetch(self, asset, size: int = 512) -> Optional[bytes]:
+        """Return avatar bytes for *asset* (``discord.Asset`` or URL), or None."""
+        if asset is None:
+            return None
+        key, url = self._variant(asset, size)
+        if not url:
+            return None
+
+        data = self._memory.get(key)
+        if data is not None:
+            self._memory.move_to_end(key)
+            self._stats["memory_hits"] += 1
+            return data
+
+        expires = self._negative.get(key)
+        if expires is not None:
+            if expires > time.monotonic():
+                self._stats["negative_hits"] += 1
+                return None
+            self._negative.pop(key, None)
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self._stats["coalesced"] += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            data = await self._load(key, url)
+            future.set_result(data)
+            return data
+        except Exception:
+            future.set_result(None)
+            return None
+        finally:
+            # also reached on cancellation; waiters must not hang on the future
+            if not future.done():
+                future.set_result(None)
+            self._inflight.pop(key, None)
+
+    async def _load(self, key: str, url: str) -> Optional[bytes]:
+        if self.disk_cache:
+            data = await asyncio.to_thread(self._read_disk, key)
+            if data:
+                self._stats["disk_hits"] += 1
+                self._remember(key, data)
+                return data
+
+        self._stats["downloads"] += 1
+        try:
+            async with self._get_session().get(url) as resp:
+                if resp.status != 200:
+                    raise aiohttp.ClientResponseError(resp.request_info, resp.history, status=resp.status)
+                data = await resp.read()
+        except Exception:
+            self._stats["errors"] += 1
+            self._remember_failure(key)
+            return None
+
+        self._remember(key, data)
+        if self.disk_cache:
+            await asyncio.to_thread(self._write_disk, key, data)
+        return data
+
+    def stats(self) -> dict:
+        return {
+            **dict(self._stats),
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "negative_entries": len(self._negative),
+            "disk_cache": self.disk_cache,
+        }
+
+    async def close(self) -> None:
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
+
+
+_SERVICE: Optional[AvatarService] = None
+
+
+def get_avatar_service() -> AvatarService:
+    """Return the process-wide avatar service."""
+    global _SERVICE
+    if _SERVICE is None:
+        _SERVICE = AvatarService()
+    return _SERVICE
+
+
+async def close_avatar_service() -> None:
+    if _SERVICE is not None:
+        await _SERVICE.close()
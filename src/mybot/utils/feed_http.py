@@ -0,0 +1,432 @@
+"""Shared HTTP client for polled feeds (social media, free-stuff sources).
+
+All feed requests go through one pooled ``aiohttp`` session. Each host gets
+its own concurrency semaphore and token bucket, so feeds can be fetched in
+parallel without hammering a single site. Requests time out individually
+and are retried with exponential backoff and full jitter on connection
+errors, ``429`` (honouring ``Retry-After``) and ``5xx`` responses.
+
+:meth:`FeedClient.get_parsed` adds conditional requests on top: the
+``ETag``/``Last-Modified`` validators and the parsed result of every URL are
+kept in ``data/cache/feed_validators.json``. The next request sends
+``If-None-Match``/``If-Modified-Since``; a ``304`` or a body with the same
+SHA-1 as last time returns the stored result without parsing. Both cases
+are counted as "unchanged" per source in :meth:`FeedClient.stats`.
+:meth:`FeedClient.get_streamed` does the same but feeds the body chunk by
+chunk to an incremental parser (:mod:`mybot.utils.feed_parsers`) and stops
+reading once the parser has enough. Its hash covers the bytes the parser
+needed last time; those are checked before any parsing.
+
+Environment:
+    FEED_HOST_CONCURRENCY  parallel requests per host (default 4)
+    FEED_HOST_RATE         sustained requests/second per host (default 2)
+    FEED_TIMEOUT           seconds per request attempt (default 15)
+    FEED_RETRIES           extra attempts after a failure (default 2)
+    FEED_HOST_LIMITS       per-host overrides, ``host=concurrency/rate,...``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import hashlib
+import json
+import os
+import random
+import time
+from typing import Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+from multidict import CIMultiDict
+
+from mybot.utils.jsonstore import DebouncedJsonFile
+from mybot.utils.paths import DATA_DIR
+
+VALIDATOR_CACHE_PATH = os.path.join(DATA_DIR, "cache", "feed_validators.json")
+MAX_VALIDATOR_ENTRIES = 2000
+VALIDATOR_SAVE_DELAY_SECONDS = 10.0
+STREAM_CHUNK_SIZE = 16 * 1024
+
+MAX_CONNECTIONS = 32
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RATE = 2.0
+DEFAULT_TIMEOUT_SECONDS = 15.0
+DEFAULT_RETRIES = 2
+BACKOFF_BASE_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 30.0
+
+# Scraped profile pages throttle aggressively; keep these polite by default.
+HOST_LIMITS: Dict[str, Tuple[int, float]] = {
+    "www.tiktok.com": (2, 0.5),
+    "www.instagram.com": (1, 0.25),
+}
+
+
+def _env_number(name: str, default, cast=float):
+    try:
+        return cast(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _parse_host_limits(raw: str) -> Dict[str, Tuple[int, float]]:
+    limits = {}
+    for part in str(raw or "").split(","):
+        host, _, spec = part.strip().partition("=")
+        concurrency, _, rate = spec.partition("/")
+        try:
+            limits[host.strip().lower()] = (max(1, int(concurrency)), max(0.01, float(rate or DEFAULT_RATE)))
+        except ValueError:
+            continue
+    return limits
+
+
+class TokenBucket:
+    """Allows *rate* acquisitions per second with bursts up to *burst*."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return
+            await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+
+async def _read_streamed(resp: aiohttp.ClientResponse, make_parser, known: Optional[dict]) -> dict:
+    """Read *resp* in chunks, parsing only when it differs from *known*.
+
+    *known* is the validator entry of the last streamed read: the parser
+    then needed its first ``size`` bytes (all of them unless ``stopped``).
+    The same bytes give the same result, so chunks are held back until that
+    prefix has been hashed; on a match reading stops without parsing.
+    Otherwise the held chunks and the rest of the body go to the parser,
+    which stops reading once it has enough.
+    """
+    check_at = int(known["size"]) if known else 0
+    prefix_only = bool(known and known.get("stopped"))
+    digest = hashlib.sha1()
+    held = []
+    parser = None if known else make_parser()
+    size = 0
+    stopped = False
+
+    def start_parser():
+        nonlocal parser
+        parser = make_parser()
+        for part in held:
+            if parser.feed(part):
+                return True
+        return False
+
+    async for chunk in resp.content.iter_chunked(STREAM_CHUNK_SIZE):
+        if parser is None and prefix_only and size + len(chunk) >= check_at:
+            cut = check_at - size
+            digest.update(chunk[:cut])
+            if digest.copy().hexdigest() == known["hash"]:
+                return {"unchanged": True, "hash": known["hash"], "size": check_at, "stopped": True, "data": None}
+            digest.update(chunk[cut:])
+            size += len(chunk)
+            held.append(chunk)
+            if start_parser():
+                stopped = True
+                break
+            held.clear()
+            continue
+        digest.update(chunk)
+        size += len(chunk)
+        if parser is None:
+            held.append(chunk)
+            if size > check_at:
+                # longer than the body the parser read whole last time
+                if start_parser():
+                    stopped = True
+                    break
+                held.clear()
+        elif parser.feed(chunk):
+            stopped = True
+            break
+
+    result = {"unchanged": False, "hash": digest.hexdigest(), "size": size, "stopped": stopped}
+    if parser is None:
+        if digest.hexdigest() == known["hash"] and size == check_at:
+            return {**result, "unchanged": True, "data": None}
+        start_parser()
+    result["data"] = parser.close()
+    return result
+
+
+class FeedResponse(NamedTuple):
+    status: int
+    headers: CIMultiDict
+    body: bytes
+    url: str
+
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.body or b"null")
+
+
+class ValidatorStore:
+    """Persistent ``url -> {etag, last_modified, hash, data}`` map."""
+
+    def __init__(self, path: str = VALIDATOR_CACHE_PATH):
+        self.path = path
+        self._file = DebouncedJsonFile(path, VALIDATOR_SAVE_DELAY_SECONDS, label="feeds")
+
+    async def get(self, url: str) -> Optional[dict]:
+        return (await self._file.load()).get(url)
+
+    async def put(self, url: str, entry: dict) -> None:
+        entries = await self._file.load()
+        entries.pop(url, None)
+        entries[url] = entry
+        while len(entries) > MAX_VALIDATOR_ENTRIES:
+            entries.pop(next(iter(entries)))
+        self._file.schedule_save()
+
+    async def save(self) -> None:
+        """Write pending changes now (used on shutdown)."""
+        await self._file.flush()
+
+
+class _Host:
+    def __init__(self, concurrency: int, rate: float):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.bucket = TokenBucket(rate, burst=max(1, concurrency))
+        self.stats = collections.Counter()
+        self.seconds = 0.0
+
+
+class FeedClient:
+    """Pooled, per-host rate-limited GET client with retries."""
+
+    def __init__(self):
+        self.concurrency = max(1, _env_number("FEED_HOST_CONCURRENCY", DEFAULT_CONCURRENCY, int))
+        self.rate = max(0.01, _env_number("FEED_HOST_RATE", DEFAULT_RATE))
+        self.timeout = max(1.0, _env_number("FEED_TIMEOUT", DEFAULT_TIMEOUT_SECONDS))
+        self.retries = max(0, _env_number("FEED_RETRIES", DEFAULT_RETRIES, int))
+        self.host_limits = {**HOST_LIMITS, **_parse_host_limits(os.getenv("FEED_HOST_LIMITS", ""))}
+        self._hosts: Dict[str, _Host] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.validators = ValidatorStore()
+        self._sources: Dict[str, collections.Counter] = {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=MAX_CONNECTIONS, ttl_dns_cache=300),
+            )
+        return self._session
+
+    def _host(self, host: str) -> _Host:
+        entry = self._hosts.get(host)
+        if entry is None:
+            concurrency, rate = self.host_limits.get(host, (self.concurrency, self.rate))
+            entry = self._hosts[host] = _Host(concurrency, rate)
+        return entry
+
+    @staticmethod
+    def _backoff(attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(MAX_BACKOFF_SECONDS, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        # full jitter: anywhere between 0 and the exponential ceiling
+        return random.uniform(0, min(MAX_BACKOFF_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+    async def get(
+        self,
+        url: str,
+        headers: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        retries: Optional[int] = None,
+        reader: Optional[Callable[[aiohttp.ClientResponse], Awaitable[bytes]]] = None,
+    ) -> Optional[FeedResponse]:
+        """GET *url*; returns the final response (any status) or None on errors.
+
+        *reader* consumes the body of ``200`` responses instead of reading it
+        whole; whatever it returns becomes ``FeedResponse.body``.
+        """
+        host_name = (urlsplit(url).hostname or "").lower()
+        host = self._host(host_name)
+        attempts = 1 + (self.retries if retries is None else max(0, int(retries)))
+        client_timeout = aiohttp.ClientTimeout(total=timeout or self.timeout)
+
+        for attempt in range(attempts):
+            retry_after = None
+            async with host.semaphore:
+                await host.bucket.acquire()
+                host.stats["requests"] += 1
+                started = time.perf_counter()
+                try:
+                    async with self._get_session().get(
+                        url, headers=headers, timeout=client_timeout, allow_redirects=True
+                    ) as resp:
+                        if reader is not None and resp.status == 200:
+                            body = await reader(resp)
+                        else:
+                            body = await resp.read()
+                        result = FeedResponse(resp.status, CIMultiDict(resp.headers), body, str(resp.url))
+                except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                    result = None
+                    error = exc
+                finally:
+                    host.seconds += time.perf_counter() - started
+
+            if result is not None and result.status != 429 and result.status < 500:
+                host.stats[f"status_{result.status}"] += 1
+                return result
+            if result is not None:
+                host.stats[f"status_{result.status}"] += 1
+                retry_after = result.headers.get("Retry-After")
+            else:
+                host.stats["errors"] += 1
+            if attempt + 1 >= attempts:
+                if result is None:
+                    print(f"[feeds] GET {url} failed: {error}")
+                return result
+            host.stats["retries"] += 1
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+        return None
+
+    async def get_parsed(
+        self,
+        url: str,
+        parse: Callable[[FeedResponse], object],
+        source: str,
+        headers: Optional[dict] = None,
+        timeout: Optional[float] = None,
+    ):
+        """Conditional GET of *url* returning ``parse(response)``.
+
+        Returns the stored result (without calling *parse*) when the server
+        answers ``304`` or the body hash is unchanged; None on errors or
+        non-200 responses. *parse* must return JSON-serialisable data.
+        """
+        return await self._get_conditional(url, source, headers, timeout, parse=parse)
+
+    async def get_streamed(
+        self,
+        url: str,
+        make_parser: Callable[[], object],
+        source: str,
+        headers: Optional[dict] = None,
+        timeout: Optional[float] = None,
+    ):
+        """Conditional GET of *url* parsed incrementally by ``make_parser()``.
+
+        The parser's ``feed(chunk)`` returns True once it has enough, which
+        stops reading the body; ``close()`` returns the JSON-serialisable
+        result. Otherwise behaves like :meth:`get_parsed`.
+        """
+        return await self._get_conditional(url, source, headers, timeout, make_parser=make_parser)
+
+    async def _get_conditional(self, url, source, headers, timeout, parse=None, make_parser=None):
+        counters = self._sources.setdefault(source, collections.Counter())
+        counters["requests"] += 1
+        entry = await self.validators.get(url)
+        request_headers = dict(headers or {})
+        if entry is not None and "data" in entry:
+            if entry.get("etag"):
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        streamed: dict = {}
+        reader = None
+        if make_parser is not None:
+            known = entry if entry is not None and "data" in entry and entry.get("size") else None
+
+            async def reader(resp: aiohttp.ClientResponse) -> bytes:
+                streamed.clear()
+                streamed.update(await _read_streamed(resp, make_parser, known))
+                return b""
+
+        resp = await self.get(url, headers=request_headers, timeout=timeout, reader=reader)
+        if resp is None:
+            counters["errors"] += 1
+            return None
+        if resp.status == 304 and entry is not None and "data" in entry:
+            counters["unchanged"] += 1
+            counters["not_modified"] += 1
+            return entry["data"]
+        if resp.status != 200:
+            counters["errors"] += 1
+            return None
+
+        extra = {}
+        if reader is not None:
+            digest = streamed["hash"]
+            counters["bytes_read"] += streamed["size"]
+            counters["stopped_early"] += int(streamed["stopped"])
+            extra = {"size": streamed["size"], "stopped": streamed["stopped"]}
+            unchanged = streamed["unchanged"]
+        else:
+            digest = hashlib.sha1(resp.body).hexdigest()
+            counters["bytes_read"] += len(resp.body)
+            unchanged = entry is not None and "data" in entry and entry.get("hash") == digest
+        if unchanged:
+            counters["unchanged"] += 1
+            counters["same_hash"] += 1
+            data = entry["data"]
+        else:
+            data = streamed["data"] if reader is not None else parse(resp)
+            counters["parsed"] += 1
+        await self.validators.put(url, {
+            "etag": resp.headers.get("ETag", ""),
+            "last_modified": resp.headers.get("Last-Modified", ""),
+            "hash": digest,
+            "data": data,
+            **extra,
+        })
+        return data
+
+    def stats(self) -> dict:
+        hosts = {}
+        for name, host in self._hosts.items():
+            requests = host.stats.get("requests", 0)
+            hosts[name] = {
+                **dict(host.stats),
+                "avg_ms": round(host.seconds / requests * 1000, 1) if requests else 0.0,
+            }
+        return {
+            "concurrency": self.concurrency,
+            "rate": self.rate,
+            "hosts": hosts,
+            "sources": {name: dict(counters) for name, counters in self._sources.items()},
+        }
+
+    async def close(self) -> None:
+        await self.validators.save()
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
+
+
+_CLIENT: Optional[FeedClient] = None
+
+
+def get_feed_client() -> FeedClient:
+    """Return the process-wide feed client."""
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = FeedClient()
+    return _CLIENT
+
+
+async def close_feed_client() -> None:
+    if _CLIENT is not None:
+        await _CLIENT.close()
@@ -0,0 +1,72 @@
+"""Incremental parsers for polled feed bodies.
+
+:meth:`mybot.utils.feed_http.FeedClient.get_streamed` feeds response bodies
+to these parsers chunk by chunk. ``feed(chunk)`` returns True as soon as a
+parser has what it needs, and the client stops reading the body at that
+point. ``close()`` returns the result:
+
+    PatternScanner   first *limit* distinct ``group(1)`` matches of a regex,
+                     run over raw bytes (scraped HTML pages)
+
+Small feeds (YouTube's Atom feeds) are cheaper to parse whole and go
+through :meth:`~mybot.utils.feed_http.FeedClient.get_parsed` instead.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Callable, List, Optional
+
+
+class PatternScanner:
+    """Collects distinct ``group(1)`` matches of *pattern* from a byte stream.
+
+    Matches may straddle chunk boundaries: the last *overlap* bytes of each
+    chunk are scanned again with the next one, and a match touching the end
+    of the buffer is only accepted once more data (or ``close()``) shows it
+    is complete.
+    """
+
+    def __init__(
+        self,
+        pattern: str,
+        limit: int,
+        flags: int = 0,
+        overlap: int = 512,
+        build: Optional[Callable[[List[str]], object]] = None,
+    ):
+        self.regex = re.compile(pattern.encode("utf-8"), flags)
+        self.limit = max(1, int(limit))
+        self.overlap = max(1, int(overlap))
+        self.build = build
+        self.matches: List[str] = []
+        self.done = False
+        self._seen: set = set()
+        self._tail = b""
+
+    def _scan(self, buffer: bytes, final: bool) -> None:
+        for match in self.regex.finditer(buffer):
+            if not final and match.end() >= len(buffer):
+                break
+            value = match.group(1).decode("utf-8", errors="replace")
+            if value in self._seen:
+                continue
+            self._seen.add(value)
+            self.matches.append(value)
+            if len(self.matches) >= self.limit:
+                self.done = True
+                return
+
+    def feed(self, chunk: bytes) -> bool:
+        if self.done:
+            return True
+        buffer = self._tail + chunk
+        self._scan(buffer, final=False)
+        self._tail = buffer[-self.overlap:]
+        return self.done
+
+    def close(self):
+        if not self.done and self._tail:
+            self._scan(self._tail, final=True)
+        self._tail = b""
+        return self.build(self.matches) if self.build else self.matches
@@ -0,0 +1,67 @@
+"""Configurable output encoding for generated images.
+
+Guild configs (``rank.json``, welcome config) may set:
+    IMAGE_FORMAT        – ``png`` (default), ``png_palette`` (256-colour
+                          optimized PNG), ``webp`` or ``jpeg``
+    PNG_COMPRESS_LEVEL  – zlib level 0-9 for PNG output (default 6)
+    IMAGE_QUALITY       – 1-100 for WebP/JPEG output (default 85)
+
+``encoding_from_config`` normalizes those keys into a small picklable dict
+that the render service passes to its workers; ``encode_image`` turns a
+composed PIL image into bytes with it.
+"""
+
+from __future__ import annotations
+
+import io
+
+from PIL import Image
+
+FORMATS = ("png", "png_palette", "webp", "jpeg")
+EXTENSIONS = {"png": "png", "png_palette": "png", "webp": "webp", "jpeg": "jpg"}
+
+DEFAULT_ENCODING = {"format": "png", "compress_level": 6, "quality": 85}
+
+
+def _clamp(value, minimum: int, maximum: int, default: int) -> int:
+    try:
+        return max(minimum, min(maximum, int(value)))
+    except Exception:
+        return default
+
+
+def encoding_from_config(cfg: dict | None) -> dict:
+    """Normalized encoding options from a guild config dict."""
+    cfg = cfg or {}
+    fmt = str(cfg.get("IMAGE_FORMAT", "png") or "png").strip().lower()
+    if fmt == "jpg":
+        fmt = "jpeg"
+    if fmt not in FORMATS:
+        fmt = "png"
+    return {
+        "format": fmt,
+        "compress_level": _clamp(cfg.get("PNG_COMPRESS_LEVEL", 6), 0, 9, 6),
+        "quality": _clamp(cfg.get("IMAGE_QUALITY", 85), 1, 100, 85),
+    }
+
+
+def extension(encoding: dict | None) -> str:
+    """File extension for attachments encoded with *encoding*."""
+    return EXTENSIONS.get((encoding or DEFAULT_ENCODING).get("format", "png"), "png")
+
+
+def encode_image(image: Image.Image, encoding: dict | None = None) -> bytes:
+    """Encode *image* with the given options."""
+    enc = {**DEFAULT_ENCODING, **(encoding or {})}
+    fmt = enc["format"]
+    buffer = io.BytesIO()
+    if fmt == "jpeg":
+        image.convert("RGB").save(buffer, "JPEG", quality=enc["quality"], optimize=True)
+    elif fmt == "webp":
+        image.save(buffer, "WEBP", quality=enc["quality"], method=4)
+    elif fmt == "png_palette":
+        quantized = image.convert("RGB").quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+        quantized.save(buffer, "PNG", optimize=True)
+    else:
+        image.save(buffer, "PNG", compress_level=enc["compress_level"])
+    return buffer.getvalue()
@@ -1,10 +1,11 @@
 """Thread-safe JSON storage utilities with atomic writes and corruption recovery."""
 
+import asyncio
 import json
 import os
 import tempfile
 import time
-from typing import Any
+from typing import Any, Callable, Dict, Optional
 
 
 def ensure_dir(path: str) -> None:
@@ -62,3 +63,81 @@ def safe_save_json(path: str, data: Any) -> None:
             except OSError:
                 pass
         raise
+
+
+class DebouncedJsonFile:
+    """A JSON object file kept in memory and written back lazily.
+
+    ``await load()`` reads the file once in a worker thread; ``data`` is the
+    loaded dict. ``schedule_save()`` writes it *delay* seconds later, and
+    ``await flush()`` writes pending changes now. Serialisation and the atomic
+    write run in the default executor on a shallow copy, so values must be
+    replaced, not mutated in place. *prepare* may trim that copy first (e.g.
+    drop expired entries).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        delay: float = 10.0,
+        label: str = "cache",
+        prepare: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+    ):
+        self.path = path
+        self.delay = float(delay)
+        self.label = label
+        self.prepare = prepare
+        self.data: Optional[Dict[str, Any]] = None
+        self._loading: Optional[asyncio.Future] = None
+        self._save_handle: Optional[asyncio.TimerHandle] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._dirty = False
+
+    async def load(self) -> Dict[str, Any]:
+        if self.data is None:
+            if self._loading is None:
+                self._loading = asyncio.ensure_future(asyncio.to_thread(self._read))
+            data = await asyncio.shield(self._loading)
+            if self.data is None:
+                self.data = data
+        return self.data
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+            return data if isinstance(data, dict) else {}
+        except Exception:
+            return {}
+
+    def schedule_save(self) -> None:
+        self._dirty = True
+        if self._save_handle is None:
+            loop = asyncio.get_running_loop()
+            self._save_handle = loop.call_later(self.delay, lambda: asyncio.ensure_future(self.flush()))
+
+    async def flush(self) -> None:
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+        if self.data is None or not self._dirty:
+            return
+        self._dirty = False
+        snapshot = dict(self.data)
+        if self._write_lock is None:
+            self._write_lock = asyncio.Lock()
+        async with self._write_lock:
+            await asyncio.to_thread(self._write, snapshot)
+
+    def _write(self, snapshot: Dict[str, Any]) -> None:
+        try:
+            if self.prepare is not None:
+                snapshot = self.prepare(snapshot)
+            text = json.dumps(snapshot, ensure_ascii=False)
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                fh.write(text)
+            os.replace(tmp, self.path)
+        except (OSError, TypeError, ValueError) as exc:
+            print(f"[{self.label}] Could not save {os.path.basename(self.path)}: {exc}")
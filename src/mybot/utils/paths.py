@@ -106,6 +106,10 @@ _CONFIG_DEFAULTS: dict[str, dict] = {
         "ALIGN": "",
         "OPACITY": 0,
         "OVERLAY_TEXT": False,
+        "BURST_THRESHOLD": 0,
+        "BURST_WINDOW": 0,
+        "BURST_MODE": "",
+        "BURST_GROUP_DELAY": 0,
     },
     "autorole.json": {
         "VERIFY_CHANNEL_ID": 0,
@@ -296,8 +300,6 @@ _DATA_DEFAULTS: dict[str, dict] = {
     },
     "birthdays_data.json": {},
     "birthdays_sent.json": {},
-    "freestuff_data.json": {"posted": []},
-    "social_media_data.json": {"twitch": [], "youtube": [], "twitter": [], "tiktok": [], "custom": []},
 }
 
 # Combined for convenience
@@ -0,0 +1,410 @@
+"""Off-loop image rendering for rank cards and welcome banners.
+
+``await get_render_service().render(kind, params, encoding=...)`` runs the
+renderer registered for *kind* in a process pool, encodes the image with
+the given options (see ``mybot.utils.image_encoding``) and returns the
+bytes. Finished images are kept in a size-bounded result cache, so a
+repeated request with unchanged params, assets and encoding returns at
+once. Identical concurrent requests share one render, the number of
+waiting renders is bounded, and every kind keeps compose/encode timing
+and output size stats.
+
+Configuration (environment):
+    RENDER_WORKERS      – worker processes (default: min(2, CPUs));
+                          ``0`` renders in a thread instead
+    RENDER_QUEUE_SIZE   – renders queued or running before new ones are
+                          rejected (default 32)
+    RENDER_TIMEOUT      – seconds to wait for a render (default 20)
+    RENDER_CACHE_MB     – result cache budget in MiB (default 32, ``0`` off)
+    RENDER_CACHE_TTL    – seconds a cached result stays valid (default 600)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import concurrent.futures
+import hashlib
+import importlib
+import os
+import time
+from typing import Dict, Optional
+
+from mybot.utils.image_encoding import DEFAULT_ENCODING, encode_image
+from mybot.utils.paths import REPO_ROOT
+
+# kind -> "module:function"; renderers take keyword params and return the
+# composed PIL image when called with ``encode=False``
+RENDERERS = {
+    "rankcard": "mybot.cogs.leveling.rank:render_rankcard",
+    "welcome_banner": "mybot.cogs.welcome.welcome:render_welcome_banner",
+}
+
+
+class RenderError(RuntimeError):
+    """Base class for render service failures."""
+
+
+class RenderQueueFull(RenderError):
+    """Raised when too many renders are already queued."""
+
+
+class RenderTimeout(RenderError):
+    """Raised when a render does not finish within the timeout."""
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+_RENDERER_CACHE: dict = {}
+
+
+def _resolve(kind: str):
+    func = _RENDERER_CACHE.get(kind)
+    if func is None:
+        target = RENDERERS.get(kind)
+        if target is None:
+            raise RenderError(f"unknown render kind: {kind}")
+        module_name, func_name = target.split(":", 1)
+        func = getattr(importlib.import_module(module_name), func_name)
+        _RENDERER_CACHE[kind] = func
+    return func
+
+
+def _warm_worker() -> None:
+    # import renderer modules (PIL, discord, fonts helpers) before the first request
+    for kind in RENDERERS:
+        try:
+            _resolve(kind)
+        except Exception:
+            pass
+
+
+def _render_in_worker(kind: str, params: dict, encoding: Optional[dict] = None):
+    """Pool entry point: returns ``(result_bytes, compose_seconds, encode_seconds)``."""
+    started = time.perf_counter()
+    image = _resolve(kind)(**params, encode=False)
+    composed = time.perf_counter()
+    result = encode_image(image, encoding)
+    return result, composed - started, time.perf_counter() - composed
+
+
+def _asset_version(value) -> Optional[float]:
+    if not isinstance(value, str) or not value:
+        return None
+    path = value if os.path.isabs(value) else os.path.join(REPO_ROOT, value)
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _params_key(kind: str, params: dict, encoding: Optional[dict] = None) -> str:
+    digest = hashlib.sha1(kind.encode())
+    for name in sorted(params):
+        value = params[name]
+        digest.update(name.encode())
+        if isinstance(value, (bytes, bytearray)):
+            digest.update(b"b:" + hashlib.sha1(value).digest())
+        else:
+            digest.update(b"r:" + repr(value).encode())
+        if name.endswith(("_path", "_font")):
+            # background/font files can change without the config changing
+            digest.update(b"m:" + repr(_asset_version(value)).encode())
+    digest.update(b"e:" + repr(sorted((encoding or DEFAULT_ENCODING).items())).encode())
+    return digest.hexdigest()
+
+
+class _ResultCache:
+    """LRU of encoded images bounded by total bytes, with a TTL."""
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max(0, int(max_bytes))
+        self.ttl = float(ttl)
+        self._entries: "collections.OrderedDict[str, tuple]" = collections.OrderedDict()
+        self.bytes = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        data, stored = entry
+        if time.monotonic() - stored > self.ttl:
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if not self.max_bytes or len(data) > self.max_bytes:
+            return
+        self._drop(key)
+        self._entries[key] = (data, time.monotonic())
+        self.bytes += len(data)
+        while self.bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= len(entry[0])
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class _KindStats:
+    __slots__ = (
+        "renders",
+        "errors",
+        "timeouts",
+        "rejected",
+        "deduplicated",
+        "cache_hits",
+        "render_total",
+        "render_max",
+        "wait_total",
+        "formats",
+    )
+
+    def __init__(self):
+        self.renders = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.deduplicated = 0
+        self.cache_hits = 0
+        self.render_total = 0.0
+        self.render_max = 0.0
+        self.wait_total = 0.0
+        # format -> [encodes, encode seconds, output bytes]
+        self.formats: Dict[str, list] = {}
+
+    def record_encode(self, fmt: str, seconds: float, size: int) -> None:
+        entry = self.formats.setdefault(fmt, [0, 0.0, 0])
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] += size
+
+    def to_dict(self) -> dict:
+        done = self.renders or 1
+        encodes = sum(e[0] for e in self.formats.values())
+        encode_total = sum(e[1] for e in self.formats.values())
+        bytes_total = sum(e[2] for e in self.formats.values())
+        return {
+            "renders": self.renders,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "deduplicated": self.deduplicated,
+            "cache_hits": self.cache_hits,
+            "render_avg_ms": round(self.render_total / done * 1000.0, 2) if self.renders else None,
+            "render_max_ms": round(self.render_max * 1000.0, 2) if self.renders else None,
+            "encode_avg_ms": round(encode_total / encodes * 1000.0, 2) if encodes else None,
+            "bytes_avg": int(bytes_total / encodes) if encodes else None,
+            "queue_wait_avg_ms": round(self.wait_total / done * 1000.0, 2) if self.renders else None,
+            "formats": {
+                fmt: {
+                    "encodes": e[0],
+                    "encode_avg_ms": round(e[1] / e[0] * 1000.0, 2),
+                    "bytes_avg": int(e[2] / e[0]),
+                }
+                for fmt, e in sorted(self.formats.items())
+            },
+        }
+
+
+class RenderService:
+    """Process-pool backed renderer with dedup, bounded queue and stats."""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        if workers is None:
+            workers = _env_int("RENDER_WORKERS", min(2, os.cpu_count() or 1))
+        self.workers = max(0, int(workers))
+        self.queue_size = max(1, int(queue_size if queue_size is not None else _env_int("RENDER_QUEUE_SIZE", 32)))
+        self.timeout = float(timeout if timeout is not None else _env_float("RENDER_TIMEOUT", 20.0))
+        self._pool: Optional[concurrent.futures.Executor] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._pending = 0
+        self._tasks: set = set()
+        self._stats: Dict[str, _KindStats] = {}
+        self._results = _ResultCache(
+            max_bytes=_env_float("RENDER_CACHE_MB", 32.0) * 1024 * 1024,
+            ttl=_env_float("RENDER_CACHE_TTL", 600.0),
+        )
+
+    @property
+    def pending(self) -> int:
+        """Renders queued or running right now."""
+        return self._pending
+
+    def _executor(self) -> Optional[concurrent.futures.Executor]:
+        if self.workers <= 0:
+            return None
+        if self._pool is None:
+            self._pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers)
+            for _ in range(self.workers):
+                self._pool.submit(_warm_worker)
+        return self._pool
+
+    def _recycle(self, pool) -> None:
+        """Replace the broken *pool*; concurrent failures recycle it only once."""
+        if pool is None or self._pool is not pool:
+            return
+        self._pool = None
+        try:
+            pool.shutdown(wait=False, cancel_futures=True)
+        except Exception:
+            pass
+
+    def _kind_stats(self, kind: str) -> _KindStats:
+        stats = self._stats.get(kind)
+        if stats is None:
+            stats = self._stats[kind] = _KindStats()
+        return stats
+
+    async def render(
+        self,
+        kind: str,
+        params: dict,
+        timeout: Optional[float] = None,
+        encoding: Optional[dict] = None,
+        use_cache: bool = True,
+    ):
+        """Render *kind* with *params* off the event loop and return the encoded bytes."""
+        if kind not in RENDERERS:
+            raise RenderError(f"unknown render kind: {kind}")
+        stats = self._kind_stats(kind)
+        encoding = {**DEFAULT_ENCODING, **(encoding or {})}
+        key = _params_key(kind, params, encoding)
+
+        if use_cache:
+            cached = self._results.get(key)
+            if cached is not None:
+                stats.cache_hits += 1
+                return cached
+
+        shared = self._inflight.get(key)
+        if shared is not None:
+            stats.deduplicated += 1
+            return await self._wait(asyncio.shield(shared), kind, timeout)
+
+        if self._pending >= self.queue_size:
+            stats.rejected += 1
+            raise RenderQueueFull(f"render queue full ({self._pending} pending)")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[key] = future
+        self._pending += 1
+        task = loop.create_task(self._run(kind, params, encoding, key, future))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return await self._wait(asyncio.shield(future), kind, timeout)
+
+    async def _wait(self, awaitable, kind: str, timeout: Optional[float]):
+        try:
+            return await asyncio.wait_for(awaitable, timeout if timeout is not None else self.timeout)
+        except asyncio.TimeoutError:
+            self._kind_stats(kind).timeouts += 1
+            raise RenderTimeout(f"{kind} render timed out") from None
+
+    async def _run(self, kind: str, params: dict, encoding: dict, key: str, future: asyncio.Future) -> None:
+        stats = self._kind_stats(kind)
+        submitted = time.perf_counter()
+        try:
+            executor = self._executor()
+            if executor is None:
+                result, seconds, encode_seconds = await asyncio.to_thread(_render_in_worker, kind, params, encoding)
+            else:
+                try:
+                    result, seconds, encode_seconds = await asyncio.get_running_loop().run_in_executor(
+                        executor, _render_in_worker, kind, params, encoding
+                    )
+                except concurrent.futures.process.BrokenProcessPool:
+                    # a worker died; start a fresh pool and retry once
+                    self._recycle(executor)
+                    result, seconds, encode_seconds = await asyncio.get_running_loop().run_in_executor(
+                        self._executor(), _render_in_worker, kind, params, encoding
+                    )
+            stats.renders += 1
+            stats.render_total += seconds
+            stats.render_max = max(stats.render_max, seconds)
+            stats.record_encode(encoding["format"], encode_seconds, len(result))
+            stats.wait_total += max(0.0, time.perf_counter() - submitted - seconds - encode_seconds)
+            self._results.put(key, result)
+            if not future.done():
+                future.set_result(result)
+        except Exception as e:
+            stats.errors += 1
+            if not future.done():
+                future.set_exception(e)
+        finally:
+            self._pending -= 1
+            self._inflight.pop(key, None)
+            # nobody may be waiting any more (all callers timed out)
+            if future.done() and not future.cancelled():
+                future.exception()
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "mode": "process" if self.workers > 0 else "thread",
+            "queue_size": self.queue_size,
+            "pending": self._pending,
+            "timeout": self.timeout,
+            "cache": {
+                "entries": len(self._results),
+                "bytes": self._results.bytes,
+                "max_bytes": self._results.max_bytes,
+                "ttl": self._results.ttl,
+            },
+            "kinds": {kind: s.to_dict() for kind, s in sorted(self._stats.items())},
+        }
+
+    def clear_cache(self) -> None:
+        self._results.clear()
+
+    def shutdown(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            try:
+                pool.shutdown(wait=False, cancel_futures=True)
+            except Exception:
+                pass
+
+
+_SERVICE: Optional[RenderService] = None
+
+
+def get_render_service() -> RenderService:
+    """Return the process-wide render service."""
+    global _SERVICE
+    if _SERVICE is None:
+        _SERVICE = RenderService()
+    return _SERVICE
+
+
+def shutdown_render_service() -> None:
+    if _SERVICE is not None:
+        _SERVICE.shutdown()
@@ -0,0 +1,231 @@
+"""Persistent "already posted" index shared by the feed cogs.
+
+SocialMedia and FreeStuff used to keep posted ids as JSON lists truncated
+to the last 100/200 entries, rebuilding sets every cycle and reposting
+items that had fallen off the list. :class:`SeenStore` keeps them in
+``data/db/seen_items.db`` instead, one row per (scope, guild, item) with an
+expiry time:
+
+    bucket = await get_seen_store().bucket("socials", guild_id, legacy=loader)
+    if item_id in bucket:      # in-memory dict lookup
+        bucket.touch(item_id)  # still in the feed: keep it from expiring
+    else:
+        ...post...
+        bucket.add(item_id)
+    await asyncio.to_thread(get_seen_store().flush)  # one bulk insert
+
+A guild's bucket is loaded from SQLite once per process, in a worker
+thread. *legacy* ids from the old JSON files are imported once per
+(scope, guild); the import is recorded in ``seen_imports`` so it does not
+repeat after the imported rows expire. Expired rows are purged at most once
+per ``PURGE_INTERVAL_SECONDS``.
+
+Environment:
+    SEEN_ITEMS_TTL_DAYS  days an id is remembered after it was last seen (default 90)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from mybot.utils.paths import get_db_path
+
+DEFAULT_TTL_DAYS = 90
+PURGE_INTERVAL_SECONDS = 3600.0
+
+
+def _ttl_from_env() -> float:
+    try:
+        days = float(os.getenv("SEEN_ITEMS_TTL_DAYS", DEFAULT_TTL_DAYS))
+    except (TypeError, ValueError):
+        days = DEFAULT_TTL_DAYS
+    return max(1.0, days) * 86400.0
+
+
+class SeenBucket:
+    """Seen ids of one (scope, guild) with their expiry timestamps."""
+
+    def __init__(self, store: "SeenStore", key: Tuple[str, int], entries: Dict[str, float]):
+        self._store = store
+        self.key = key
+        self._entries = entries
+
+    def __contains__(self, item_id: str) -> bool:
+        expires = self._entries.get(item_id)
+        return expires is not None and expires > time.time()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, item_id: str) -> None:
+        self._store._put(self, item_id)
+
+    def touch(self, item_id: str) -> None:
+        """Extend the expiry of an id that is still being seen.
+
+        Only writes once half the TTL has passed, so items that stay in a
+        feed for months cost one row update per half-TTL, not per cycle.
+        """
+        expires = self._entries.get(item_id)
+        if expires is not None and expires - time.time() < self._store.ttl / 2:
+            self._store._put(self, item_id)
+
+
+class SeenStore:
+    """SQLite table of seen item ids with per-entry expiry."""
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None):
+        self.path = path or get_db_path("seen_items")
+        self.ttl = ttl or _ttl_from_env()
+        self._buckets: Dict[Tuple[str, int], SeenBucket] = {}
+        self._loading: Dict[Tuple[str, int], asyncio.Future] = {}
+        self._pending: Dict[Tuple[str, int, str], float] = {}
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+        self._init_db()
+
+    def _init_db(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with sqlite3.connect(self.path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS seen_items (
+                    scope TEXT NOT NULL,
+                    guild_id INTEGER NOT NULL,
+                    item_id TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (scope, guild_id, item_id)
+                ) WITHOUT ROWID
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_seen_items_expiry ON seen_items (expires_at)")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS seen_imports (
+                    scope TEXT NOT NULL,
+                    guild_id INTEGER NOT NULL,
+                    imported_at REAL NOT NULL,
+                    PRIMARY KEY (scope, guild_id)
+                )
+                """
+            )
+
+    # --------------------------------------------------
+    # reading
+    # --------------------------------------------------
+
+    async def bucket(
+        self,
+        scope: str,
+        guild_id: int | str | None,
+        legacy: Optional[Callable[[], Iterable[str]]] = None,
+    ) -> SeenBucket:
+        """Seen ids for *guild_id* in *scope*, loaded from disk on first use."""
+        key = (scope, int(guild_id or 0))
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            return bucket
+        loading = self._loading.get(key)
+        if loading is None:
+            loading = self._loading[key] = asyncio.ensure_future(asyncio.to_thread(self._read, key, legacy))
+            loading.add_done_callback(lambda _f: self._loading.pop(key, None))
+        entries = await asyncio.shield(loading)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = SeenBucket(self, key, entries)
+        return bucket
+
+    def _read(self, key: Tuple[str, int], legacy: Optional[Callable[[], Iterable[str]]]) -> Dict[str, float]:
+        """Load one bucket, importing *legacy* ids once; runs in a worker thread."""
+        scope, guild_id = key
+        now = time.time()
+        with sqlite3.connect(self.path) as conn:
+            rows = conn.execute(
+                "SELECT item_id, expires_at FROM seen_items WHERE scope = ? AND guild_id = ? AND expires_at > ?",
+                (scope, guild_id, now),
+            ).fetchall()
+            entries = dict(rows)
+            if legacy is None:
+                return entries
+            imported = conn.execute(
+                "SELECT 1 FROM seen_imports WHERE scope = ? AND guild_id = ?", (scope, guild_id)
+            ).fetchone()
+            if imported:
+                return entries
+            legacy_ids = []
+            if not rows:
+                try:
+                    legacy_ids = [str(item_id) for item_id in legacy() or [] if item_id]
+                except Exception as exc:
+                    print(f"[seen] Could not import legacy ids for {scope}/{guild_id}: {exc}")
+                    return entries
+            expires = now + self.ttl
+            conn.executemany(
+                "INSERT OR IGNORE INTO seen_items (scope, guild_id, item_id, expires_at) VALUES (?, ?, ?, ?)",
+                [(scope, guild_id, item_id, expires) for item_id in legacy_ids],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO seen_imports (scope, guild_id, imported_at) VALUES (?, ?, ?)",
+                (scope, guild_id, now),
+            )
+        for item_id in legacy_ids:
+            entries.setdefault(item_id, expires)
+        if legacy_ids:
+            print(f"[seen] Imported {len(legacy_ids)} legacy {scope} ids for guild {guild_id}")
+        return entries
+
+    # --------------------------------------------------
+    # writing
+    # --------------------------------------------------
+
+    def _put(self, bucket: SeenBucket, item_id: str) -> None:
+        expires = time.time() + self.ttl
+        bucket._entries[item_id] = expires
+        with self._lock:
+            self._pending[(bucket.key[0], bucket.key[1], item_id)] = expires
+
+    def flush(self) -> int:
+        """Write pending ids in one transaction; safe to run in a worker thread."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        now = time.time()
+        purge = now - self._last_purge >= PURGE_INTERVAL_SECONDS
+        if not pending and not purge:
+            return 0
+        try:
+            with sqlite3.connect(self.path) as conn:
+                if pending:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO seen_items (scope, guild_id, item_id, expires_at) VALUES (?, ?, ?, ?)",
+                        [(scope, guild_id, item_id, expires) for (scope, guild_id, item_id), expires in pending.items()],
+                    )
+                if purge:
+                    conn.execute("DELETE FROM seen_items WHERE expires_at <= ?", (now,))
+        except sqlite3.Error as exc:
+            print(f"[seen] Could not save seen items: {exc}")
+            with self._lock:
+                for key, expires in pending.items():
+                    self._pending.setdefault(key, expires)
+            return 0
+        if purge:
+            self._last_purge = now
+            for bucket in list(self._buckets.values()):
+                for item_id in [i for i, expires in list(bucket._entries.items()) if expires <= now]:
+                    bucket._entries.pop(item_id, None)
+        return len(pending)
+
+
+_STORE: Optional[SeenStore] = None
+
+
+def get_seen_store() -> SeenStore:
+    """Return the process-wide seen-item store."""
+    global _STORE
+    if _STORE is None:
+        _STORE = SeenStore()
+    return _STORE
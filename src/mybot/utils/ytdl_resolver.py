@@ -0,0 +1,280 @@
+"""yt-dlp lookups in a small pool of long-lived worker processes.
+
+yt-dlp extraction is CPU-heavy Python; run on the default thread executor it
+competes with the bot loop for the GIL, and a fresh ``YoutubeDL`` per lookup
+throws away its extractor caches. ``await get_ytdl_resolver().resolve(query)``
+runs the lookup in a worker process instead. Each worker keeps one
+``YoutubeDL`` per mode (full extraction / flat search) warm for its
+lifetime.
+
+At most ``YTDL_WORKERS`` lookups are handed to the pool at once; the rest
+wait for a free slot, and that wait does not count against
+``YTDL_TIMEOUT``. A lookup that times out still holds its worker. The pool
+is then retired: new lookups go to a fresh pool, and the old one is
+terminated once no caller is waiting on it any more. Other lookups that were
+running on it are not cut short. Cancelling the awaiting task (for example
+an aborted Spotify import) drops lookups that have not started yet. Per-mode
+latency stats are reported by the control API ``resolver_stats`` action.
+
+Configuration (environment):
+    YTDL_WORKERS  – worker processes (default 2; ``0`` resolves in a thread)
+    YTDL_TIMEOUT  – seconds to wait for one lookup (default 45)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import concurrent.futures
+import os
+import time
+from typing import Dict, List, Optional, Set
+
+YTDL_OPTS = {
+    "format": "bestaudio/best",
+    "quiet": True,
+    "no_warnings": True,
+    "noplaylist": True,
+}
+FLAT_OPTS = {**YTDL_OPTS, "extract_flat": "in_playlist"}
+
+# keys callers use; the rest of the (large) info dict stays in the worker
+_RESULT_KEYS = ("_type", "id", "title", "duration", "url", "webpage_url", "ie_key")
+LATENCY_SAMPLES = 200
+
+
+class ResolveTimeout(RuntimeError):
+    """Raised when a lookup does not finish within the timeout."""
+
+
+def _env_number(name: str, default, cast=float):
+    try:
+        return cast(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+# --------------------------------------------------
+# worker side
+# --------------------------------------------------
+
+_YDL: Dict[bool, object] = {}
+
+
+def _ydl(flat: bool):
+    ydl = _YDL.get(flat)
+    if ydl is None:
+        from yt_dlp import YoutubeDL
+
+        ydl = _YDL[flat] = YoutubeDL(dict(FLAT_OPTS if flat else YTDL_OPTS))
+    return ydl
+
+
+def _warm_worker() -> None:
+    for flat in (False, True):
+        try:
+            _ydl(flat)
+        except Exception:
+            pass
+
+
+def _resolve_in_worker(query: str, flat: bool) -> dict:
+    """Pool entry point: first result of *query*, trimmed to ``_RESULT_KEYS``."""
+    info = _ydl(flat).extract_info(query, download=False)
+    if info and "entries" in info:
+        entries = [entry for entry in info["entries"] or [] if entry]
+        info = entries[0] if entries else None
+    if not info:
+        raise LookupError("no results")
+    result = {key: info[key] for key in _RESULT_KEYS if info.get(key) is not None}
+    if "formats" in info:
+        # marks a full extraction; the format list itself is not needed
+        result["formats"] = []
+    return result
+
+
+# --------------------------------------------------
+# bot side
+# --------------------------------------------------
+
+class _ModeStats:
+    __slots__ = ("resolves", "errors", "not_found", "timeouts", "cancelled", "latencies")
+
+    def __init__(self):
+        self.resolves = 0
+        self.errors = 0
+        self.not_found = 0
+        self.timeouts = 0
+        self.cancelled = 0
+        self.latencies = collections.deque(maxlen=LATENCY_SAMPLES)
+
+    def to_dict(self) -> dict:
+        samples = sorted(self.latencies)
+        return {
+            "resolves": self.resolves,
+            "errors": self.errors,
+            "not_found": self.not_found,
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+            "avg_ms": round(sum(samples) / len(samples) * 1000.0, 1) if samples else None,
+            "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000.0, 1)
+            if samples else None,
+            "max_ms": round(samples[-1] * 1000.0, 1) if samples else None,
+        }
+
+
+class YtdlResolver:
+    """Process-pool backed yt-dlp lookups with timeouts and latency stats."""
+
+    def __init__(self, workers: Optional[int] = None, timeout: Optional[float] = None):
+        if workers is None:
+            workers = _env_number("YTDL_WORKERS", 2, int)
+        self.workers = max(0, int(workers))
+        self.timeout = float(timeout if timeout is not None else _env_number("YTDL_TIMEOUT", 45.0))
+        self._pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._slots = asyncio.Semaphore(max(1, self.workers))
+        # jobs per pool whose caller is still waiting; retired pools are
+        # terminated once theirs is empty
+        self._jobs: Dict[concurrent.futures.ProcessPoolExecutor, Set[concurrent.futures.Future]] = {}
+        self._retired: List[concurrent.futures.ProcessPoolExecutor] = []
+        self._stats = {"full": _ModeStats(), "flat": _ModeStats()}
+        self.restarts = 0
+        self._pending = 0
+
+    def _executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_warm_worker
+            )
+            self._jobs[self._pool] = set()
+        return self._pool
+
+    def _retire(self, pool) -> None:
+        """Stop handing lookups to *pool*; it is terminated once it is drained."""
+        if self._pool is pool:
+            self._pool = None
+            self.restarts += 1
+        if pool not in self._retired:
+            self._retired.append(pool)
+        self._reap(pool)
+
+    def _reap(self, pool) -> None:
+        if pool not in self._retired or self._jobs.get(pool):
+            return
+        self._retired.remove(pool)
+        self._jobs.pop(pool, None)
+        _terminate(pool)
+
+    async def _run_in_pool(self, query: str, flat: bool, wait: float) -> dict:
+        # the slot wait is not part of the lookup timeout
+        async with self._slots:
+            pool = self._executor()
+            jobs = self._jobs[pool]
+            try:
+                job = pool.submit(_resolve_in_worker, query, flat)
+            except concurrent.futures.process.BrokenProcessPool:
+                self._retire(pool)
+                raise
+            jobs.add(job)
+            try:
+                return await asyncio.wait_for(asyncio.wrap_future(job), wait)
+            except asyncio.TimeoutError:
+                # with one slot per worker the lookup holds a worker; it is stuck
+                if not job.done():
+                    self._retire(pool)
+                raise
+            except concurrent.futures.process.BrokenProcessPool:
+                self._retire(pool)
+                raise
+            finally:
+                jobs.discard(job)
+                self._reap(pool)
+
+    async def resolve(self, query: str, flat: bool = False, timeout: Optional[float] = None) -> dict:
+        """First yt-dlp result for *query*; raises LookupError when there is none.
+
+        *flat* only looks up search results without resolving their streams.
+        """
+        stats = self._stats["flat" if flat else "full"]
+        wait = timeout if timeout is not None else self.timeout
+        started = time.perf_counter()
+        self._pending += 1
+        try:
+            if self.workers <= 0:
+                result = await asyncio.wait_for(asyncio.to_thread(_resolve_in_worker, query, flat), wait)
+            else:
+                try:
+                    result = await self._run_in_pool(query, flat, wait)
+                except concurrent.futures.process.BrokenProcessPool:
+                    # a worker died; retry once on a fresh pool
+                    result = await self._run_in_pool(query, flat, wait)
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            raise ResolveTimeout(f"yt-dlp lookup timed out: {query}") from None
+        except asyncio.CancelledError:
+            # lookups that have not started are dropped with the cancelled future
+            stats.cancelled += 1
+            raise
+        except LookupError:
+            stats.not_found += 1
+            raise
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            self._pending -= 1
+        stats.resolves += 1
+        stats.latencies.append(time.perf_counter() - started)
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "mode": "process" if self.workers > 0 else "thread",
+            "timeout": self.timeout,
+            "pending": self._pending,
+            "restarts": self.restarts,
+            "retired_pools": len(self._retired),
+            "lookups": {mode: s.to_dict() for mode, s in self._stats.items()},
+        }
+
+    def shutdown(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            try:
+                pool.shutdown(wait=False, cancel_futures=True)
+            except Exception:
+                pass
+        for retired in self._retired:
+            _terminate(retired)
+        self._retired.clear()
+        self._jobs.clear()
+
+
+def _terminate(pool: concurrent.futures.ProcessPoolExecutor) -> None:
+    processes = list((getattr(pool, "_processes", None) or {}).values())
+    try:
+        pool.shutdown(wait=False, cancel_futures=True)
+    except Exception:
+        pass
+    for process in processes:
+        try:
+            process.terminate()
+        except Exception:
+            pass
+
+
+_RESOLVER: Optional[YtdlResolver] = None
+
+
+def get_ytdl_resolver() -> YtdlResolver:
+    """Return the process-wide yt-dlp resolver."""
+    global _RESOLVER
+    if _RESOLVER is None:
+        _RESOLVER = YtdlResolver()
+    return _RESOLVER
+
+
+def shutdown_ytdl_resolver() -> None:
+    if _RESOLVER is not None:
+        _RESOLVER.shutdown()
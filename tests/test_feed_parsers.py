@@ -0,0 +1,161 @@
+"""Streamed feed parsing against saved TikTok/Instagram/YouTube responses."""
+
+import asyncio
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from mybot.cogs.community import socials  # noqa: E402
+from mybot.utils.feed_http import STREAM_CHUNK_SIZE, _read_streamed  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+USER = "somecreator"
+CHANNEL = "UCfixture0000000000000001"
+
+
+def _fixture(name: str) -> bytes:
+    return (FIXTURES / name).read_bytes()
+
+
+# --- the whole-body regex path the scanners replaced -----------------------
+
+def _legacy_scan(pattern: str, text: str, flags: int = 0) -> list:
+    found = []
+    for value in re.findall(pattern, text, flags):
+        if value not in found:
+            found.append(value)
+        if len(found) >= 5:
+            break
+    return found
+
+
+def _legacy_tiktok(body: bytes) -> list:
+    text = body.decode("utf-8", errors="replace")
+    ids = _legacy_scan(rf"/@{re.escape(USER)}/video/(\d+)", text, re.IGNORECASE)
+    return socials._tiktok_items(ids, USER)
+
+
+def _legacy_instagram(body: bytes) -> list:
+    text = body.decode("utf-8", errors="replace")
+    return socials._instagram_items(_legacy_scan(r"/p/([A-Za-z0-9_-]+)/", text), USER)
+
+
+# --- a response that hands out its body in chunks --------------------------
+
+class _Content:
+    def __init__(self, body: bytes):
+        self.body = body
+        self.read = 0
+
+    async def iter_chunked(self, size: int):
+        for start in range(0, len(self.body), size):
+            chunk = self.body[start:start + size]
+            self.read += len(chunk)
+            yield chunk
+
+
+class _Response:
+    def __init__(self, body: bytes):
+        self.content = _Content(body)
+
+
+def _read(body: bytes, make_parser, known=None):
+    resp = _Response(body)
+    result = asyncio.run(_read_streamed(resp, make_parser, known))
+    return result, resp.content.read
+
+
+def _no_parser():
+    raise AssertionError("parser created for an unchanged body")
+
+
+SCRAPED = [
+    ("tiktok.html", lambda: socials._tiktok_parser(USER), _legacy_tiktok),
+    ("instagram.html", lambda: socials._instagram_parser(USER), _legacy_instagram),
+]
+
+
+@pytest.mark.parametrize("name, make_parser, legacy", SCRAPED)
+@pytest.mark.parametrize("chunk_size", [7, 301, STREAM_CHUNK_SIZE])
+def test_scanner_matches_whole_body_regex(name, make_parser, legacy, chunk_size):
+    body = _fixture(name)
+    parser = make_parser()
+    for start in range(0, len(body), chunk_size):
+        if parser.feed(body[start:start + chunk_size]):
+            break
+    assert parser.close() == legacy(body)
+
+
+@pytest.mark.parametrize("name, make_parser, legacy", SCRAPED)
+def test_streamed_read_stops_after_enough_items(name, make_parser, legacy):
+    body = _fixture(name)
+    result, read = _read(body, make_parser)
+    assert result["data"] == legacy(body)
+    assert len(result["data"]) == socials.SCRAPED_ITEMS
+    assert result["stopped"] is True
+    assert result["size"] == read < len(body)
+
+
+def test_unchanged_prefix_skips_parser():
+    body = _fixture("tiktok.html")
+    first, _ = _read(body, lambda: socials._tiktok_parser(USER))
+    known = dict(first)
+
+    # everything after the prefix the scanner needed may change freely
+    changed_tail = body[:first["size"]] + b"<p>new footer</p>" + body[first["size"]:]
+    second, read = _read(changed_tail, _no_parser, known)
+    assert second["unchanged"] is True
+    assert second["data"] is None
+    assert read < len(body)
+
+
+def test_changed_prefix_is_parsed_again():
+    body = _fixture("tiktok.html")
+    first, _ = _read(body, lambda: socials._tiktok_parser(USER))
+    newer = b'<a href="/@somecreator/video/7309999999999999999">new</a>' + body
+    second, _ = _read(newer, lambda: socials._tiktok_parser(USER), {**first})
+    assert second["unchanged"] is False
+    assert second["data"][0]["id"] == "tiktok:7309999999999999999"
+    assert second["data"][1:] == first["data"][:-1]
+
+
+def test_unchanged_short_body_skips_parser():
+    # fewer links than SCRAPED_ITEMS: the scanner read the whole body
+    body = _fixture("instagram.html")
+    cut = body.index(b'<article>') + 400
+    short = body[:cut]
+    first, _ = _read(short, lambda: socials._instagram_parser(USER))
+    assert first["stopped"] is False and 0 < len(first["data"]) < socials.SCRAPED_ITEMS
+
+    second, _ = _read(short, _no_parser, {**first})
+    assert second["unchanged"] is True
+
+    longer, _ = _read(short + b"<p>more</p>", lambda: socials._instagram_parser(USER), {**first})
+    assert longer["unchanged"] is False
+    assert longer["data"] == first["data"]
+
+
+def test_youtube_feed_newest_items():
+    text = _fixture("youtube.xml").decode("utf-8")
+    items = socials._parse_youtube_feed(text, CHANNEL)
+    assert len(items) == socials.YOUTUBE_ITEMS
+    assert [item["id"] for item in items] == [f"youtube:aBcDeFgHi{i}{i}" for i in range(socials.YOUTUBE_ITEMS)]
+    assert items[0]["title"] == "Fish & Chips in 10 minutes"
+    assert items[1]["title"] == "\"Best\" pancakes you'll ever make"
+    assert items[2]["title"] == "Tacos <3"
+    assert all(item["author"] == "Rock & Roll Kitchen" for item in items)
+    assert items[0]["published"] == "2026-10-18T15:00:00+00:00"
+    assert items[0]["url"] == "https://www.youtube.com/watch?v=aBcDeFgHi00"
+
+
+def test_xml_tag_decodes_entities():
+    assert socials._xml_tag("<title>Tom &amp; Jerry &#39;24&#x21;</title>", "title") == "Tom & Jerry '24!"
+    assert socials._xml_tag('<name lang="en"> A &lt;b&gt; </name>', "name") == "A <b>"
+    assert socials._xml_tag("<title>unterminated", "title") == ""
+    assert socials._xml_tag("<other>x</other>", "title") == ""
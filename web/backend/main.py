@@ -1,5 +1,12 @@
+import asyncio
+import copy
+import hashlib
 import json
 import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from io import BytesIO
 from pathlib import Path
 from typing import Optional
@@ -10,7 +17,8 @@ from dotenv import load_dotenv
 from fastapi import (Depends, FastAPI, File, Header, HTTPException, Query,
                      Request, UploadFile)
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
+from fastapi.responses import (FileResponse, PlainTextResponse,
+                               RedirectResponse, Response)
 from PIL import Image, ImageDraw, ImageFont
 
 ROOT = Path(__file__).resolve().parents[2]
@@ -35,7 +43,25 @@ UPLOAD_DIR = DATA_DIR / "uploads"
 CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
-app = FastAPI(title="Bot Dashboard API")
+
+def _new_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(10.0, connect=5.0),
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # one pooled HTTP client for all Discord calls instead of one per request
+    app.state.http = _new_http_client()
+    try:
+        yield
+    finally:
+        await app.state.http.aclose()
+
+
+app = FastAPI(title="Bot Dashboard API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -67,15 +93,215 @@ async def ping():
     return {"ok": True}
 
 
+CONTROL_API_HOST = os.getenv("CONTROL_API_HOST", "127.0.0.1")
+CONTROL_API_PORT = int(os.getenv("CONTROL_API_PORT", "8765"))
+
+
+async def control_api_request(payload: dict, timeout: float = 5.0) -> dict:
+    """Send one request to the bot's local control API and return the reply."""
+    req = dict(payload)
+    token = os.getenv("CONTROL_API_TOKEN")
+    if token:
+        req["token"] = token
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(CONTROL_API_HOST, CONTROL_API_PORT), timeout
+    )
+    try:
+        writer.write((json.dumps(req) + "\n").encode())
+        await writer.drain()
+        line = await asyncio.wait_for(reader.readline(), timeout)
+        return json.loads(line.decode() or "{}")
+    finally:
+        writer.close()
+
+
+@app.get("/metrics")
+async def metrics(
+    guilds: bool = Query(False), authorized: bool = Depends(internal_auth)
+):
+    """Bot handler latency histograms and runtime gauges in Prometheus text format."""
+    try:
+        resp = await control_api_request(
+            {"action": "metrics", "format": "prometheus", "guilds": guilds}
+        )
+    except Exception as exc:
+        raise HTTPException(status_code=502, detail=f"bot unreachable: {exc}")
+    if not resp.get("ok"):
+        raise HTTPException(status_code=502, detail=str(resp.get("error") or "metrics failed"))
+    return PlainTextResponse(
+        resp.get("text", ""), media_type="text/plain; version=0.0.4"
+    )
+
+
 @app.get("/api/guilds/{guild_id}/config")
 async def get_config(guild_id: int):
-    path = CONFIG_DIR / f"{guild_id}.json"
-    if not path.exists():
-        return {}
+    cfg = _read_guild_config(guild_id)
+    return cfg if cfg is not None else {}
+
+
+DISCORD_API = "https://discord.com/api"
+# Guild channel/role lists are served from a short-lived cache: fresh for
+# DISCORD_CACHE_TTL seconds, then served stale for up to DISCORD_CACHE_STALE
+# more seconds while one background request revalidates them.
+DISCORD_CACHE_TTL = float(os.getenv("DISCORD_CACHE_TTL", "30") or 30)
+DISCORD_CACHE_STALE = float(os.getenv("DISCORD_CACHE_STALE", "300") or 300)
+DISCORD_CACHE_MAX = 1024
+DISCORD_MAX_RETRIES = 2
+DISCORD_MAX_RETRY_AFTER = 10.0
+# "rest" (default) asks Discord; "bot" reads the running bot's in-memory
+# guild state over the control API; "auto" tries the bot first.
+GUILD_DATA_SOURCE = (os.getenv("GUILD_DATA_SOURCE", "rest") or "rest").strip().lower()
+
+# key -> (fetched_at monotonic, data)
+_discord_cache: dict = {}
+_discord_inflight: dict = {}
+
+
+class DiscordUpstreamError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"discord returned {status_code}")
+        self.status_code = status_code
+
+
+def _http_client() -> httpx.AsyncClient:
+    """Shared pooled client; created by the app lifespan, lazily otherwise."""
+    client = getattr(app.state, "http", None)
+    if client is None or client.is_closed:
+        client = app.state.http = _new_http_client()
+    return client
+
+
+def _retry_after(resp: httpx.Response) -> float:
+    delay = None
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        delay = float(resp.json().get("retry_after"))
     except Exception:
-        raise HTTPException(status_code=500, detail="failed to read config")
+        pass
+    if delay is None:
+        try:
+            delay = float(resp.headers.get("Retry-After", "1"))
+        except Exception:
+            delay = 1.0
+    return min(max(delay, 0.1), DISCORD_MAX_RETRY_AFTER)
+
+
+async def discord_get(path: str, authorization: str):
+    """GET a Discord API path, waiting out 429 responses a couple of times."""
+    for attempt in range(DISCORD_MAX_RETRIES + 1):
+        resp = await _http_client().get(
+            f"{DISCORD_API}{path}", headers={"Authorization": authorization}
+        )
+        if resp.status_code == 429 and attempt < DISCORD_MAX_RETRIES:
+            await asyncio.sleep(_retry_after(resp))
+            continue
+        if resp.status_code != 200:
+            raise DiscordUpstreamError(resp.status_code)
+        return resp.json()
+
+
+def _discord_refresh(key, fetch) -> asyncio.Task:
+    """Start (or join) the single in-flight fetch for *key*."""
+    task = _discord_inflight.get(key)
+    if task is not None:
+        return task
+
+    async def run():
+        try:
+            data = await fetch()
+            now = time.monotonic()
+            if len(_discord_cache) >= DISCORD_CACHE_MAX:
+                limit = DISCORD_CACHE_TTL + DISCORD_CACHE_STALE
+                for old in [k for k, (at, _) in _discord_cache.items() if now - at > limit]:
+                    _discord_cache.pop(old, None)
+                while len(_discord_cache) >= DISCORD_CACHE_MAX:
+                    _discord_cache.pop(next(iter(_discord_cache)))
+            _discord_cache[key] = (now, data)
+            return data
+        finally:
+            _discord_inflight.pop(key, None)
+
+    task = asyncio.get_running_loop().create_task(run())
+    # background revalidations may fail with nobody awaiting them
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    _discord_inflight[key] = task
+    return task
+
+
+async def discord_cached(key, fetch):
+    """Cached *fetch()* result with stale-while-revalidate and coalescing."""
+    entry = _discord_cache.get(key)
+    if entry is not None:
+        age = time.monotonic() - entry[0]
+        if age < DISCORD_CACHE_TTL:
+            return entry[1]
+        if age < DISCORD_CACHE_TTL + DISCORD_CACHE_STALE:
+            _discord_refresh(key, fetch)
+            return entry[1]
+    try:
+        return await asyncio.shield(_discord_refresh(key, fetch))
+    except (DiscordUpstreamError, httpx.HTTPError):
+        # an expired copy beats an error page
+        if entry is not None:
+            return entry[1]
+        raise
+
+
+async def _bot_guild(guild_id: int) -> Optional[dict]:
+    """The guild as the running bot sees it, or None if unavailable."""
+    try:
+        resp = await control_api_request(
+            {"action": "guild_snapshot", "guild_id": guild_id}, timeout=2.0
+        )
+    except Exception:
+        return None
+    guilds = resp.get("guilds") or [] if resp.get("ok") else []
+    return guilds[0] if guilds else None
+
+
+def _bot_channels(guild: dict) -> list:
+    # same field names/types as the REST payload the frontend expects
+    return [
+        {
+            "id": str(ch.get("id")),
+            "name": ch.get("name"),
+            "type": ch.get("type_value", 0),
+            "position": ch.get("position", 0),
+            "parent_id": str(ch["parent_id"]) if ch.get("parent_id") else None,
+        }
+        for ch in guild.get("channels") or []
+    ]
+
+
+def _bot_roles(guild: dict) -> list:
+    return [
+        {"id": str(r.get("id")), "name": r.get("name"), "position": r.get("position", 0)}
+        for r in guild.get("roles") or []
+    ]
+
+
+async def _guild_resource(guild_id: int, kind: str) -> list:
+    """Channels or roles of a guild from the bot and/or Discord REST."""
+    if GUILD_DATA_SOURCE in ("bot", "auto"):
+        guild = await _bot_guild(guild_id)
+        if guild is not None:
+            return _bot_channels(guild) if kind == "channels" else _bot_roles(guild)
+        if GUILD_DATA_SOURCE == "bot":
+            raise HTTPException(status_code=502, detail="bot unreachable or not in guild")
+
+    bot_token = os.getenv("DISCORD_TOKEN")
+    if not bot_token:
+        raise HTTPException(status_code=500, detail="bot token not configured")
+    try:
+        return await discord_cached(
+            ("bot", guild_id, kind),
+            lambda: discord_get(f"/guilds/{guild_id}/{kind}", f"Bot {bot_token}"),
+        )
+    except DiscordUpstreamError as exc:
+        raise HTTPException(
+            status_code=502, detail=f"failed to fetch {kind}: {exc.status_code}"
+        )
+    except httpx.HTTPError as exc:
+        raise HTTPException(status_code=502, detail=f"failed to fetch {kind}: {exc}")
 
 
 @app.get("/api/guilds/{guild_id}/channels")
@@ -84,18 +310,7 @@ async def get_guild_channels(guild_id: int, authorized: bool = Depends(internal_
     Return guild channels using the bot token.
     Requires internal token (internal API).
     """
-    bot_token = os.getenv("DISCORD_TOKEN")
-    if not bot_token:
-        raise HTTPException(status_code=500, detail="bot token not configured")
-    async with httpx.AsyncClient() as client:
-        url = f"https://discord.com/api/guilds/{guild_id}/channels"
-        resp = await client.get(url, headers={"Authorization": f"Bot {bot_token}"})
-        if resp.status_code != 200:
-            raise HTTPException(
-                status_code=502,
-                detail=f"failed to fetch channels: {resp.status_code}",
-            )
-        return resp.json()
+    return await _guild_resource(guild_id, "channels")
 
 
 @app.get("/api/guilds/{guild_id}/roles")
@@ -104,17 +319,7 @@ async def get_guild_roles(guild_id: int, authorized: bool = Depends(internal_aut
     Return guild roles using the bot token.
     Requires internal token (internal API).
     """
-    bot_token = os.getenv("DISCORD_TOKEN")
-    if not bot_token:
-        raise HTTPException(status_code=500, detail="bot token not configured")
-    async with httpx.AsyncClient() as client:
-        url = f"https://discord.com/api/guilds/{guild_id}/roles"
-        resp = await client.get(url, headers={"Authorization": f"Bot {bot_token}"})
-        if resp.status_code != 200:
-            raise HTTPException(
-                status_code=502, detail=f"failed to fetch roles: {resp.status_code}"
-            )
-        return resp.json()
+    return await _guild_resource(guild_id, "roles")
 
 
 @app.get("/api/guilds/{guild_id}/channels-user")
@@ -130,119 +335,98 @@ async def get_guild_channels_user(guild_id: int, request: Request):
     token = request.cookies.get("dashboard_access_token")
     if not token:
         raise HTTPException(status_code=401, detail="not authenticated")
-    async with httpx.AsyncClient() as client:
-        url = f"https://discord.com/api/guilds/{guild_id}/channels"
-        resp = await client.get(url, headers={"Authorization": f"Bearer {token}"})
-        if resp.status_code != 200:
-            raise HTTPException(
-                status_code=502,
-                detail=f"failed to fetch channels with user token: {resp.status_code}",
-            )
-        return resp.json()
+    # cached per user token (hashed) so one user's view never leaks to another
+    token_key = hashlib.sha1(token.encode()).hexdigest()
+    try:
+        return await discord_cached(
+            ("user", token_key, guild_id, "channels"),
+            lambda: discord_get(f"/guilds/{guild_id}/channels", f"Bearer {token}"),
+        )
+    except DiscordUpstreamError as exc:
+        raise HTTPException(
+            status_code=502,
+            detail=f"failed to fetch channels with user token: {exc.status_code}",
+        )
+    except httpx.HTTPError as exc:
+        raise HTTPException(
+            status_code=502, detail=f"failed to fetch channels with user token: {exc}"
+        )
 
 
-@app.post("/api/guilds/{guild_id}/preview")
-async def generate_preview(
-    guild_id: int,
-    data: dict = None,
-    authorized: bool = Depends(internal_auth),
-):
-    """Generate a PNG preview for the given guild config.
+PREVIEW_WIDTH, PREVIEW_HEIGHT = 800, 300
+PREVIEW_CACHE_SIZE = 64
 
-    Accepts either JSON body with config fields or will read saved config file.
-    Returns PNG image bytes.
-    """
-    # load config from body or saved file
-    cfg = data
-    if not cfg:
-        path = CONFIG_DIR / f"{guild_id}.json"
-        if not path.exists():
-            raise HTTPException(status_code=404, detail="config not found")
-        try:
-            cfg = json.loads(path.read_text(encoding="utf-8"))
-        except Exception:
-            raise HTTPException(status_code=500, detail="failed to read config")
+# Preview rendering runs on a small worker pool so PIL work never blocks
+# the event loop; PIL releases the GIL for decoding, resizing and encoding.
+_preview_pool = ThreadPoolExecutor(
+    max_workers=max(1, int(os.getenv("PREVIEW_WORKERS", "2") or 2)),
+    thread_name_prefix="preview",
+)
+_preview_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_preview_inflight: dict = {}
 
-    # Create a simple image: background + uploaded image (if any) + text
-    width, height = 800, 300
-    bg_color = (30, 34, 42)
-    text_color = (235, 235, 235)
-    im = Image.new("RGBA", (width, height), bg_color)
-    draw = ImageDraw.Draw(im)
+# guild_id -> (mtime_ns, config); invalidated by save_config
+_config_cache: dict = {}
 
-    # If an image path is provided, try to load from uploads
-    img_path = cfg.get("image")
-    if img_path:
-        # expected relative path like data/web/uploads/{guild_id}/filename
-        p = ROOT / img_path
-        try:
-            with Image.open(p) as uimg:
-                uimg.thumbnail((240, 240))
-                im.paste(uimg, (20, (height - uimg.height) // 2))
-        except Exception:
-            pass
 
-    # Draw welcome text
-    welcome = cfg.get("welcome_message", "Welcome to the server!")
-    font_name = cfg.get("font", "arial")
+def _read_guild_config(guild_id: int) -> Optional[dict]:
+    """Return the saved guild config (cached until the file changes)."""
+    path = CONFIG_DIR / f"{guild_id}.json"
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        _config_cache.pop(guild_id, None)
+        return None
+    cached = _config_cache.get(guild_id)
+    if cached is not None and cached[0] == mtime:
+        return copy.deepcopy(cached[1])
     try:
-        # Try loading a TTF from system; fallback to default
-        font = ImageFont.truetype(font_name, 28)
+        cfg = json.loads(path.read_text(encoding="utf-8"))
     except Exception:
-        font = ImageFont.load_default()
+        raise HTTPException(status_code=500, detail="failed to read config")
+    _config_cache[guild_id] = (mtime, cfg)
+    return copy.deepcopy(cfg)
 
-    text_x = 280
-    draw.text(
-        (text_x, 60),
-        welcome,
-        font=font,
-        fill=text_color,
-    )
 
-    # small metadata
-    channel = cfg.get("announcement_channel_id", "")
-    role = cfg.get("role_id", "")
-    meta = f"Channel: {channel}    Role: {role}"
-    draw.text(
-        (text_x, 140),
-        meta,
-        font=ImageFont.load_default(),
-        fill=(180, 180, 180),
-    )
+def _preview_font_path(font_name: str) -> Optional[Path]:
+    ttf = FONTS_DIR / f"{font_name}.ttf"
+    return ttf if ttf.exists() else None
 
-    buf = BytesIO()
-    im.save(buf, format="PNG")
-    buf.seek(0)
-    return StreamingResponse(buf, media_type="image/png")
 
+def _file_version(path: Optional[Path]):
+    if path is None:
+        return None
+    try:
+        st = path.stat()
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+def _preview_key(cfg: dict) -> str:
+    """Hash of the config plus the versions of the files it references."""
+    img_path = cfg.get("image")
+    assets = {
+        "image": _file_version(ROOT / img_path) if img_path else None,
+        "font": _file_version(_preview_font_path(str(cfg.get("font", "arial")))),
+    }
+    raw = json.dumps({"cfg": cfg, "assets": assets}, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
 
-@app.post("/api/guilds/{guild_id}/preview/save")
-async def save_preview(
-    guild_id: int,
-    data: dict = None,
-    authorized: bool = Depends(internal_auth),
-):
-    """Generate and save preview PNG into the guild's upload folder and return path."""
-    # reuse generation logic: load cfg
-    cfg = data
-    if not cfg:
-        path = CONFIG_DIR / f"{guild_id}.json"
-        if not path.exists():
-            raise HTTPException(status_code=404, detail="config not found")
-        try:
-            cfg = json.loads(path.read_text(encoding="utf-8"))
-        except Exception:
-            raise HTTPException(status_code=500, detail="failed to read config")
 
-    # create image as in generate_preview
-    width, height = 800, 300
+def _render_preview(cfg: dict) -> bytes:
+    """Render the preview PNG for *cfg* (blocking; runs in the preview pool)."""
+    # Create a simple image: background + uploaded image (if any) + text
+    width, height = PREVIEW_WIDTH, PREVIEW_HEIGHT
     bg_color = (30, 34, 42)
     text_color = (235, 235, 235)
     im = Image.new("RGBA", (width, height), bg_color)
     draw = ImageDraw.Draw(im)
 
+    # If an image path is provided, try to load from uploads
     img_path = cfg.get("image")
     if img_path:
+        # expected relative path like data/web/uploads/{guild_id}/filename
         p = ROOT / img_path
         try:
             with Image.open(p) as uimg:
@@ -251,14 +435,13 @@ async def save_preview(
         except Exception:
             pass
 
+    # Draw welcome text; try repo fonts folder first
     welcome = cfg.get("welcome_message", "Welcome to the server!")
-    font_name = cfg.get("font", "arial")
-    # try repo fonts folder first
-    fonts_dir = ROOT / "web" / "backend" / "fonts"
+    font_name = str(cfg.get("font", "arial"))
     font = None
     try:
-        ttf = fonts_dir / f"{font_name}.ttf"
-        if ttf.exists():
+        ttf = _preview_font_path(font_name)
+        if ttf is not None:
             font = ImageFont.truetype(str(ttf), 28)
     except Exception:
         font = None
@@ -270,11 +453,88 @@ async def save_preview(
 
     text_x = 280
     draw.text((text_x, 60), welcome, font=font, fill=text_color)
+
+    # small metadata
     channel = cfg.get("announcement_channel_id", "")
     role = cfg.get("role_id", "")
     meta = f"Channel: {channel}    Role: {role}"
     draw.text((text_x, 140), meta, font=ImageFont.load_default(), fill=(180, 180, 180))
 
+    buf = BytesIO()
+    im.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+async def _preview_png(cfg: dict, key: Optional[str] = None) -> tuple[str, bytes]:
+    """Return ``(cache_key, png)``; cached, coalesced and rendered off-loop."""
+    key = key or _preview_key(cfg)
+    png = _preview_cache.get(key)
+    if png is not None:
+        _preview_cache.move_to_end(key)
+        return key, png
+
+    pending = _preview_inflight.get(key)
+    if pending is None:
+        loop = asyncio.get_running_loop()
+        pending = loop.run_in_executor(_preview_pool, _render_preview, copy.deepcopy(cfg))
+        _preview_inflight[key] = pending
+
+        def _store(fut, key=key):
+            _preview_inflight.pop(key, None)
+            if not fut.cancelled() and fut.exception() is None:
+                _preview_cache[key] = fut.result()
+                while len(_preview_cache) > PREVIEW_CACHE_SIZE:
+                    _preview_cache.popitem(last=False)
+
+        pending.add_done_callback(_store)
+    # shielded: a disconnecting client must not cancel a render others wait on
+    return key, await asyncio.shield(pending)
+
+
+def _config_for_preview(guild_id: int, data: Optional[dict]) -> dict:
+    # load config from body or saved file
+    if data:
+        return data
+    cfg = _read_guild_config(guild_id)
+    if cfg is None:
+        raise HTTPException(status_code=404, detail="config not found")
+    return cfg
+
+
+@app.post("/api/guilds/{guild_id}/preview")
+async def generate_preview(
+    guild_id: int,
+    data: dict = None,
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    authorized: bool = Depends(internal_auth),
+):
+    """Generate a PNG preview for the given guild config.
+
+    Accepts either JSON body with config fields or will read saved config file.
+    Returns PNG image bytes with an ``ETag``; a matching ``If-None-Match``
+    gets ``304 Not Modified``.
+    """
+    cfg = _config_for_preview(guild_id, data)
+    # the ETag is the cache key, so a revalidation never needs a render
+    key = _preview_key(cfg)
+    etag = f'"{key}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    _key, png = await _preview_png(cfg, key)
+    return Response(content=png, media_type="image/png", headers=headers)
+
+
+@app.post("/api/guilds/{guild_id}/preview/save")
+async def save_preview(
+    guild_id: int,
+    data: dict = None,
+    authorized: bool = Depends(internal_auth),
+):
+    """Generate and save preview PNG into the guild's upload folder and return path."""
+    cfg = _config_for_preview(guild_id, data)
+    _key, png = await _preview_png(cfg)
+
     # save to uploads
     gdir = UPLOAD_DIR / str(guild_id)
     gdir.mkdir(parents=True, exist_ok=True)
@@ -282,7 +542,7 @@ async def save_preview(
 
     name = f"preview-{int(datetime.now(timezone.utc).timestamp())}.png"
     dest = gdir / name
-    im.save(dest, format="PNG")
+    await asyncio.to_thread(dest.write_bytes, png)
     return {"ok": True, "path": str(dest.relative_to(ROOT))}
 
 
@@ -306,6 +566,7 @@ async def save_config(
         path.write_text(
             json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8"
         )
+        _config_cache.pop(guild_id, None)
         return {"ok": True}
     except Exception:
         raise HTTPException(status_code=500, detail="failed to save config")
@@ -406,31 +667,31 @@ async def auth_callback(
         "redirect_uri": redirect_uri,
     }
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(token_url, data=data, headers=headers)
-        if resp.status_code != 200:
-            raise HTTPException(
-                status_code=502, detail=f"token exchange failed: {resp.status_code}"
-            )
-        token_json = resp.json()
-
-        access_token = token_json.get("access_token")
-        if not access_token:
-            raise HTTPException(status_code=502, detail="no access_token returned")
-
-        # fetch user guilds
-        guilds_resp = await client.get(
-            "https://discord.com/api/users/@me/guilds",
-            headers={"Authorization": f"Bearer {access_token}"},
+    client = _http_client()
+    resp = await client.post(token_url, data=data, headers=headers)
+    if resp.status_code != 200:
+        raise HTTPException(
+            status_code=502, detail=f"token exchange failed: {resp.status_code}"
         )
-        if guilds_resp.status_code != 200:
-            raise HTTPException(
-                status_code=502,
-                detail=f"failed to fetch guilds: {guilds_resp.status_code}",
-            )
+    token_json = resp.json()
 
-        # guilds are not used here; token is stored in a cookie and frontend
-        # will fetch guilds via `/auth/me` when needed
+    access_token = token_json.get("access_token")
+    if not access_token:
+        raise HTTPException(status_code=502, detail="no access_token returned")
+
+    # fetch user guilds
+    guilds_resp = await client.get(
+        "https://discord.com/api/users/@me/guilds",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    if guilds_resp.status_code != 200:
+        raise HTTPException(
+            status_code=502,
+            detail=f"failed to fetch guilds: {guilds_resp.status_code}",
+        )
+
+    # guilds are not used here; token is stored in a cookie and frontend
+    # will fetch guilds via `/auth/me` when needed
 
     # Store the access token in a HttpOnly cookie so the frontend can use authenticated
     # requests via the browser without exposing the token to JS.
@@ -466,16 +727,15 @@ async def auth_me(request: Request):
     if not token:
         raise HTTPException(status_code=401, detail="not authenticated")
 
-    async with httpx.AsyncClient() as client:
-        guilds_resp = await client.get(
-            "https://discord.com/api/users/@me/guilds",
-            headers={"Authorization": f"Bearer {token}"},
+    guilds_resp = await _http_client().get(
+        "https://discord.com/api/users/@me/guilds",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    if guilds_resp.status_code != 200:
+        raise HTTPException(
+            status_code=502, detail=f"failed to fetch guilds: {guilds_resp.text}"
         )
-        if guilds_resp.status_code != 200:
-            raise HTTPException(
-                status_code=502, detail=f"failed to fetch guilds: {guilds_resp.text}"
-            )
-        guilds = guilds_resp.json()
+    guilds = guilds_resp.json()
 
     return {"guilds": guilds}
 